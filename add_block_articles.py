@@ -1,6 +1,8 @@
 from app import app
 from models import Journalist, Outlet, Article, Topic, db
 from datetime import datetime
+from utils.signals import notify_articles_changed
+from utils.urls import normalize_url
 
 def add_block_articles():
     """
@@ -134,11 +136,11 @@ def add_block_articles():
             ]
             
             # Add articles to database
-            articles_added = 0
+            new_articles = []
             
             for article_data in block_articles:
                 # Check if article already exists
-                existing_article = Article.query.filter_by(url=article_data["url"]).first()
+                existing_article = Article.query.filter_by(url=normalize_url(article_data["url"])).first()
                 if existing_article:
                     print(f"Article already exists: {article_data['title']}")
                     continue
@@ -146,7 +148,7 @@ def add_block_articles():
                 # Create new article
                 article = Article(
                     title=article_data["title"],
-                    url=article_data["url"],
+                    url=normalize_url(article_data["url"]),
                     content=article_data["content"],
                     published_at=article_data["published_at"],
                     created_at=datetime.utcnow(),
@@ -163,10 +165,14 @@ def add_block_articles():
                         article.topics.append(topic)
                 
                 db.session.add(article)
-                articles_added += 1
+                new_articles.append(article)
             
+            # Flush for the ids; after the commit they would each be reloaded
+            db.session.flush()
+            article_ids = [article.id for article in new_articles]
             db.session.commit()
-            print(f"Successfully added {articles_added} recent articles from The Block (Jan-Mar 2024)")
+            notify_articles_changed(__name__, article_ids)
+            print(f"Successfully added {len(article_ids)} recent articles from The Block (Jan-Mar 2024)")
             
             return True
         except Exception as e:
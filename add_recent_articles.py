@@ -19,8 +19,8 @@ def add_recent_articles():
     Add articles from January-March 2024 to provide 3 months of data for analysis.
     """
     # Import Flask app and models inside the function to avoid circular imports
-    from app import app, db
-    from models import Article, Journalist, Outlet, Topic
+    from app import app
+    from utils.ingestion import CRYPTO_TOPIC_KEYWORDS, article_from_news_api, ingest_articles
     
     # News API configuration
     NEWS_API_KEY = os.environ.get("NEWS_API_KEY")
@@ -28,6 +28,9 @@ def add_recent_articles():
         logger.error("NEWS_API_KEY environment variable not found")
         return False
     
+    # This importer has never tagged articles with Mining; the other importers do
+    topic_keywords = {topic: keywords for topic, keywords in CRYPTO_TOPIC_KEYWORDS.items() if topic != 'Mining'}
+    
     # List of cryptocurrency keywords
     crypto_keywords = [
         "bitcoin", "ethereum", "cryptocurrency", "blockchain", "web3",
@@ -74,106 +77,19 @@ def add_recent_articles():
         
         # Use app context to interact with the database
         with app.app_context():
-            # Process each article
-            articles_added = 0
-            
-            for article_data in articles:
-                # Skip if missing critical fields
-                if not all(k in article_data for k in ['title', 'url', 'publishedAt']):
-                    continue
-                
-                # Check if article already exists (by URL)
-                existing = Article.query.filter_by(url=article_data['url']).first()
-                if existing:
-                    logger.info(f"Article already exists: {article_data['title']}")
-                    continue
-                
-                # Get source name
-                source_name = article_data.get('source', {}).get('name', 'Unknown Source')
-                
-                # Get or create outlet
-                outlet = Outlet.query.filter_by(name=source_name).first()
-                if not outlet:
-                    logger.info(f"Creating new outlet: {source_name}")
-                    outlet = Outlet(
-                        name=source_name,
-                        website=None,
-                        country=None,
-                        description=f"News source: {source_name}"
-                    )
-                    db.session.add(outlet)
-                    # Flush to get the ID without committing
-                    db.session.flush()
-                
-                # Get or create journalist
-                author = article_data.get('author', 'Unknown Author')
-                journalist = Journalist.query.filter_by(name=author).first()
-                if not journalist:
-                    logger.info(f"Creating new journalist: {author}")
-                    journalist = Journalist(
-                        name=author,
-                        outlet_id=outlet.id,
-                        region='Unknown'  # Default region
-                    )
-                    db.session.add(journalist)
-                    db.session.flush()
-                
-                # Parse publication date
-                try:
-                    published_at = datetime.strptime(article_data['publishedAt'], '%Y-%m-%dT%H:%M:%SZ')
-                except ValueError:
-                    published_at = datetime.utcnow()
-                
-                # Create article
-                article = Article(
-                    title=article_data['title'],
-                    url=article_data['url'],
-                    content=article_data.get('description', ''),
-                    published_at=published_at,
-                    journalist_id=journalist.id,
-                    outlet_id=outlet.id,
-                    sentiment_score=0.0,  # Default neutral sentiment
-                    sentiment_label='neutral'
-                )
-                
-                # Define crypto topics and their related keywords
-                topic_keywords = {
-                    'Bitcoin': ['bitcoin', 'btc'],
-                    'Ethereum': ['ethereum', 'eth'],
-                    'DeFi': ['defi', 'decentralized finance'],
-                    'NFT': ['nft', 'non-fungible'],
-                    'Regulation': ['regulation', 'sec', 'compliance', 'legal'],
-                    'Exchanges': ['exchange', 'trading', 'binance', 'coinbase'],
-                    'Cryptocurrency': ['cryptocurrency', 'crypto']
-                }
-                
-                # Check article text for topic keywords
-                article_text = (article_data.get('title', '') + ' ' + 
-                               article_data.get('description', '')).lower()
-                
-                for topic_name, keywords in topic_keywords.items():
-                    if any(keyword.lower() in article_text for keyword in keywords):
-                        # Find or create the topic
-                        topic = Topic.query.filter_by(name=topic_name).first()
-                        if not topic:
-                            topic = Topic(name=topic_name)
-                            db.session.add(topic)
-                            db.session.flush()
-                        
-                        # Add topic to article
-                        article.topics.append(topic)
-                
-                # Add article to database
-                db.session.add(article)
-                articles_added += 1
-                logger.info(f"Added article: {article.title}")
+            # Tag each article with the crypto topics found in its title/description
+            records = [
+                article_from_news_api(article_data, topic_keywords=topic_keywords, default_sentiment=True)
+                for article_data in articles
+            ]
+            result = ingest_articles(records,
+                                     outlet_description="News source: {name}",
+                                     journalist_region='Unknown')  # Default region
             
-            # Commit all changes at once
-            if articles_added > 0:
-                db.session.commit()
-                logger.info(f"Successfully added {articles_added} articles")
+            if result.articles_added > 0:
+                logger.info(f"Successfully added {result.articles_added} articles")
             
-            return articles_added
+            return result.articles_added
             
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching news: {e}")
@@ -52,6 +52,19 @@ with app.app_context():
     app.register_blueprint(search_bp)
     app.register_blueprint(news_bp)
     
+    # Keyset pagination links used by list templates
+    from utils.pagination import first_page_url, next_page_url
+    app.add_template_global(first_page_url)
+    app.add_template_global(next_page_url)
+    
+    # Per-request SQL/timing stats: Server-Timing header, slow-request log and /metrics
+    from utils.instrumentation import init_instrumentation
+    init_instrumentation(app)
+    
+    # Seeding is write-heavy, so it is a CLI command: flask --app main seed-sample-data
+    from utils.data_collection import seed_sample_data_command
+    app.cli.add_command(seed_sample_data_command)
+    
     # Create database tables
     db.create_all()
     logger.info("Database tables created")
@@ -0,0 +1,426 @@
+"""
+End-to-end application benchmark on synthetic data.
+
+Fills a database with ``benchmarks.datagen`` (or reuses one that already
+holds articles), then drives the Flask test client through the dashboard,
+the analytics endpoints, search, the list and detail pages and the exports,
+and finally the write paths: batch ingestion, NLP analysis of the ingested
+articles and text extraction through the scraper pipeline. Exports are read
+to the end, so their streaming cost is included.
+
+Each scenario reports p50/p95/mean latency over --iterations runs (after one
+warm-up run, reported as ``first_ms``), the median number of SQL statements
+per run and the process's peak RSS once the scenario has finished. The
+response cache and the search result-page cache are off unless
+--warm-caches is given, so repeated requests measure the real work. The
+ingested articles are deleted again afterwards, so a reused database stays
+comparable between runs.
+
+The report is printed and, with --output, written as JSON; two reports
+(e.g. from two commits on the same database) can be compared with
+--compare, which exits non-zero when a p95 regressed by more than
+--threshold percent.
+
+The scraper scenarios serve synthetic HTML from memory instead of the
+network, so they measure extraction and the scrape cache, not remote sites.
+
+Usage:
+    python -m benchmarks.app_bench [--scale=small] [--database-url=sqlite:///bench.db] [--output=report.json]
+    python -m benchmarks.app_bench --compare base.json new.json [--threshold=10]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scenarios run --iterations times, heavy ones (exports, write paths) --heavy-iterations times
+PAGE_SCENARIOS = [
+    ('main.index', '/', False),
+    ('analytics.dashboard', '/analytics/', False),
+    ('analytics.sentiment_data', '/analytics/data/sentiment', False),
+    ('analytics.topic_data', '/analytics/data/topics', False),
+    ('analytics.outlet_data', '/analytics/data/outlets', False),
+    ('search.page', '/search/', False),
+    ('search.text', '/search/results?q=bitcoin', False),
+    ('search.text_filtered', '/search/results?q=bitcoin+regulation&region=Europe&sentiment=positive', False),
+    ('search.filters_only', '/search/results?topic=DeFi&country=Germany', False),
+    ('search.suggest', '/search/suggest?q=bit', False),
+    ('journalists.list', '/journalists/', False),
+    ('journalists.table', '/journalists/table?draw=1&start=40&length=20&search[value]=chen', False),
+    ('journalists.detail', '/journalists/{journalist_id}', False),
+    ('outlets.list', '/outlets/', False),
+    ('outlets.detail', '/outlets/{outlet_id}', False),
+    ('news.list', '/news/', False),
+    ('news.table', '/news/table?draw=1&start=0&length=25&outlet_id={outlet_id}', False),
+    ('export.journalists_csv', '/journalists/export?format=csv', True),
+    ('export.outlets_json', '/outlets/export', True),
+    ('export.search_ndjson', '/search/export?q=ethereum&format=ndjson', True),
+    ('export.outlet_articles_csv', '/search/export?type=articles&outlet_id={outlet_id}&format=csv', True),
+]
+
+INGEST_BATCH = 50
+SCRAPE_PAGES = 40
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class StatementCounter:
+    """Counts every SQL statement the engine runs, including those while streaming."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'after_cursor_execute', self._count)
+
+    def _count(self, *args, **kwargs):
+        self.count += 1
+
+
+def measure(run, iterations, counter):
+    """
+    Run once to warm up, then ``iterations`` more times.
+
+    Args:
+        run (callable): Runs the scenario once, returning an HTTP status or None
+        iterations (int): Number of measured runs
+
+    Returns:
+        dict: Latency statistics in milliseconds, query counts, last status and peak RSS
+    """
+    started = time.perf_counter()
+    status = run()
+    first = time.perf_counter() - started
+
+    durations = []
+    statements = []
+    for _ in range(iterations):
+        before = counter.count
+        started = time.perf_counter()
+        status = run()
+        durations.append(time.perf_counter() - started)
+        statements.append(counter.count - before)
+
+    result = {'first_ms': round(first * 1000, 2)}
+    if durations:
+        result.update({
+            'p50_ms': round(percentile(durations, 0.5) * 1000, 2),
+            'p95_ms': round(percentile(durations, 0.95) * 1000, 2),
+            'mean_ms': round(statistics.mean(durations) * 1000, 2),
+            'queries': statistics.median(statements),
+            'runs': len(durations)
+        })
+    if status is not None:
+        result['status'] = status
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def request_runner(client, path):
+    def run():
+        response = client.get(path)
+        # Read streamed bodies to the end so exports are measured in full
+        for _ in response.response:
+            pass
+        response.close()
+        return response.status_code
+    return run
+
+
+def ingest_records(generator, journalists, outlets, run_token, count):
+    """Article records for existing journalists and outlets, without sentiment."""
+    records = []
+    for number in range(count):
+        record = generator.article(f"ingest-{run_token}-{number}", generator.article_topics([]))
+        record['url'] = f"https://bench.example.com/{run_token}/{number}"
+        record['author'] = generator.rng.choice(journalists)
+        record['source_name'] = generator.rng.choice(outlets)
+        records.append(record)
+    return records
+
+
+def synthetic_page(generator, number):
+    record = generator.article(f"page-{number}", generator.article_topics([]))
+    paragraphs = ''.join(f"<p>{sentence}.</p>" for sentence in record['content'].split('. '))
+    navigation = ''.join(f'<li><a href="/section/{n}">Section {n}</a></li>' for n in range(30))
+    return (
+        f"<html><head><title>{record['title']}</title></head><body>"
+        f"<nav><ul>{navigation}</ul></nav><article><h1>{record['title']}</h1>{paragraphs}</article>"
+        f"<footer>Copyright Example News</footer></body></html>"
+    ).encode('utf-8')
+
+
+class OfflineFetcher:
+    """Stands in for PageFetcher, serving pages from memory."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def fetch_many(self, urls, headers_for=None):
+        from utils.page_fetcher import FetchResult
+        for url in dict.fromkeys(urls):
+            yield FetchResult(url=url, status=200, content=self.pages[url], attempts=1)
+
+
+def run_write_scenarios(args, counter, tmp):
+    """
+    Ingestion, NLP analysis and scraper extraction; ingested rows are removed afterwards.
+    """
+    from sqlalchemy import delete, select
+
+    from app import db
+    from benchmarks.datagen import DataGenerator
+    from models import Article, Journalist, Outlet, Topic, article_topics, journalist_topics
+    from utils.ingestion import ingest_articles
+    from utils.nlp_utils import analyze_all_articles, get_nlp
+    from utils.rollups import article_days, refresh_days
+    from utils.scrape_cache import ScrapeCache
+    from utils.text_extractor import TextExtractor, extract_text
+    from utils.web_scraper import iter_website_text_contents
+
+    results = {}
+    generator = DataGenerator(journalists=0, seed=args.seed + 1)
+    journalists = list(db.session.execute(select(Journalist.name).order_by(Journalist.id).limit(500)).scalars())
+    outlets = list(db.session.execute(select(Outlet.name).order_by(Outlet.id)).scalars())
+    run_token = time.time_ns()
+    started_at = datetime.utcnow()
+    batches = iter(range(args.heavy_iterations + 1))
+    ingested = []
+
+    def ingest():
+        batch = next(batches)
+        records = ingest_records(generator, journalists, outlets, f"{run_token}-{batch}", INGEST_BATCH)
+        ingested.extend(ingest_articles(records).article_ids)
+
+    results['ingest.batch'] = measure(ingest, args.heavy_iterations, counter)
+    results['ingest.batch']['articles_per_run'] = INGEST_BATCH
+
+    get_nlp()
+    before = counter.count
+    started = time.perf_counter()
+    analyzed = analyze_all_articles(n_process=1)
+    elapsed = time.perf_counter() - started
+    results['nlp.analyze_all'] = {
+        'articles': analyzed,
+        'total_ms': round(elapsed * 1000, 2),
+        'per_article_ms': round(elapsed * 1000 / analyzed, 3) if analyzed else None,
+        'queries': counter.count - before,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+    pages = {f"https://pages.example.com/{n}": synthetic_page(generator, n) for n in range(SCRAPE_PAGES)}
+    contents = iter(list(pages.values()) * (args.iterations + 1))
+
+    def extract():
+        extract_text(next(contents))
+
+    results['scraper.extract_text'] = measure(extract, args.iterations, counter)
+
+    cache = ScrapeCache(os.path.join(tmp, 'scrape_cache.sqlite3'))
+    fetcher = OfflineFetcher(pages)
+    with TextExtractor(max_workers=2) as extractor:
+        for name in ('scraper.pipeline_cold', 'scraper.pipeline_cached'):
+            before = counter.count
+            started = time.perf_counter()
+            extracted = sum(1 for _, text in iter_website_text_contents(pages, fetcher, extractor, cache) if text)
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                'pages': len(pages),
+                'extracted': extracted,
+                'total_ms': round(elapsed * 1000, 2),
+                'queries': counter.count - before,
+                'peak_rss_mb': peak_rss_mb()
+            }
+
+    # Remove what the run added so the database can be reused
+    if ingested:
+        days = article_days(ingested)
+        for start in range(0, len(ingested), 500):
+            chunk = ingested[start:start + 500]
+            db.session.execute(delete(article_topics).where(article_topics.c.article_id.in_(chunk)))
+            db.session.execute(delete(Article).where(Article.id.in_(chunk)))
+        orphaned = (
+            select(Topic.id)
+            .where(Topic.created_at >= started_at)
+            .where(~Topic.id.in_(select(article_topics.c.topic_id)))
+            .where(~Topic.id.in_(select(journalist_topics.c.topic_id)))
+        )
+        db.session.execute(delete(Topic).where(Topic.id.in_(orphaned)))
+        refresh_days(days)
+    return results
+
+
+def run(args, database_url, tmp):
+    # Configure the app before it is imported
+    os.environ['DATABASE_URL'] = database_url
+    if not args.warm_caches:
+        os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+        os.environ['SEARCH_CACHE_SECONDS'] = '0'
+
+    started = time.perf_counter()
+    from app import app, db
+    import_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    from sqlalchemy import func, select
+
+    from benchmarks.datagen import SCALES, populate
+    from models import Article, Journalist, Outlet, Topic
+
+    scale = SCALES[args.scale]
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': args.scale,
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'heavy_iterations': args.heavy_iterations,
+            'warm_caches': args.warm_caches,
+            'import_ms': import_ms
+        }
+    }
+
+    with app.app_context():
+        report['meta']['database'] = db.engine.dialect.name
+        if not db.session.execute(select(func.count(Article.id))).scalar():
+            report['meta']['generated'] = populate(args.articles or scale['articles'],
+                                                   args.journalists or scale['journalists'], seed=args.seed)
+        report['meta']['rows'] = {
+            name: db.session.execute(select(func.count(model.id))).scalar()
+            for name, model in (('articles', Article), ('journalists', Journalist),
+                                ('outlets', Outlet), ('topics', Topic))
+        }
+        # The most prolific journalist and the largest outlet: the worst-case detail pages
+        ids = {
+            'journalist_id': db.session.execute(
+                select(Article.journalist_id).group_by(Article.journalist_id)
+                .order_by(func.count(Article.id).desc()).limit(1)).scalar(),
+            'outlet_id': db.session.execute(
+                select(Article.outlet_id).group_by(Article.outlet_id)
+                .order_by(func.count(Article.id).desc()).limit(1)).scalar()
+        }
+        counter = StatementCounter(db.engine)
+        db.session.remove()
+
+    client = app.test_client()
+    scenarios = {}
+    for name, path, heavy in PAGE_SCENARIOS:
+        iterations = args.heavy_iterations if heavy else args.iterations
+        scenarios[name] = measure(request_runner(client, path.format(**ids)), iterations, counter)
+
+    if not args.skip_writes:
+        with app.app_context():
+            scenarios.update(run_write_scenarios(args, counter, tmp))
+
+    report['scenarios'] = scenarios
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def compare(base_path, new_path, threshold):
+    """
+    Per-scenario p50/p95 and query count changes between two reports.
+
+    Returns:
+        tuple: (comparison dict, list of scenarios whose p95 regressed beyond threshold)
+    """
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    comparison = {}
+    regressions = []
+    for name, after in new['scenarios'].items():
+        before = base['scenarios'].get(name)
+        if not before:
+            continue
+        entry = {}
+        for key in ('p50_ms', 'p95_ms', 'total_ms'):
+            if before.get(key) and after.get(key) is not None:
+                entry[key] = [before[key], after[key], round((after[key] / before[key] - 1) * 100, 1)]
+        if 'queries' in before and 'queries' in after:
+            entry['queries'] = [before['queries'], after['queries']]
+        comparison[name] = entry
+        change = entry.get('p95_ms', entry.get('total_ms'))
+        if change and change[2] > threshold:
+            regressions.append(name)
+
+    return {
+        'base': base['meta'].get('commit'),
+        'new': new['meta'].get('commit'),
+        'peak_rss_mb': [base.get('peak_rss_mb'), new.get('peak_rss_mb')],
+        'scenarios': comparison,
+        'regressions': regressions
+    }, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pages, exports and write paths on synthetic data')
+    parser.add_argument('--scale', choices=['small', 'medium', 'large'], default='small',
+                        help='1k, 100k or 1M articles (when generating data)')
+    parser.add_argument('--articles', type=int, default=None, help='Number of articles (overrides --scale)')
+    parser.add_argument('--journalists', type=int, default=None, help='Number of journalists (overrides --scale)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for generated data')
+    parser.add_argument('--database-url', default=None,
+                        help='Database to use; generated if it has no articles (default: temporary SQLite file)')
+    parser.add_argument('--iterations', type=int, default=20, help='Measured runs per scenario')
+    parser.add_argument('--heavy-iterations', type=int, default=3, help='Measured runs of exports and write paths')
+    parser.add_argument('--warm-caches', action='store_true', help='Keep the response and search caches enabled')
+    parser.add_argument('--skip-writes', action='store_true', help='Skip the ingestion, NLP and scraper scenarios')
+    parser.add_argument('--output', default=None, help='Write the JSON report to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='Compare two reports')
+    parser.add_argument('--threshold', type=float, default=10.0, help='p95 regression (%%) that fails --compare')
+    args = parser.parse_args()
+
+    if args.compare:
+        comparison, regressions = compare(*args.compare, args.threshold)
+        print(json.dumps(comparison, indent=2))
+        if regressions:
+            print(f"p95 regressed by more than {args.threshold}%: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        report = run(args, database_url, tmp)
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+Seeded synthetic data for benchmarks.
+
+Bulk-creates outlets, journalists, topics and articles with the skew real
+data has: a few large outlets and a long tail of small ones, a minority of
+prolific journalists writing most of the articles, and topics with Zipf-like
+popularity. Each journalist covers a handful of topics and mostly writes
+about those, so the ``journalist_topics`` and ``article_topics`` fan-out
+resembles ingested data. Titles and bodies mix topic keywords, filler words
+and sentiment/tone lexicon words, so full-text search, the sentiment filters
+and the NLP pipeline all have something to work on.
+
+The same seed and counts always produce the same rows. Publish dates are
+spread over the DAYS days before the day of generation.
+
+Rows are written with Core ``INSERT`` executemany in batches and committed
+per batch, so memory stays flat at any scale; the analytics rollups are
+rebuilt and the planner statistics refreshed at the end. The target database
+must not contain articles yet.
+
+Usage (the database is taken from DATABASE_URL, as for the app):
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.datagen [--articles=100000] [--journalists=10000] [--seed=42]
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import func, insert, select, text
+
+from app import app, db
+from models import Article, Journalist, Outlet, Topic, article_topics, journalist_topics
+from utils.ingestion import CRYPTO_TOPIC_KEYWORDS
+from utils.lexicon import NEGATIVE_WORDS, POSITIVE_WORDS, SENTIMENT_THRESHOLD, TONE_WORDS
+
+logger = logging.getLogger(__name__)
+
+# Articles generated, inserted and committed at a time
+GENERATE_BATCH = 5000
+DAYS = 365
+
+SCALES = {
+    'small': {'articles': 1000, 'journalists': 500},
+    'medium': {'articles': 100000, 'journalists': 10000},
+    'large': {'articles': 1000000, 'journalists': 10000}
+}
+
+# Includes the topics the search page features by name
+EXTRA_TOPICS = ['Blockchain', 'Stablecoins', 'Layer 2', 'CBDC', 'ETFs', 'Security', 'Hacks', 'Taxation', 'Payments',
+                'Web3', 'Gaming', 'Venture Capital', 'Lending', 'Staking', 'Custody', 'Derivatives',
+                'Privacy', 'Interoperability', 'Tokenization', 'DAOs', 'Memecoins', 'Oracles', 'Wallets',
+                'Energy', 'Enforcement', 'Institutional Adoption', 'Remittances', 'Emerging Markets',
+                'Macroeconomics', 'Central Banks', 'Inflation', 'Market Structure', 'Layer 1']
+
+REGIONS = ['North America', 'Europe', 'Asia', 'Latin America', 'Middle East', 'Africa', 'Oceania']
+COUNTRIES = {
+    'North America': ['United States', 'Canada'],
+    'Europe': ['United Kingdom', 'Germany', 'France', 'Switzerland', 'Netherlands'],
+    'Asia': ['Japan', 'Singapore', 'South Korea', 'India', 'Hong Kong'],
+    'Latin America': ['Brazil', 'Argentina', 'Mexico'],
+    'Middle East': ['United Arab Emirates', 'Israel'],
+    'Africa': ['Nigeria', 'South Africa', 'Kenya'],
+    'Oceania': ['Australia', 'New Zealand']
+}
+
+FIRST_NAMES = ['Alex', 'Maya', 'James', 'Sophia', 'Omar', 'Elena', 'David', 'Priya', 'Lucas', 'Hana',
+               'Noah', 'Amara', 'Mateo', 'Chloe', 'Kenji', 'Fatima', 'Liam', 'Ingrid', 'Diego', 'Yara',
+               'Samuel', 'Nadia', 'Felix', 'Aisha', 'Tomas', 'Mei', 'Oliver', 'Zara', 'Ravi', 'Clara']
+LAST_NAMES = ['Johnson', 'Rodriguez', 'Chen', 'Williams', 'Hassan', 'Petrova', 'Kim', 'Sharma', 'Silva',
+              'Tanaka', 'Muller', 'Okafor', 'Garcia', 'Dubois', 'Sato', 'Rahman', 'Walsh', 'Larsen',
+              'Moreno', 'Haddad', 'Nguyen', 'Kowalski', 'Rossi', 'Mensah', 'Novak', 'Lin', 'Brennan',
+              'Costa', 'Iyer', 'Fischer']
+OUTLET_WORDS = ['Chain', 'Block', 'Coin', 'Crypto', 'Ledger', 'Token', 'Hash', 'Satoshi', 'Digital', 'Asset',
+                'Market', 'Capital', 'Protocol', 'Node', 'Signal']
+OUTLET_SUFFIXES = ['Daily', 'Times', 'Wire', 'Journal', 'Insider', 'Report', 'Post', 'Observer', 'Review',
+                   'Desk', 'Weekly', 'News']
+BEATS = ['Markets', 'Policy', 'Technology', 'Investigations', 'Business', 'Finance', 'Security', 'Opinion']
+
+FILLER_WORDS = ['the', 'market', 'price', 'said', 'on', 'network', 'investors', 'regulators', 'week',
+                'and', 'of', 'to', 'a', 'in', 'fund', 'analysts', 'traders', 'billion', 'million',
+                'users', 'launch', 'report', 'according', 'company', 'industry', 'year', 'new']
+TITLE_VERBS = ['surges', 'slides', 'faces', 'eyes', 'backs', 'rejects', 'expands', 'weighs', 'tests',
+               'targets', 'delays', 'unveils']
+TITLE_OBJECTS = ['new rules', 'record inflows', 'a fresh probe', 'institutional demand', 'a major upgrade',
+                 'market turmoil', 'a licensing push', 'rising fees', 'a security breach', 'a funding round']
+
+
+def zipf_weights(count, exponent=1.0):
+    """Cumulative weights of a Zipf distribution over ``count`` ranks."""
+    return list(accumulate(1.0 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def _pick(rng, population, cum_weights):
+    return population[bisect_left(cum_weights, rng.random() * cum_weights[-1])]
+
+
+def _pick_distinct(rng, population, cum_weights, count):
+    chosen = []
+    # Bounded retries: with very skewed weights, rare items may never come up
+    for _ in range(count * 4):
+        item = _pick(rng, population, cum_weights)
+        if item not in chosen:
+            chosen.append(item)
+            if len(chosen) == count:
+                break
+    return chosen
+
+
+def _sentiment(rng):
+    score = max(-1.0, min(1.0, rng.gauss(0.03, 0.2)))
+    if score > SENTIMENT_THRESHOLD:
+        label = 'positive'
+    elif score < -SENTIMENT_THRESHOLD:
+        label = 'negative'
+    else:
+        label = 'neutral'
+    return score, label
+
+
+class DataGenerator:
+    """
+    Deterministic row factory; every generated value comes from one seeded RNG.
+
+    Args:
+        journalists (int): Number of journalists
+        outlets (int): Number of outlets (default: one per 50 journalists, at least 20)
+        seed (int): Random seed
+        words (int): Approximate number of words per article body
+    """
+
+    def __init__(self, journalists, outlets=None, seed=42, words=120):
+        self.rng = random.Random(seed)
+        self.journalists = journalists
+        self.outlets = outlets or max(20, journalists // 50)
+        self.words = words
+        self.topic_names = list(CRYPTO_TOPIC_KEYWORDS) + EXTRA_TOPICS
+        self.topic_weights = zipf_weights(len(self.topic_names), 0.9)
+        self.topic_words = {
+            name: CRYPTO_TOPIC_KEYWORDS.get(name, [name.lower()]) for name in self.topic_names
+        }
+        self.tones = list(TONE_WORDS) + ['neutral']
+        self.lexicon_words = POSITIVE_WORDS + NEGATIVE_WORDS + [w for ws in TONE_WORDS.values() for w in ws]
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.first_day = today - timedelta(days=DAYS)
+
+    def topic_rows(self, now):
+        return [{'name': name, 'description': f"Coverage of {name}", 'created_at': now, 'updated_at': now}
+                for name in self.topic_names]
+
+    def outlet_rows(self, now):
+        rows = []
+        for index in range(self.outlets):
+            region = self.rng.choice(REGIONS)
+            name = f"{self.rng.choice(OUTLET_WORDS)} {self.rng.choice(OUTLET_SUFFIXES)} {index + 1}"
+            slug = name.lower().replace(' ', '')
+            rows.append({
+                'name': name,
+                'website': f"https://{slug}.example.com",
+                'country': self.rng.choice(COUNTRIES[region]),
+                'description': f"{name} covers digital assets, markets and regulation.",
+                'created_at': now,
+                'updated_at': now
+            })
+        return rows
+
+    def journalist_rows(self, outlet_ids, now):
+        """
+        Journalists spread over outlets with Zipf-skewed sizes (outlet ids in rank order).
+        """
+        outlet_weights = zipf_weights(len(outlet_ids), 1.1)
+        seen = {}
+        rows = []
+        for _ in range(self.journalists):
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            base = f"{first} {last}"
+            seen[base] = seen.get(base, 0) + 1
+            name = base if seen[base] == 1 else f"{base} {seen[base]}"
+            handle = name.lower().replace(' ', '_')
+            rows.append({
+                'name': name,
+                'email': f"{handle.replace('_', '.')}@example.com",
+                'twitter_handle': f"@{handle[:40]}",
+                'bio': f"{self.rng.choice(BEATS)} reporter covering digital assets.",
+                'location': self.rng.choice(COUNTRIES[self.rng.choice(REGIONS)]),
+                'region': self.rng.choice(REGIONS),
+                'verified': self.rng.random() < 0.2,
+                'beat': self.rng.choice(BEATS),
+                'outlet_id': _pick(self.rng, outlet_ids, outlet_weights),
+                'created_at': now,
+                'updated_at': now
+            })
+        return rows
+
+    def journalist_topics(self, journalist_ids):
+        """Two to six topic names per journalist, favouring the popular ones."""
+        return {
+            journalist_id: _pick_distinct(self.rng, self.topic_names, self.topic_weights, self.rng.randint(2, 6))
+            for journalist_id in journalist_ids
+        }
+
+    def productivity_weights(self, count):
+        """Cumulative per-journalist article weights with a heavy (Pareto) tail."""
+        return list(accumulate(self.rng.paretovariate(1.2) for _ in range(count)))
+
+    def _body(self, topic_names):
+        keywords = [word for name in topic_names for word in self.topic_words[name]]
+        words = []
+        for _ in range(self.words):
+            roll = self.rng.random()
+            if roll < 0.08:
+                words.append(self.rng.choice(keywords))
+            elif roll < 0.12:
+                words.append(self.rng.choice(self.lexicon_words))
+            else:
+                words.append(self.rng.choice(FILLER_WORDS))
+        sentences = [' '.join(words[start:start + 15]) for start in range(0, len(words), 15)]
+        return ' '.join(sentence.capitalize() + '.' for sentence in sentences)
+
+    def article(self, number, topic_names):
+        """
+        One article record about ``topic_names``, in the ``ingest_articles`` record format.
+        """
+        lead = topic_names[0]
+        title = f"{lead} {self.rng.choice(TITLE_VERBS)} {self.rng.choice(TITLE_OBJECTS)}"
+        if len(topic_names) > 1:
+            title += f" as {topic_names[1]} {self.rng.choice(['heats up', 'cools', 'shifts', 'stalls'])}"
+        published_at = self.first_day + timedelta(seconds=self.rng.randrange(DAYS * 86400))
+        return {
+            'title': title,
+            'url': f"https://news.example.com/{published_at:%Y/%m/%d}/{number}",
+            'content': self._body(topic_names),
+            'published_at': published_at,
+            'topics': topic_names
+        }
+
+    def article_topics(self, journalist_topic_names):
+        """One to four topics, mostly from the journalist's own."""
+        count = self.rng.choices((1, 2, 3, 4), weights=(35, 35, 20, 10))[0]
+        names = []
+        for _ in range(count):
+            if journalist_topic_names and self.rng.random() < 0.8:
+                name = self.rng.choice(journalist_topic_names)
+            else:
+                name = _pick(self.rng, self.topic_names, self.topic_weights)
+            if name not in names:
+                names.append(name)
+        return names
+
+
+def _inserted_ids(model, after_id, count):
+    # Single writer into an otherwise idle database: new ids follow insertion order
+    return list(db.session.execute(
+        select(model.id).where(model.id > after_id).order_by(model.id).limit(count)
+    ).scalars())
+
+
+def _max_id(model):
+    return db.session.execute(select(func.coalesce(func.max(model.id), 0))).scalar()
+
+
+def populate(articles, journalists, outlets=None, seed=42, words=120):
+    """
+    Fill the (article-free) database with synthetic data.
+
+    Args:
+        articles (int): Number of articles
+        journalists (int): Number of journalists
+        outlets (int): Number of outlets (default: one per 50 journalists, at least 20)
+        seed (int): Random seed
+        words (int): Approximate number of words per article body
+
+    Returns:
+        dict: Row counts and the time taken per phase, in seconds
+    """
+    from utils.rollups import rebuild_rollups
+
+    if db.session.execute(select(func.count(Article.id))).scalar():
+        raise RuntimeError("The benchmark database already contains articles; use an empty database")
+
+    generator = DataGenerator(journalists, outlets, seed, words)
+    now = datetime.utcnow()
+    timings = {}
+    started = time.perf_counter()
+
+    # Topics may already exist (ingestion keeps them unique by name)
+    existing = set(db.session.execute(select(Topic.name)).scalars())
+    new_topics = [row for row in generator.topic_rows(now) if row['name'] not in existing]
+    if new_topics:
+        db.session.execute(insert(Topic), new_topics)
+    topic_ids = dict(db.session.execute(
+        select(Topic.name, Topic.id).where(Topic.name.in_(generator.topic_names))
+    ).all())
+
+    after = _max_id(Outlet)
+    db.session.execute(insert(Outlet), generator.outlet_rows(now))
+    outlet_ids = _inserted_ids(Outlet, after, generator.outlets)
+
+    after = _max_id(Journalist)
+    journalist_rows = generator.journalist_rows(outlet_ids, now)
+    for start in range(0, len(journalist_rows), GENERATE_BATCH):
+        db.session.execute(insert(Journalist), journalist_rows[start:start + GENERATE_BATCH])
+    journalist_ids = _inserted_ids(Journalist, after, journalists)
+    journalist_outlets = dict(zip(journalist_ids, (row['outlet_id'] for row in journalist_rows)))
+    del journalist_rows
+
+    covered = generator.journalist_topics(journalist_ids)
+    db.session.execute(insert(journalist_topics), [
+        {'journalist_id': journalist_id, 'topic_id': topic_ids[name]}
+        for journalist_id, names in covered.items() for name in names
+    ])
+    db.session.commit()
+    timings['entities'] = time.perf_counter() - started
+
+    phase_started = time.perf_counter()
+    productivity = generator.productivity_weights(len(journalist_ids))
+    links = 0
+    for start in range(0, articles, GENERATE_BATCH):
+        rows = []
+        topic_lists = []
+        for number in range(start, min(start + GENERATE_BATCH, articles)):
+            journalist_id = _pick(generator.rng, journalist_ids, productivity)
+            names = generator.article_topics(covered[journalist_id])
+            record = generator.article(number, names)
+            score, label = _sentiment(generator.rng)
+            rows.append({
+                'title': record['title'],
+                'url': record['url'],
+                'content': record['content'],
+                'published_at': record['published_at'],
+                'journalist_id': journalist_id,
+                'outlet_id': journalist_outlets[journalist_id],
+                'sentiment_score': score,
+                'sentiment_label': label,
+                'tone': generator.rng.choice(generator.tones),
+                'created_at': now,
+                'updated_at': now
+            })
+            topic_lists.append(names)
+
+        after = _max_id(Article)
+        db.session.execute(insert(Article), rows)
+        article_ids = _inserted_ids(Article, after, len(rows))
+        topic_rows = [
+            {'article_id': article_id, 'topic_id': topic_ids[name]}
+            for article_id, names in zip(article_ids, topic_lists) for name in names
+        ]
+        db.session.execute(insert(article_topics), topic_rows)
+        db.session.commit()
+        links += len(topic_rows)
+        logger.info(f"Generated {start + len(rows)} of {articles} articles")
+    timings['articles'] = time.perf_counter() - phase_started
+
+    phase_started = time.perf_counter()
+    rebuild_rollups()
+    timings['rollups'] = time.perf_counter() - phase_started
+
+    # Fresh planner statistics, as a production database would have
+    phase_started = time.perf_counter()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    timings['analyze'] = time.perf_counter() - phase_started
+    timings['total'] = time.perf_counter() - started
+
+    return {
+        'articles': articles,
+        'journalists': len(journalist_ids),
+        'outlets': len(outlet_ids),
+        'topics': len(topic_ids),
+        'article_topic_links': links,
+        'seconds': {phase: round(seconds, 2) for phase, seconds in timings.items()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate seeded synthetic benchmark data')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='medium', help='Preset article/journalist counts')
+    parser.add_argument('--articles', type=int, default=None, help='Number of articles (overrides --scale)')
+    parser.add_argument('--journalists', type=int, default=None, help='Number of journalists (overrides --scale)')
+    parser.add_argument('--outlets', type=int, default=None, help='Number of outlets')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--words', type=int, default=120, help='Words per article body')
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]
+    with app.app_context():
+        summary = populate(args.articles or scale['articles'], args.journalists or scale['journalists'],
+                           args.outlets, args.seed, args.words)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
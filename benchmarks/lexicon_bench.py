@@ -0,0 +1,140 @@
+"""
+Benchmark the precompiled lexicon scorer against the previous implementation.
+
+Builds a synthetic corpus, tokenizes it once, and then times only the
+scoring step: the old per-call scorer, the lexicon's single-pass ``score``
+and its vectorized ``score_many``. Results are checked for equality and the
+timings are printed as JSON.
+
+Usage:
+    python -m benchmarks.lexicon_bench [--articles=10000] [--words=400]
+"""
+
+import argparse
+import json
+import random
+import time
+
+import spacy
+
+from utils.lexicon import DEFAULT_SCORER, NEGATIVE_WORDS, POSITIVE_WORDS, TONE_WORDS
+
+FILLER_WORDS = ['the', 'market', 'bitcoin', 'price', 'said', 'on', 'token', 'exchange', 'investors',
+                'regulators', 'week', 'network', 'and', 'of', 'to', 'a', 'in', 'crypto', 'fund', 'ETF']
+
+
+def build_corpus(articles, words, seed=42):
+    rng = random.Random(seed)
+    lexicon_words = POSITIVE_WORDS + NEGATIVE_WORDS + [w for ws in TONE_WORDS.values() for w in ws]
+    corpus = []
+    for _ in range(articles):
+        tokens = [
+            rng.choice(lexicon_words).capitalize() if rng.random() < 0.05 else rng.choice(FILLER_WORDS)
+            for _ in range(words)
+        ]
+        corpus.append(' '.join(tokens) + '.')
+    return corpus
+
+
+def legacy_sentiment_from_doc(doc):
+    """
+    Verbatim copy of the per-call set-building scorer the lexicon replaced.
+    """
+    # Basic sentiment analysis
+    # This is a simplified approach - in a production system, you would use
+    # a more sophisticated sentiment analysis model
+    
+    positive_words = set(['good', 'great', 'excellent', 'positive', 'amazing', 'wonderful', 
+                        'fantastic', 'terrific', 'outstanding', 'superb', 'brilliant',
+                        'happy', 'pleased', 'delighted', 'satisfied', 'impressed'])
+    
+    negative_words = set(['bad', 'terrible', 'awful', 'poor', 'negative', 'horrible', 
+                        'dreadful', 'disappointing', 'inadequate', 'inferior', 'mediocre',
+                        'annoyed', 'angry', 'upset', 'dissatisfied', 'troubled'])
+    
+    # Count positive and negative words
+    positive_count = 0
+    negative_count = 0
+    
+    for token in doc:
+        if token.text.lower() in positive_words:
+            positive_count += 1
+        elif token.text.lower() in negative_words:
+            negative_count += 1
+    
+    # Calculate a simple sentiment score
+    total_words = len(doc)
+    if total_words > 0:
+        positive_score = positive_count / total_words
+        negative_score = negative_count / total_words
+        sentiment_score = positive_score - negative_score
+    else:
+        sentiment_score = 0.0
+    
+    # Determine sentiment label
+    if sentiment_score > 0.05:
+        sentiment_label = 'positive'
+    elif sentiment_score < -0.05:
+        sentiment_label = 'negative'
+    else:
+        sentiment_label = 'neutral'
+    
+    # Detect tone (simplified)
+    # In a production system, you would use a more sophisticated tone detection model
+    tone_words = {
+        'analytical': set(['analyze', 'analysis', 'research', 'study', 'data', 'evidence', 'investigate']),
+        'confident': set(['confident', 'certain', 'sure', 'definitely', 'absolutely', 'undoubtedly']),
+        'tentative': set(['maybe', 'perhaps', 'possibly', 'might', 'could', 'uncertain', 'unclear']),
+        'informative': set(['inform', 'information', 'explain', 'clarify', 'detail', 'elaborate']),
+        'critical': set(['criticize', 'problem', 'issue', 'concern', 'flaw', 'defect', 'negative'])
+    }
+    
+    tone_counts = {}
+    for tone, words in tone_words.items():
+        count = sum(1 for token in doc if token.text.lower() in words)
+        tone_counts[tone] = count
+    
+    tone = max(tone_counts.items(), key=lambda x: x[1])[0] if any(tone_counts.values()) else 'neutral'
+    
+    return {
+        'score': sentiment_score,
+        'label': sentiment_label,
+        'tone': tone
+    }
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sentiment/tone lexicon scoring')
+    parser.add_argument('--articles', type=int, default=10000, help='Number of synthetic articles')
+    parser.add_argument('--words', type=int, default=400, help='Words per article')
+    args = parser.parse_args()
+
+    nlp = spacy.blank("en")
+    docs = list(nlp.pipe(build_corpus(args.articles, args.words), batch_size=256))
+
+    legacy, legacy_seconds = timed(lambda: [legacy_sentiment_from_doc(doc) for doc in docs])
+    single, single_seconds = timed(lambda: [DEFAULT_SCORER.score(doc) for doc in docs])
+    batch, batch_seconds = timed(lambda: DEFAULT_SCORER.score_many(docs))
+
+    assert single == legacy, "single-pass scorer disagrees with the legacy scorer"
+    assert batch == legacy, "vectorized scorer disagrees with the legacy scorer"
+
+    print(json.dumps({
+        'articles': args.articles,
+        'tokens': sum(len(doc) for doc in docs),
+        'legacy_seconds': round(legacy_seconds, 4),
+        'single_pass_seconds': round(single_seconds, 4),
+        'vectorized_seconds': round(batch_seconds, 4),
+        'single_pass_speedup': round(legacy_seconds / single_seconds, 1),
+        'vectorized_speedup': round(legacy_seconds / batch_seconds, 1)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure application start-up cost.
+
+Each run starts a fresh interpreter and records how long ``import app`` takes,
+the latency of the first request served by the test client, and how long the
+NLP models take to load on first use. Runs use a throw-away SQLite database
+unless --database-url is given. The medians are printed as JSON; with
+--budget-ms the script exits non-zero when the median import time exceeds
+the budget, so it can guard against start-up regressions.
+
+Usage:
+    python -m benchmarks.startup_bench [--runs=5] [--path=/] [--budget-ms=1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a fresh interpreter per run; prints one JSON line of timings
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+import_seconds = time.perf_counter() - started
+loaded = sorted(name for name in ('spacy', 'nltk', 'openai', 'trafilatura') if name in sys.modules)
+
+client = app.app.test_client()
+started = time.perf_counter()
+response = client.get(sys.argv[1])
+first_request_seconds = time.perf_counter() - started
+
+started = time.perf_counter()
+from utils.nlp_utils import get_nlp
+get_nlp()
+nlp_load_seconds = time.perf_counter() - started
+
+print(json.dumps({
+    'import_seconds': import_seconds,
+    'first_request_seconds': first_request_seconds,
+    'first_request_status': response.status_code,
+    'nlp_load_seconds': nlp_load_seconds,
+    'heavy_modules_after_import': loaded
+}))
+"""
+
+
+def run_probe(path, database_url):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE, path],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark import and first-request latency')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to start')
+    parser.add_argument('--path', default='/', help='Path requested as the first request')
+    parser.add_argument('--database-url', default=None, help='Database to use (default: temporary SQLite file)')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Fail if median import time exceeds this')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        runs = [run_probe(args.path, database_url) for _ in range(args.runs)]
+
+    report = {
+        'runs': args.runs,
+        'path': args.path,
+        'import_ms': round(statistics.median(r['import_seconds'] for r in runs) * 1000, 1),
+        'first_request_ms': round(statistics.median(r['first_request_seconds'] for r in runs) * 1000, 1),
+        'first_request_status': runs[-1]['first_request_status'],
+        'nlp_load_ms': round(statistics.median(r['nlp_load_seconds'] for r in runs) * 1000, 1),
+        'heavy_modules_after_import': runs[-1]['heavy_modules_after_import']
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.budget_ms is not None and report['import_ms'] > args.budget_ms:
+        print(f"import app took {report['import_ms']} ms, over the {args.budget_ms} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Shared pytest fixtures.
+
+``app`` creates its tables when it is imported, so the database and cache
+locations are pointed at a throw-away directory before anything imports it.
+Every test gets empty tables and empty in-process caches.
+"""
+
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+_tmp = tempfile.mkdtemp(prefix='journalist-tracker-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ['RESPONSE_CACHE_BACKEND'] = 'memory'
+os.environ['RESPONSE_CACHE_PATH'] = os.path.join(_tmp, 'response_cache.sqlite3')
+os.environ['SCRAPE_CACHE_PATH'] = os.path.join(_tmp, 'scrape_cache.sqlite3')
+os.environ['ANALYSIS_CACHE_PATH'] = os.path.join(_tmp, 'analysis_cache.sqlite3')
+
+import pytest  # noqa: E402
+from flask import g  # noqa: E402
+
+from app import app as flask_app, db  # noqa: E402
+
+
+def _reset_caches():
+    from utils import suggest
+    from utils.response_cache import get_backend
+    from utils.search import result_pages
+
+    result_pages.clear()
+    get_backend().bump_version()
+    suggest.suggest_index = suggest.SuggestIndex()
+
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        yield flask_app
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        db.session.remove()
+    _reset_caches()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def statement_count(response):
+    """
+    Number of SQL statements a response took, from its Server-Timing header.
+    """
+    return int(re.search(r'desc="(\d+) queries"', response.headers['Server-Timing']).group(1))
+
+
+@contextmanager
+def count_statements():
+    """
+    Count the SQL statements run inside the block with the per-request
+    counter from ``utils.instrumentation``.
+    """
+    from utils.instrumentation import RequestStats
+
+    with flask_app.test_request_context():
+        stats = g.request_stats = RequestStats()
+        yield stats
+
+
+def article_records(count, outlets=3, authors=5, start=0):
+    """
+    ``count`` ingestion records spread over a few outlets, authors, topics
+    and sentiment labels, one day apart.
+    """
+    from datetime import datetime, timedelta
+
+    topics = ['Bitcoin', 'Ethereum', 'Regulation']
+    labels = ['positive', 'neutral', 'negative']
+    return [
+        {
+            'title': f'Article {number}',
+            'url': f'https://news.example.com/articles/{number}',
+            'published_at': datetime(2024, 1, 1) + timedelta(days=number),
+            'source_name': f'Outlet {number % outlets}',
+            'author': f'Author {number % authors}',
+            'content': f'Content of article {number}',
+            'topics': [topics[number % len(topics)]],
+            'sentiment_score': (number % 3 - 1) * 0.5,
+            'sentiment_label': labels[number % 3],
+        }
+        for number in range(start, start + count)
+    ]
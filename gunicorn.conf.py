@@ -0,0 +1,25 @@
+"""
+Gunicorn settings.
+
+Set PRELOAD_NLP_MODELS=1 to load the app and the spaCy pipeline once in the
+master process; forked workers then share those pages copy-on-write instead
+of each loading the model on its first request.
+"""
+
+import gc
+import os
+
+PRELOAD_NLP_MODELS = os.environ.get("PRELOAD_NLP_MODELS", "").lower() in ("1", "true", "yes")
+
+preload_app = PRELOAD_NLP_MODELS
+
+
+def when_ready(server):
+    if not PRELOAD_NLP_MODELS:
+        return
+    from utils.nlp_utils import preload_models
+    preload_models()
+    # Keep the preloaded objects out of the collector so it does not touch
+    # (and un-share) their pages in the workers
+    gc.freeze()
+    server.log.info("Preloaded NLP models in the master process")
@@ -1,5 +1,10 @@
+from sqlalchemy import delete, select, update
 from app import app, db
-from models import Journalist, Outlet, Article, Topic
+from models import Journalist, Outlet, Article, Topic, ArticleDailyStat, TopicDailyStat, article_topics
+from utils.fulltext import install_fulltext
+from utils.ingestion import BATCH_SIZE, link_article_topics
+from utils.rollups import rebuild_rollups
+from utils.urls import normalize_url
 
 def add_journalist_fields():
     """
@@ -87,8 +92,120 @@ def populate_journalist_details():
             db.session.rollback()
             print(f"Error updating journalist details: {e}")
 
+def dedupe_article_urls():
+    """
+    Store every article URL in normalized form and merge articles that share
+    a normalized URL, so the unique index on article.url can be built.
+    The oldest article is kept and inherits the topic links of its duplicates.
+    """
+    with app.app_context():
+        try:
+            kept = {}
+            duplicates = {}
+            renamed = []
+            for article_id, url in db.session.execute(select(Article.id, Article.url).order_by(Article.id)):
+                normalized = normalize_url(url)
+                if normalized in kept:
+                    duplicates[article_id] = kept[normalized]
+                    continue
+                kept[normalized] = article_id
+                if normalized != url:
+                    renamed.append({'id': article_id, 'url': normalized})
+            
+            duplicate_ids = list(duplicates)
+            for start in range(0, len(duplicate_ids), BATCH_SIZE):
+                chunk = duplicate_ids[start:start + BATCH_SIZE]
+                links = db.session.execute(
+                    select(article_topics.c.article_id, article_topics.c.topic_id)
+                    .where(article_topics.c.article_id.in_(chunk))
+                ).all()
+                link_article_topics((duplicates[article_id], topic_id) for article_id, topic_id in links)
+                db.session.execute(delete(article_topics).where(article_topics.c.article_id.in_(chunk)))
+                db.session.execute(delete(Article).where(Article.id.in_(chunk)))
+            
+            if renamed:
+                db.session.execute(update(Article), renamed)
+            
+            db.session.commit()
+            print(f"Normalized {len(renamed)} article URLs and merged {len(duplicates)} duplicate articles")
+            
+            # The merged articles' days can no longer be looked up for an
+            # incremental refresh, so recount everything
+            if duplicates:
+                rebuild_rollups()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error de-duplicating article URLs: {e}")
+
+def _create_index_sql(index, dialect):
+    unique = "UNIQUE " if index.unique else ""
+    # Postgres builds the index without blocking writes; SQLite has no online
+    # build, but in WAL mode readers carry on while the index is created
+    concurrently = "CONCURRENTLY " if dialect == 'postgresql' else ""
+    columns = ", ".join(column.name for column in index.columns)
+    return f"CREATE {unique}INDEX {concurrently}IF NOT EXISTS {index.name} ON {index.table.name} ({columns})"
+
+def add_indexes():
+    """
+    Create the indexes declared in models.py on an existing database.
+    Run dedupe_article_urls() first so the unique URL index can be built.
+    """
+    tables = [Article.__table__, Journalist.__table__, Outlet.__table__, article_topics,
+              ArticleDailyStat.__table__, TopicDailyStat.__table__]
+    
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in tables:
+                for index in sorted(table.indexes, key=lambda index: index.name):
+                    try:
+                        if dialect == 'postgresql':
+                            # A failed concurrent build leaves an INVALID index that
+                            # IF NOT EXISTS would silently keep
+                            invalid = conn.execute(db.text(
+                                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                                "WHERE c.relname = :name AND NOT i.indisvalid"
+                            ), {'name': index.name}).first()
+                            if invalid:
+                                conn.execute(db.text(f"DROP INDEX CONCURRENTLY {index.name}"))
+                        conn.execute(db.text(_create_index_sql(index, dialect)))
+                        print(f"Index {index.name} is in place")
+                    except Exception as e:
+                        print(f"Error creating index {index.name}: {e}")
+
+def add_fulltext_search():
+    """
+    Create the full-text search index (tsvector + GIN on Postgres, FTS5 on
+    SQLite) for existing articles and journalists.
+    """
+    with app.app_context():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            try:
+                install_fulltext(conn, concurrently=conn.dialect.name == 'postgresql')
+                print("Full-text search index is in place")
+            except Exception as e:
+                print(f"Error creating full-text search index: {e}")
+
+def build_analytics_rollups():
+    """
+    Fill the daily analytics rollup tables from the existing articles.
+    """
+    with app.app_context():
+        try:
+            rebuild_rollups()
+            print("Rebuilt analytics rollups")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error building analytics rollups: {e}")
+
 if __name__ == "__main__":
     # Run migrations
     add_journalist_fields()
     populate_sample_regions()
-    populate_journalist_details()
\ No newline at end of file
+    populate_journalist_details()
+    dedupe_article_urls()
+    add_indexes()
+    add_fulltext_search()
+    build_analytics_rollups()
\ No newline at end of file
@@ -9,10 +9,17 @@ journalist_topics = db.Table('journalist_topics',
 
 article_topics = db.Table('article_topics',
     db.Column('article_id', db.Integer, db.ForeignKey('article.id'), primary_key=True),
-    db.Column('topic_id', db.Integer, db.ForeignKey('topic.id'), primary_key=True)
+    db.Column('topic_id', db.Integer, db.ForeignKey('topic.id'), primary_key=True),
+    # The primary key covers lookups by article; this one covers lookups by topic
+    db.Index('ix_article_topics_topic_id', 'topic_id')
 )
 
 class Journalist(db.Model):
+    __table_args__ = (
+        db.Index('ix_journalist_name', 'name'),
+        db.Index('ix_journalist_outlet_id', 'outlet_id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), nullable=True)
@@ -51,10 +58,14 @@ class Journalist(db.Model):
             'last_contacted': self.last_contacted.isoformat() if self.last_contacted else None,
             'outlet': self.outlet.to_dict() if self.outlet else None,
             'topics': [topic.name for topic in self.topics],
-            'article_count': len(self.articles) if self.articles else 0
+            'article_count': self.article_count
         }
 
 class Outlet(db.Model):
+    __table_args__ = (
+        db.Index('ix_outlet_name', 'name'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     website = db.Column(db.String(255), nullable=True)
@@ -79,10 +90,22 @@ class Outlet(db.Model):
             'country': self.country,
             'description': self.description,
             'image_url': self.image_url,
-            'journalist_count': len(self.journalists)
+            'journalist_count': self.journalist_count
         }
 
 class Article(db.Model):
+    __table_args__ = (
+        # URLs are stored normalized (utils.urls.normalize_url), so this also
+        # rejects trivially different spellings of the same article
+        db.Index('ix_article_url', 'url', unique=True),
+        # Per-outlet and per-journalist listings filter on the owner and sort by date;
+        # these also serve plain lookups by outlet_id / journalist_id
+        db.Index('ix_article_outlet_published', 'outlet_id', 'published_at'),
+        db.Index('ix_article_journalist_published', 'journalist_id', 'published_at'),
+        db.Index('ix_article_published_at', 'published_at'),
+        db.Index('ix_article_sentiment_label', 'sentiment_label'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     url = db.Column(db.String(255), nullable=False)
@@ -116,7 +139,9 @@ class Article(db.Model):
             'sentiment_label': self.sentiment_label,
             'tone': self.tone,
             'journalist': self.journalist.name if self.journalist else None,
+            'journalist_id': self.journalist_id,
             'outlet': self.outlet.name if self.outlet else None,
+            'outlet_id': self.outlet_id,
             'topics': [topic.name for topic in self.topics]
         }
 
@@ -139,6 +164,89 @@ class Topic(db.Model):
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'journalist_count': len(self.journalists),
-            'article_count': len(self.articles)
+            'journalist_count': self.journalist_count,
+            'article_count': self.article_count
         }
+
+# Relationship counts for to_dict, as correlated COUNT subqueries instead of
+# loading the whole collection. They are deferred: a plain query does not pay
+# for them, and utils.serializers undefers them so a page of rows gets its
+# counts in the same SELECT.
+Journalist.article_count = db.column_property(
+    db.select(db.func.count(Article.id))
+    .where(Article.journalist_id == Journalist.id)
+    .correlate_except(Article)
+    .scalar_subquery(),
+    deferred=True
+)
+
+Outlet.journalist_count = db.column_property(
+    db.select(db.func.count(Journalist.id))
+    .where(Journalist.outlet_id == Outlet.id)
+    .correlate_except(Journalist)
+    .scalar_subquery(),
+    deferred=True
+)
+
+Topic.journalist_count = db.column_property(
+    db.select(db.func.count())
+    .select_from(journalist_topics)
+    .where(journalist_topics.c.topic_id == Topic.id)
+    .scalar_subquery(),
+    deferred=True
+)
+
+Topic.article_count = db.column_property(
+    db.select(db.func.count())
+    .select_from(article_topics)
+    .where(article_topics.c.topic_id == Topic.id)
+    .scalar_subquery(),
+    deferred=True
+)
+
+class ArticleDailyStat(db.Model):
+    """
+    Daily article rollup per outlet, journalist, sentiment label and tone.
+    Derived from Article and maintained by utils.rollups.
+    """
+    __table_args__ = (
+        db.Index('ix_article_daily_stat_day', 'day'),
+        # Outlet and journalist pages read their own totals
+        db.Index('ix_article_daily_stat_outlet_id', 'outlet_id'),
+        db.Index('ix_article_daily_stat_journalist_id', 'journalist_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=True)  # NULL for articles without a publish date
+    outlet_id = db.Column(db.Integer, nullable=True)
+    journalist_id = db.Column(db.Integer, nullable=True)
+    sentiment_label = db.Column(db.String(20), nullable=True)
+    tone = db.Column(db.String(50), nullable=True)
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+    sentiment_total = db.Column(db.Float, nullable=False, default=0.0)  # Sum of sentiment scores
+    
+    def __repr__(self):
+        return f'<ArticleDailyStat {self.day} {self.article_count}>'
+
+class TopicDailyStat(db.Model):
+    """
+    Daily topic rollup per outlet, journalist and sentiment label.
+    Derived from Article and article_topics and maintained by utils.rollups.
+    """
+    __table_args__ = (
+        db.Index('ix_topic_daily_stat_day', 'day'),
+        db.Index('ix_topic_daily_stat_topic_id', 'topic_id'),
+        db.Index('ix_topic_daily_stat_outlet_id', 'outlet_id'),
+        db.Index('ix_topic_daily_stat_journalist_id', 'journalist_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=True)
+    topic_id = db.Column(db.Integer, nullable=False)
+    outlet_id = db.Column(db.Integer, nullable=True)
+    journalist_id = db.Column(db.Integer, nullable=True)
+    sentiment_label = db.Column(db.String(20), nullable=True)
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<TopicDailyStat {self.day} {self.topic_id} {self.article_count}>'
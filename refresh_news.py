@@ -90,9 +90,8 @@ def main():
     analyze_content = args.analyze.lower() == 'true'
     
     # Import necessary modules (delayed import to avoid circular imports)
-    from flask import Flask
-    from app import db, app
-    from models import Article, Journalist, Outlet, Topic
+    from app import app
+    from utils.ingestion import CRYPTO_TOPIC_KEYWORDS, article_from_news_api, ingest_articles
     
     # Fetch the latest crypto news
     articles = fetch_latest_crypto_news(days=args.days, limit=args.limit)
@@ -102,114 +101,21 @@ def main():
     
     # Process and add articles to the database
     with app.app_context():
-        articles_added = 0
+        # Tag topics from keywords in the title/description
+        records = [
+            article_from_news_api(article_data, topic_keywords=CRYPTO_TOPIC_KEYWORDS, default_sentiment=True)
+            for article_data in articles
+        ]
+        result = ingest_articles(records,
+                                 outlet_description="Crypto news outlet: {name}",
+                                 journalist_region='Unknown')  # Default region
         
-        for article_data in articles:
-            # Skip if missing critical fields
-            if not all(k in article_data for k in ['title', 'url', 'publishedAt']):
-                continue
-                
-            # Check if article already exists
-            existing = Article.query.filter_by(url=article_data['url']).first()
-            if existing:
-                continue
-                
-            # Get or create outlet
-            source_name = article_data.get('source', {}).get('name', 'Unknown Source')
-            logger.info(f"Processing article from {source_name}")
-            
-            outlet = Outlet.query.filter_by(name=source_name).first()
-            if not outlet:
-                outlet = Outlet(
-                    name=source_name,
-                    website=None,
-                    country=None,
-                    description=f"Crypto news outlet: {source_name}",
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                db.session.add(outlet)
-                db.session.flush()
-            
-            # Get or create journalist
-            author = article_data.get('author', 'Unknown Author')
-            journalist = Journalist.query.filter_by(name=author).first()
-            if not journalist:
-                journalist = Journalist(
-                    name=author,
-                    outlet_id=outlet.id,
-                    region='Unknown',  # Default region
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                db.session.add(journalist)
-                db.session.flush()
-            
-            # Parse published date
-            try:
-                published_at = datetime.strptime(article_data['publishedAt'], '%Y-%m-%dT%H:%M:%SZ')
-            except ValueError:
-                published_at = datetime.utcnow()
-            
-            # Create article
-            article = Article(
-                title=article_data['title'],
-                url=article_data['url'],
-                content=article_data.get('description', ''),
-                published_at=published_at,
-                journalist_id=journalist.id,
-                outlet_id=outlet.id,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-                sentiment_score=0.0,
-                sentiment_label='neutral'
-            )
-            
-            # Try to extract topics from keywords
-            crypto_topics = {
-                'Bitcoin': ['bitcoin', 'btc'],
-                'Ethereum': ['ethereum', 'eth'],
-                'DeFi': ['defi', 'decentralized finance'],
-                'NFT': ['nft', 'non-fungible'],
-                'Regulation': ['regulation', 'sec', 'compliance', 'legal'],
-                'Mining': ['mining', 'miner'],
-                'Exchanges': ['exchange', 'trading', 'binance', 'coinbase'],
-                'Cryptocurrency': ['cryptocurrency', 'crypto']
-            }
-            
-            article_text = (article_data.get('title', '') + ' ' + 
-                           article_data.get('description', '')).lower()
-            
-            # Get or create topics and add to article
-            for topic_name, keywords in crypto_topics.items():
-                if any(keyword in article_text for keyword in keywords):
-                    # Look up topic
-                    topic = Topic.query.filter_by(name=topic_name).first()
-                    if not topic:
-                        # Create topic if it doesn't exist
-                        topic = Topic(
-                            name=topic_name,
-                            created_at=datetime.utcnow(),
-                            updated_at=datetime.utcnow()
-                        )
-                        db.session.add(topic)
-                        db.session.flush()
-                    
-                    # Add topic to article
-                    article.topics.append(topic)
-            
-            # Add article to database
-            db.session.add(article)
-            articles_added += 1
-        
-        # Commit all changes if any articles were added
-        if articles_added > 0:
-            db.session.commit()
-            logger.info(f"Added {articles_added} new articles to the database")
+        if result.articles_added > 0:
+            logger.info(f"Added {result.articles_added} new articles to the database")
         else:
             logger.info("No new articles to add")
             
-        return articles_added
+        return result.articles_added
 
 if __name__ == "__main__":
     count = main()
@@ -1,54 +1,61 @@
 from flask import Blueprint, render_template, jsonify
-from models import Journalist, Outlet, Article, Topic
-from app import db
-from sqlalchemy import func
+from utils import rollups
+from utils.queries import entity_counts, outlet_journalist_counts
+from utils.response_cache import cached_response
 import json
 
 analytics_bp = Blueprint('analytics', __name__, url_prefix='/analytics')
 
+# Article aggregates below are read from the daily rollup tables (utils.rollups),
+# so these pages do not scan the article table
+
 @analytics_bp.route('/')
+@cached_response
 def dashboard():
     # Get counts for dashboard
-    journalist_count = Journalist.query.count()
-    outlet_count = Outlet.query.count()
-    article_count = Article.query.count()
-    topic_count = Topic.query.count()
+    counts = entity_counts(include_articles=False)
+    article_count = rollups.article_total()
     
     # Get sentiment distribution
-    positive_count = Article.query.filter(Article.sentiment_label == 'positive').count()
-    negative_count = Article.query.filter(Article.sentiment_label == 'negative').count()
-    neutral_count = Article.query.filter(Article.sentiment_label == 'neutral').count()
-    total_count = positive_count + negative_count + neutral_count
+    sentiment_counts = rollups.sentiment_totals()
+    total_count = sum(sentiment_counts.values())
     
     sentiment_data = {
         'labels': ['Positive', 'Negative', 'Neutral'],
         'data': [
-            round(positive_count / total_count * 100 if total_count > 0 else 0, 1),
-            round(negative_count / total_count * 100 if total_count > 0 else 0, 1),
-            round(neutral_count / total_count * 100 if total_count > 0 else 0, 1)
+            round(sentiment_counts[label] / total_count * 100 if total_count > 0 else 0, 1)
+            for label in ('positive', 'negative', 'neutral')
         ]
     }
     
     # Get topic distribution
-    topics = Topic.query.all()
+    topics = rollups.topic_totals(10)
     topic_data = {
-        'labels': [topic.name for topic in topics[:10]],
-        'data': [len(topic.articles) for topic in topics[:10]]
+        'labels': [topic.name for topic in topics],
+        'data': [topic.article_count for topic in topics]
     }
     
     # Get outlet distribution
-    outlets = Outlet.query.all()
+    outlets = outlet_journalist_counts(10)
     outlet_data = {
-        'labels': [outlet.name for outlet in outlets[:10]],
-        'data': [len(outlet.journalists) for outlet in outlets[:10]]
+        'labels': [outlet.name for outlet in outlets],
+        'data': [outlet.journalist_count for outlet in outlets]
     }
     
+    # Outlet table: journalist count and sentiment mix of the top outlets
+    outlet_sentiment = rollups.outlet_sentiment_totals([outlet.id for outlet in outlets[:5]])
+    outlet_rows = [
+        {
+            'id': outlet.id,
+            'name': outlet.name,
+            'journalist_count': outlet.journalist_count,
+            'sentiment': outlet_sentiment[outlet.id]
+        }
+        for outlet in outlets[:5]
+    ]
+    
     # Get tone distribution
-    tones = db.session.query(Article.tone, func.count(Article.id)).\
-        filter(Article.tone.isnot(None)).\
-        group_by(Article.tone).\
-        order_by(func.count(Article.id).desc()).\
-        all()
+    tones = rollups.tone_totals()
     
     tone_data = {
         'labels': [tone[0] for tone in tones],
@@ -56,24 +63,21 @@ def dashboard():
     }
     
     return render_template('analytics/dashboard.html',
-                          journalist_count=journalist_count,
-                          outlet_count=outlet_count,
+                          journalist_count=counts['journalists'],
+                          outlet_count=counts['outlets'],
                           article_count=article_count,
-                          topic_count=topic_count,
+                          topic_count=counts['topics'],
+                          outlets=outlet_rows,
                           sentiment_data=json.dumps(sentiment_data),
                           topic_data=json.dumps(topic_data),
                           outlet_data=json.dumps(outlet_data),
                           tone_data=json.dumps(tone_data))
 
 @analytics_bp.route('/data/sentiment')
+@cached_response
 def sentiment_data():
-    # Get sentiment data over time (last 30 days)
-    sentiment_over_time = db.session.query(
-        func.date(Article.published_at),
-        func.count(Article.id).filter(Article.sentiment_label == 'positive'),
-        func.count(Article.id).filter(Article.sentiment_label == 'negative'),
-        func.count(Article.id).filter(Article.sentiment_label == 'neutral')
-    ).group_by(func.date(Article.published_at)).order_by(func.date(Article.published_at)).all()
+    # Get sentiment data over time
+    sentiment_over_time = rollups.sentiment_by_day()
     
     data = {
         'dates': [row[0].strftime('%Y-%m-%d') if row[0] else 'Unknown' for row in sentiment_over_time],
@@ -85,27 +89,27 @@ def sentiment_data():
     return jsonify(data)
 
 @analytics_bp.route('/data/topics')
+@cached_response
 def topic_data():
     # Get topic distribution
-    topics = Topic.query.all()
-    topics_sorted = sorted(topics, key=lambda x: len(x.articles), reverse=True)
+    topics = rollups.topic_totals(15)
     
     data = {
-        'labels': [topic.name for topic in topics_sorted[:15]],
-        'data': [len(topic.articles) for topic in topics_sorted[:15]]
+        'labels': [topic.name for topic in topics],
+        'data': [topic.article_count for topic in topics]
     }
     
     return jsonify(data)
 
 @analytics_bp.route('/data/outlets')
+@cached_response
 def outlet_data():
     # Get outlet distribution
-    outlets = Outlet.query.all()
-    outlets_sorted = sorted(outlets, key=lambda x: len(x.journalists), reverse=True)
+    outlets = outlet_journalist_counts(15)
     
     data = {
-        'labels': [outlet.name for outlet in outlets_sorted[:15]],
-        'data': [len(outlet.journalists) for outlet in outlets_sorted[:15]]
+        'labels': [outlet.name for outlet in outlets],
+        'data': [outlet.journalist_count for outlet in outlets]
     }
     
     return jsonify(data)
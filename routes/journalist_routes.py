@@ -1,10 +1,29 @@
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for
-from models import Journalist, Article, Outlet, Topic
+from models import Journalist, ArticleDailyStat, Outlet, Topic, TopicDailyStat
 from app import db
+from sqlalchemy.orm import joinedload
+from utils import fulltext, rollups
+from utils.datatables import TableColumn, table_response
+from utils.export import JOURNALIST_FIELDS, ExportSection, export_response, journalist_records
+from utils.pagination import page_args, page_json, paginate, wants_json
+from utils.queries import SENTIMENT_LABELS, filter_predominant_sentiment
+from utils.response_cache import cached_response
+from utils.serializers import serializable
 
 journalist_bp = Blueprint('journalists', __name__, url_prefix='/journalists')
 
+# Columns of the server-side journalist table (GET /journalists/table); the
+# search box runs a full-text search
+JOURNALIST_COLUMNS = [
+    TableColumn('name', 'journalist_name', sort=Journalist.name),
+    TableColumn('outlet', 'journalist_outlet'),
+    TableColumn('location', 'journalist_location'),
+    TableColumn('region', 'journalist_region'),
+    TableColumn('beat', 'journalist_beat')
+]
+
 @journalist_bp.route('/')
+@cached_response
 def list_journalists():
     # Get query parameters for filtering
     location = request.args.get('location', '')
@@ -22,38 +41,35 @@ def list_journalists():
     if outlet:
         query = query.join(Journalist.outlet).filter(Outlet.name.ilike(f'%{outlet}%'))
     
+    # EXISTS rather than a join: a journalist matching through several topics
+    # must still be one row, or the page's LIMIT counts it several times
     if topic:
-        query = query.join(Journalist.topics).filter(Topic.name.ilike(f'%{topic}%'))
-    
-    # Get all journalists after filtering
-    journalists = query.all()
-    
-    # Filter by sentiment (client-side filtering would be more efficient,
-    # but this demonstrates the capability)
-    if sentiment and sentiment in ['positive', 'negative', 'neutral']:
-        # Filter journalists who predominantly write articles with the given sentiment
-        filtered_journalists = []
-        for journalist in journalists:
-            sentiment_articles = [article for article in journalist.articles 
-                                if article.sentiment_label == sentiment]
-            if sentiment_articles and len(sentiment_articles) > len(journalist.articles) / 3:
-                filtered_journalists.append(journalist)
-        journalists = filtered_journalists
-    
-    return render_template('journalists/list.html', journalists=journalists)
+        query = query.filter(Journalist.topics.any(Topic.name.ilike(f'%{topic}%')))
+    
+    # Filter journalists who predominantly write articles with the given sentiment
+    if sentiment and sentiment in SENTIMENT_LABELS:
+        query = filter_predominant_sentiment(query, sentiment)
+    
+    # Eager-load the outlet and topics that both the template and to_dict read
+    query = serializable(query, Journalist)
+    
+    # Get one page of journalists, ordered by (name, id)
+    cursor, page_size = page_args()
+    page = paginate(query, Journalist.name, Journalist.id, cursor, page_size)
+    
+    if wants_json():
+        return jsonify(page_json(page, lambda journalist: journalist.to_dict()))
+    
+    return render_template('journalists/list.html', journalists=page.items, page=page)
 
 @journalist_bp.route('/<int:journalist_id>')
 def journalist_detail(journalist_id):
-    journalist = Journalist.query.get_or_404(journalist_id)
+    journalist = db.get_or_404(Journalist, journalist_id)
     
-    # Get articles by this journalist
-    articles = Article.query.filter_by(journalist_id=journalist_id).order_by(Article.published_at.desc()).all()
-    
-    # Calculate sentiment distribution
-    positive_count = sum(1 for article in articles if article.sentiment_label == 'positive')
-    negative_count = sum(1 for article in articles if article.sentiment_label == 'negative')
-    neutral_count = sum(1 for article in articles if article.sentiment_label == 'neutral')
-    total_count = len(articles)
+    # Totals come from the daily rollups; the article table itself is paged
+    # server-side from news.article_table
+    article_count = rollups.article_total(ArticleDailyStat.journalist_id == journalist_id)
+    sentiment_counts = rollups.sentiment_totals(ArticleDailyStat.journalist_id == journalist_id)
     
     # Prepare data for Charts.js
     sentiment_data = {
@@ -62,45 +78,50 @@ def journalist_detail(journalist_id):
     }
     
     # Only calculate percentages if there are articles
-    if total_count > 0:
+    if article_count > 0:
         sentiment_data['data'] = [
-            round(positive_count / total_count * 100, 1),
-            round(negative_count / total_count * 100, 1),
-            round(neutral_count / total_count * 100, 1)
+            round(sentiment_counts[label] / article_count * 100, 1) for label in ('positive', 'negative', 'neutral')
         ]
     
-    # Get topic distribution
-    topic_counts = {}
-    for article in articles:
-        for topic in article.topics:
-            if topic.name in topic_counts:
-                topic_counts[topic.name] += 1
-            else:
-                topic_counts[topic.name] = 1
-    
-    # Prepare topic data
+    # Get the five most covered topics
+    topics = rollups.topic_totals(5, TopicDailyStat.journalist_id == journalist_id)
     topic_data = {
-        'labels': [],
-        'data': []
+        'labels': [topic.name for topic in topics],
+        'data': [topic.article_count for topic in topics]
     }
     
-    # Only process topics if we have some
-    if topic_counts:
-        # Sort topics by count
-        sorted_topics = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)
-        topic_data = {
-            'labels': [item[0] for item in sorted_topics[:5]],
-            'data': [item[1] for item in sorted_topics[:5]]
-        }
-    
     return render_template('journalists/detail.html', 
                           journalist=journalist, 
-                          articles=articles,
+                          article_count=article_count,
                           sentiment_data=sentiment_data,
                           topic_data=topic_data)
 
+@journalist_bp.route('/table')
+def journalist_table():
+    """
+    DataTables server-side endpoint for journalists, optionally for one outlet.
+    """
+    query = Journalist.query.options(joinedload(Journalist.outlet))
+    
+    outlet_id = request.args.get('outlet_id', type=int)
+    if outlet_id:
+        query = query.filter(Journalist.outlet_id == outlet_id)
+    
+    def search(query, value):
+        return fulltext.search(query, Journalist, value)[0]
+    
+    return table_response(query, JOURNALIST_COLUMNS, Journalist.id, default_order=(Journalist.name,), search=search)
+
 @journalist_bp.route('/export')
 def export_journalists():
-    journalists = Journalist.query.all()
-    journalists_data = [journalist.to_dict() for journalist in journalists]
-    return jsonify(journalists_data)
+    """
+    Stream journalists as JSON, NDJSON or CSV (``format=``), optionally just one (``id=``).
+    """
+    query = Journalist.query
+    
+    journalist_id = request.args.get('id', type=int)
+    if journalist_id:
+        query = query.filter(Journalist.id == journalist_id)
+    
+    return export_response([ExportSection('journalists', JOURNALIST_FIELDS, journalist_records(query))],
+                           'journalists')
@@ -1,13 +1,33 @@
 from flask import Blueprint, render_template, jsonify, request, redirect, url_for
 from models import Article, Topic, db
 from sqlalchemy import desc
+from sqlalchemy.orm import joinedload, selectinload
 import logging
 import importlib
+from utils.datatables import TableColumn, table_response
+from utils.pagination import page_args, page_json, paginate, wants_json
+from utils.response_cache import cached_response
+from utils import fulltext
+from utils.search import SearchFilters, search_articles
+from utils.serializers import serializable
 
 news_bp = Blueprint('news', __name__, url_prefix='/news')
 logger = logging.getLogger(__name__)
 
+# Columns of the server-side article tables (GET /news/table). Only indexed
+# columns are sortable; the search box runs a full-text search.
+ARTICLE_COLUMNS = [
+    TableColumn('title', 'article_title'),
+    TableColumn('published', 'article_published', sort=Article.published_at),
+    TableColumn('journalist', 'article_journalist'),
+    TableColumn('outlet', 'article_outlet'),
+    TableColumn('sentiment', 'article_sentiment', sort=Article.sentiment_label),
+    TableColumn('topics', 'article_topics'),
+    TableColumn('actions', 'article_actions')
+]
+
 @news_bp.route('/')
+@cached_response
 def latest_news():
     """
     Display the latest news articles with filter options.
@@ -30,24 +50,62 @@ def latest_news():
     
     # Apply filters
     if keyword:
-        query = query.filter(
-            (Article.title.ilike(f'%{keyword}%')) | 
-            (Article.content.ilike(f'%{keyword}%'))
-        )
+        query, _ = fulltext.search(query, Article, keyword)
     
     if topic:
-        query = query.join(Article.topics).filter(Topic.name == topic)
+        query = query.filter(Article.topics.any(Topic.name == topic))
+    
+    # Eager-load the journalist, outlet and topics that both the template and to_dict read
+    query = serializable(query, Article)
+    
+    # Get one page of the latest articles, ordered by (published_at, id) newest first
+    cursor, page_size = page_args()
+    page = paginate(query, Article.published_at, Article.id, cursor, page_size, descending=True)
     
-    # Get the latest articles
-    articles = query.order_by(desc(Article.published_at)).limit(50).all()
+    if wants_json():
+        return jsonify(page_json(page, lambda article: article.to_dict()))
     
     return render_template('news/latest.html', 
-                          articles=articles, 
+                          articles=page.items, 
+                          page=page, 
                           topics=topics,
                           current_keyword=keyword,
                           current_topic=topic,
                           current_days=days)
 
+@news_bp.route('/table')
+def article_table():
+    """
+    DataTables server-side endpoint for articles.
+    
+    Tables can be scoped to one journalist or outlet (``journalist_id``,
+    ``outlet_id``) or to the search page filters (``q``, ``topic``,
+    ``country``, ``region``, ``sentiment``).
+    """
+    query = Article.query.options(
+        joinedload(Article.journalist),
+        joinedload(Article.outlet),
+        selectinload(Article.topics)
+    )
+    
+    filters = SearchFilters.from_args(request.args)
+    q = filters.q
+    query, rank = search_articles(filters, query)
+    
+    # Text searches list the most relevant articles first, with highlighted excerpts
+    default_order = (rank.desc(),) if rank is not None else (Article.published_at.desc(),)
+    
+    def search(query, value):
+        return fulltext.search(query, Article, value)[0]
+    
+    def add_snippets(articles):
+        snippets = fulltext.snippets(Article, [article.id for article in articles], q) if q else {}
+        for article in articles:
+            article.search_snippet = snippets.get(article.id)
+    
+    return table_response(query, ARTICLE_COLUMNS, Article.id, default_order=default_order,
+                          search=search, prepare=add_snippets)
+
 @news_bp.route('/refresh')
 def refresh_news():
     """
@@ -1,10 +1,29 @@
 from flask import Blueprint, render_template, request, jsonify
-from models import Outlet, Journalist, Article, Topic
+from models import Outlet, Journalist, ArticleDailyStat, Topic, TopicDailyStat
 from app import db
+from sqlalchemy.orm import selectinload, undefer
+from utils import rollups
+from utils.datatables import TableColumn, table_response
+from utils.export import OUTLET_FIELDS, ExportSection, export_response, outlet_records
+from utils.pagination import page_args, page_json, paginate, wants_json
+from utils.response_cache import cached_response
+from utils.serializers import serializable
 
 outlet_bp = Blueprint('outlets', __name__, url_prefix='/outlets')
 
+# Journalists shown on an outlet's page; the rest are on the journalist list
+# filtered by the outlet
+DETAIL_JOURNALIST_LIMIT = 12
+
+# Columns of the server-side outlet table (GET /outlets/table)
+OUTLET_COLUMNS = [
+    TableColumn('name', 'outlet_name', sort=Outlet.name, search=Outlet.name),
+    TableColumn('country', 'outlet_country', search=Outlet.country),
+    TableColumn('website', 'outlet_website')
+]
+
 @outlet_bp.route('/')
+@cached_response
 def list_outlets():
     # Get query parameters for filtering
     country = request.args.get('country', '')
@@ -17,70 +36,96 @@ def list_outlets():
     if country:
         query = query.filter(Outlet.country.ilike(f'%{country}%'))
     
+    # EXISTS rather than joins: an outlet matching through several journalists
+    # or topics must still be one row, or the page's LIMIT counts it several times
     if topic:
-        query = query.join(Outlet.journalists).join(Journalist.topics).filter(Topic.name.ilike(f'%{topic}%'))
+        query = query.filter(Outlet.journalists.any(Journalist.topics.any(Topic.name.ilike(f'%{topic}%'))))
+    
+    # Load journalist counts with the rows; the page also shows each
+    # outlet's first journalists, loaded for the whole page at once
+    query = serializable(query, Outlet)
+    if not wants_json():
+        query = query.options(selectinload(Outlet.journalists))
+    
+    # Get one page of outlets, ordered by (name, id)
+    cursor, page_size = page_args()
+    page = paginate(query, Outlet.name, Outlet.id, cursor, page_size)
     
-    # Get all outlets after filtering
-    outlets = query.all()
+    if wants_json():
+        return jsonify(page_json(page, lambda outlet: outlet.to_dict()))
     
     # Get countries for filter dropdown
     countries = db.session.query(Outlet.country).distinct().all()
     countries = [country[0] for country in countries if country[0]]
     
-    return render_template('outlets/list.html', outlets=outlets, countries=countries)
+    # Article counts of the page's outlets from the daily rollups
+    article_counts = {
+        outlet_id: sum(counts.values())
+        for outlet_id, counts in rollups.outlet_sentiment_totals([outlet.id for outlet in page.items]).items()
+    }
+    
+    return render_template('outlets/list.html', outlets=page.items, countries=countries, page=page,
+                           article_counts=article_counts)
 
 @outlet_bp.route('/<int:outlet_id>')
 def outlet_detail(outlet_id):
-    outlet = Outlet.query.get_or_404(outlet_id)
+    outlet = db.get_or_404(Outlet, outlet_id, options=[undefer(Outlet.journalist_count)])
     
-    # Get journalists for this outlet
-    journalists = Journalist.query.filter_by(outlet_id=outlet_id).all()
+    # Get the first journalists of this outlet by name
+    journalists = (Journalist.query.options(selectinload(Journalist.topics))
+                   .filter_by(outlet_id=outlet_id).order_by(Journalist.name, Journalist.id)
+                   .limit(DETAIL_JOURNALIST_LIMIT).all())
     
-    # Get articles for this outlet
-    articles = Article.query.filter_by(outlet_id=outlet_id).order_by(Article.published_at.desc()).limit(10).all()
-    
-    # Calculate sentiment distribution for outlet articles
-    outlet_articles = Article.query.filter_by(outlet_id=outlet_id).all()
-    positive_count = sum(1 for article in outlet_articles if article.sentiment_label == 'positive')
-    negative_count = sum(1 for article in outlet_articles if article.sentiment_label == 'negative')
-    neutral_count = sum(1 for article in outlet_articles if article.sentiment_label == 'neutral')
-    total_count = len(outlet_articles)
+    # Totals come from the daily rollups; the article table itself is paged
+    # server-side from news.article_table
+    article_count = rollups.article_total(ArticleDailyStat.outlet_id == outlet_id)
+    sentiment_counts = rollups.sentiment_totals(ArticleDailyStat.outlet_id == outlet_id)
     
     # Prepare data for Charts.js
     sentiment_data = {
         'labels': ['Positive', 'Negative', 'Neutral'],
         'data': [
-            round(positive_count / total_count * 100 if total_count > 0 else 0, 1),
-            round(negative_count / total_count * 100 if total_count > 0 else 0, 1),
-            round(neutral_count / total_count * 100 if total_count > 0 else 0, 1)
+            round(sentiment_counts[label] / article_count * 100 if article_count > 0 else 0, 1)
+            for label in ('positive', 'negative', 'neutral')
         ]
     }
     
-    # Get topic distribution
-    topic_counts = {}
-    for article in outlet_articles:
-        for topic in article.topics:
-            if topic.name in topic_counts:
-                topic_counts[topic.name] += 1
-            else:
-                topic_counts[topic.name] = 1
-    
-    # Sort topics by count
-    sorted_topics = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)
+    # Get the five most covered topics
+    topics = rollups.topic_totals(5, TopicDailyStat.outlet_id == outlet_id)
     topic_data = {
-        'labels': [item[0] for item in sorted_topics[:5]],
-        'data': [item[1] for item in sorted_topics[:5]]
+        'labels': [topic.name for topic in topics],
+        'data': [topic.article_count for topic in topics]
     }
     
     return render_template('outlets/detail.html', 
                           outlet=outlet, 
                           journalists=journalists,
-                          articles=articles,
+                          article_count=article_count,
                           sentiment_data=sentiment_data,
                           topic_data=topic_data)
 
+@outlet_bp.route('/table')
+def outlet_table():
+    """
+    DataTables server-side endpoint for outlets.
+    """
+    query = Outlet.query
+    
+    country = request.args.get('country', '')
+    if country:
+        query = query.filter(Outlet.country == country)
+    
+    return table_response(query, OUTLET_COLUMNS, Outlet.id, default_order=(Outlet.name,))
+
 @outlet_bp.route('/export')
 def export_outlets():
-    outlets = Outlet.query.all()
-    outlets_data = [outlet.to_dict() for outlet in outlets]
-    return jsonify(outlets_data)
+    """
+    Stream outlets as JSON, NDJSON or CSV (``format=``), optionally just one (``id=``).
+    """
+    query = Outlet.query
+    
+    outlet_id = request.args.get('id', type=int)
+    if outlet_id:
+        query = query.filter(Outlet.id == outlet_id)
+    
+    return export_response([ExportSection('outlets', OUTLET_FIELDS, outlet_records(query))], 'outlets')
@@ -1,10 +1,31 @@
-from flask import Blueprint, render_template, request, jsonify
-from models import Journalist, Outlet, Article, Topic
+from flask import Blueprint, render_template, request, jsonify, url_for
+from models import Journalist, Outlet, Topic
 from app import db
-from sqlalchemy import or_
+from utils import fulltext
+from utils.export import (ARTICLE_FIELDS, JOURNALIST_FIELDS, OUTLET_FIELDS, ExportSection, article_records,
+                          export_format, export_response, journalist_records, outlet_records)
+from utils.pagination import page_args
+from utils.search import ENTITY_TYPES, MODELS, SearchFilters, result_page, search_query
+from utils.suggest import DEFAULT_SUGGESTIONS, suggest
 
 search_bp = Blueprint('search', __name__, url_prefix='/search')
 
+EXPORT_FIELDS = {'journalists': JOURNALIST_FIELDS, 'outlets': OUTLET_FIELDS, 'articles': ARTICLE_FIELDS}
+EXPORT_RECORDS = {'journalists': journalist_records, 'outlets': outlet_records, 'articles': article_records}
+
+def _with_snippets(model, items, query):
+    """
+    Serialize search results, adding a highlighted ``snippet`` for text searches.
+    """
+    snippets = fulltext.snippets(model, [item.id for item in items], query) if query else {}
+    results = []
+    for item in items:
+        data = item.to_dict()
+        if item.id in snippets:
+            data['snippet'] = str(snippets[item.id])
+        results.append(data)
+    return results
+
 @search_bp.route('/')
 def search_page():
     # Get all topics for filtering
@@ -23,234 +44,82 @@ def search_page():
 @search_bp.route('/results')
 def search_results():
     # Get search parameters
-    query = request.args.get('q', '')
+    filters = SearchFilters.from_args(request.args)
     entity_type = request.args.get('type', 'all')
-    topic = request.args.get('topic', '')
-    country = request.args.get('country', '')
-    region = request.args.get('region', '')
-    sentiment = request.args.get('sentiment', '')
     
     results = {
         'journalists': [],
         'outlets': [],
         'articles': []
     }
+    # Each result type is paged separately with its own <type>_cursor parameter
+    pages = {}
     
-    # Search journalists
-    if entity_type in ['all', 'journalists']:
-        journalist_query = Journalist.query
-        
-        if query:
-            journalist_query = journalist_query.filter(
-                or_(
-                    Journalist.name.ilike(f'%{query}%'),
-                    Journalist.bio.ilike(f'%{query}%'),
-                    Journalist.location.ilike(f'%{query}%'),
-                    Journalist.email.ilike(f'%{query}%'),
-                    Journalist.twitter_handle.ilike(f'%{query}%'),
-                    Journalist.beat.ilike(f'%{query}%')
-                )
-            )
-        
-        if topic:
-            journalist_query = journalist_query.join(Journalist.topics).filter(Topic.name == topic)
-        
-        if country:
-            journalist_query = journalist_query.join(Journalist.outlet).filter(Outlet.country == country)
-        
-        if region:
-            journalist_query = journalist_query.filter(Journalist.region == region)
-            
-        # Add verification filter if needed
-        # if verified_only:
-        #     journalist_query = journalist_query.filter(Journalist.verified == True)
-        
-        journalists = journalist_query.all()
-        
-        # Filter by sentiment (this is more complex and would need a more sophisticated query in production)
-        if sentiment and sentiment in ['positive', 'negative', 'neutral']:
-            filtered_journalists = []
-            for journalist in journalists:
-                sentiment_articles = [article for article in journalist.articles 
-                                    if article.sentiment_label == sentiment]
-                if sentiment_articles and len(sentiment_articles) > len(journalist.articles) / 3:
-                    filtered_journalists.append(journalist)
-            journalists = filtered_journalists
-        
-        results['journalists'] = [journalist.to_dict() for journalist in journalists]
-    
-    # Search outlets
-    if entity_type in ['all', 'outlets']:
-        outlet_query = Outlet.query
-        
-        if query:
-            outlet_query = outlet_query.filter(
-                or_(
-                    Outlet.name.ilike(f'%{query}%'),
-                    Outlet.description.ilike(f'%{query}%'),
-                    Outlet.website.ilike(f'%{query}%')
-                )
-            )
-        
-        if country:
-            outlet_query = outlet_query.filter(Outlet.country == country)
-        
-        if region and topic:
-            # Outlets with journalists in the specified region and topic
-            outlet_query = outlet_query.join(Outlet.journalists).filter(
-                Journalist.region == region
-            ).join(Journalist.topics).filter(Topic.name == topic)
-        elif region:
-            # Outlets with journalists in the specified region
-            outlet_query = outlet_query.join(Outlet.journalists).filter(Journalist.region == region)
-        elif topic:
-            # This is a complex query - outlets that have journalists who write about this topic
-            outlet_query = outlet_query.join(Outlet.journalists).join(Journalist.topics).filter(Topic.name == topic)
-        
-        outlets = outlet_query.all()
-        results['outlets'] = [outlet.to_dict() for outlet in outlets]
-    
-    # Search articles
-    if entity_type in ['all', 'articles']:
-        article_query = Article.query
-        
-        if query:
-            article_query = article_query.filter(
-                or_(
-                    Article.title.ilike(f'%{query}%'),
-                    Article.content.ilike(f'%{query}%')
-                )
-            )
-        
-        if topic:
-            article_query = article_query.join(Article.topics).filter(Topic.name == topic)
-        
-        if country:
-            article_query = article_query.join(Article.outlet).filter(Outlet.country == country)
-        
-        if region:
-            article_query = article_query.join(Article.journalist).filter(Journalist.region == region)
-            
-        if sentiment:
-            article_query = article_query.filter(Article.sentiment_label == sentiment)
-        
-        articles = article_query.all()
-        results['articles'] = [article.to_dict() for article in articles]
+    for name in ENTITY_TYPES:
+        if entity_type not in ['all', name]:
+            continue
+        cursor, page_size = page_args(f'{name}_')
+        pages[name] = result_page(name, filters, cursor, page_size)
+        # Journalist and article text matches carry a highlighted excerpt
+        if name == 'outlets':
+            results[name] = [outlet.to_dict() for outlet in pages[name].items]
+        else:
+            results[name] = _with_snippets(MODELS[name], pages[name].items, filters.q)
     
     # If this is an AJAX request, return JSON
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        results['next_cursors'] = {name: page.next_cursor for name, page in pages.items()}
         return jsonify(results)
     
     # Otherwise render the template with results
     return render_template('search/results.html', 
                           results=results, 
-                          query=query, 
+                          pages=pages,
+                          query=filters.q, 
                           entity_type=entity_type,
-                          topic=topic,
-                          country=country,
-                          region=region,
-                          sentiment=sentiment)
+                          topic=filters.topic,
+                          country=filters.country,
+                          region=filters.region,
+                          sentiment=filters.sentiment)
 
-@search_bp.route('/export')
-def export_results():
-    # Similar logic to search_results, but always returns JSON
+@search_bp.route('/suggest')
+def search_suggest():
+    """
+    Typeahead suggestions for the search box, answered from the in-memory index.
+    """
     query = request.args.get('q', '')
-    entity_type = request.args.get('type', 'all')
-    topic = request.args.get('topic', '')
-    country = request.args.get('country', '')
-    region = request.args.get('region', '')
-    sentiment = request.args.get('sentiment', '')
-    
-    results = {
-        'journalists': [],
-        'outlets': [],
-        'articles': []
-    }
+    limit = request.args.get('limit', DEFAULT_SUGGESTIONS, type=int)
     
-    # Search journalists
-    if entity_type in ['all', 'journalists']:
-        journalist_query = Journalist.query
-        
-        if query:
-            journalist_query = journalist_query.filter(
-                or_(
-                    Journalist.name.ilike(f'%{query}%'),
-                    Journalist.bio.ilike(f'%{query}%'),
-                    Journalist.location.ilike(f'%{query}%'),
-                    Journalist.email.ilike(f'%{query}%'),
-                    Journalist.twitter_handle.ilike(f'%{query}%'),
-                    Journalist.beat.ilike(f'%{query}%')
-                )
-            )
-        
-        if topic:
-            journalist_query = journalist_query.join(Journalist.topics).filter(Topic.name == topic)
-        
-        if country:
-            journalist_query = journalist_query.join(Journalist.outlet).filter(Outlet.country == country)
-        
-        if region:
-            journalist_query = journalist_query.filter(Journalist.region == region)
-            
-        journalists = journalist_query.all()
-        results['journalists'] = [journalist.to_dict() for journalist in journalists]
+    suggestions = []
+    for item in suggest(query, limit):
+        if item.kind == 'journalist':
+            url = url_for('journalists.journalist_detail', journalist_id=item.id)
+        elif item.kind == 'outlet':
+            url = url_for('outlets.outlet_detail', outlet_id=item.id)
+        elif item.kind == 'topic':
+            url = url_for('search.search_results', topic=item.label)
+        else:
+            url = item.url
+        suggestions.append({'type': item.kind, 'id': item.id, 'label': item.label, 'url': url})
     
-    # Search outlets
-    if entity_type in ['all', 'outlets']:
-        outlet_query = Outlet.query
-        
-        if query:
-            outlet_query = outlet_query.filter(
-                or_(
-                    Outlet.name.ilike(f'%{query}%'),
-                    Outlet.description.ilike(f'%{query}%'),
-                    Outlet.website.ilike(f'%{query}%')
-                )
-            )
-        
-        if country:
-            outlet_query = outlet_query.filter(Outlet.country == country)
-        
-        if region and topic:
-            # Outlets with journalists in the specified region and topic
-            outlet_query = outlet_query.join(Outlet.journalists).filter(
-                Journalist.region == region
-            ).join(Journalist.topics).filter(Topic.name == topic)
-        elif region:
-            # Outlets with journalists in the specified region
-            outlet_query = outlet_query.join(Outlet.journalists).filter(Journalist.region == region)
-        elif topic:
-            # This is a complex query - outlets that have journalists who write about this topic
-            outlet_query = outlet_query.join(Outlet.journalists).join(Journalist.topics).filter(Topic.name == topic)
-        
-        outlets = outlet_query.all()
-        results['outlets'] = [outlet.to_dict() for outlet in outlets]
+    return jsonify({'query': query, 'suggestions': suggestions})
+
+@search_bp.route('/export')
+def export_results():
+    # Same filters as search_results, but streams every match (see utils.export).
+    # Article tables on the journalist and outlet pages pass journalist_id or
+    # outlet_id to export their own articles.
+    fmt = export_format()
+    filters = SearchFilters.from_args(request.args)
+    entity_type = request.args.get('type', 'all')
     
-    # Search articles
-    if entity_type in ['all', 'articles']:
-        article_query = Article.query
-        
-        if query:
-            article_query = article_query.filter(
-                or_(
-                    Article.title.ilike(f'%{query}%'),
-                    Article.content.ilike(f'%{query}%')
-                )
-            )
-        
-        if topic:
-            article_query = article_query.join(Article.topics).filter(Topic.name == topic)
-        
-        if country:
-            article_query = article_query.join(Article.outlet).filter(Outlet.country == country)
-        
-        if region:
-            article_query = article_query.join(Article.journalist).filter(Journalist.region == region)
-            
-        if sentiment:
-            article_query = article_query.filter(Article.sentiment_label == sentiment)
-        
-        articles = article_query.all()
-        results['articles'] = [article.to_dict() for article in articles]
+    sections = []
+    for name in ENTITY_TYPES:
+        # JSON keeps its {"journalists": [...], "outlets": [...], "articles": [...]} shape
+        if entity_type in ['all', name]:
+            query, _ = search_query(name, filters)
+            sections.append(ExportSection(name, EXPORT_FIELDS[name], EXPORT_RECORDS[name](query)))
+        elif fmt == 'json':
+            sections.append(ExportSection(name, EXPORT_FIELDS[name], iter(())))
     
-    return jsonify(results)
\ No newline at end of file
+    return export_response(sections, f'search-{entity_type}', fmt)
@@ -27,6 +27,27 @@ document.addEventListener('DOMContentLoaded', function() {
             order: [[table.getAttribute('data-sort-column') || 0, table.getAttribute('data-sort-direction') || 'asc']]
         };
         
+        // Tables with a data source are paged, sorted and searched by the server,
+        // which only returns the visible rows; "All" is not offered there
+        const source = table.getAttribute('data-source');
+        if (source) {
+            // Without a sort column the server picks the order (e.g. relevance)
+            if (!table.hasAttribute('data-sort-column')) {
+                options.order = [];
+            }
+            Object.assign(options, {
+                serverSide: true,
+                processing: true,
+                searchDelay: 400,
+                ajax: source,
+                lengthMenu: [10, 25, 50, 100],
+                columns: Array.from(table.querySelectorAll('thead th')).map(th => ({
+                    data: th.getAttribute('data-column'),
+                    orderable: th.getAttribute('data-orderable') !== 'false'
+                }))
+            });
+        }
+        
         // Initialize DataTable
         const dataTable = new DataTable(table, options);
         
@@ -51,7 +72,14 @@ document.addEventListener('DOMContentLoaded', function() {
             exportButton.className = 'btn btn-sm btn-outline-secondary';
             exportButton.textContent = 'Export CSV';
             exportButton.addEventListener('click', function() {
-                exportTableToCSV(table);
+                // Server-side tables only hold the visible page; download
+                // every matching row from the streaming export instead
+                const exportUrl = table.getAttribute('data-export-url');
+                if (exportUrl) {
+                    window.location.href = exportUrl;
+                } else {
+                    exportTableToCSV(table);
+                }
             });
             
             buttonContainer.appendChild(exportButton);
@@ -64,8 +92,9 @@ function exportTableToCSV(table) {
     const dataTable = DataTable.instance(table);
     if (!dataTable) return;
     
-    // Get all data from the table
-    const data = dataTable.data().toArray();
+    // Get all data from the table (the visible page for server-side tables)
+    const columns = Array.from(table.querySelectorAll('thead th')).map(th => th.getAttribute('data-column'));
+    const data = dataTable.data().toArray().map(row => Array.isArray(row) ? row : columns.map(column => row[column]));
     
     // Get header row
     const headers = [];
@@ -24,70 +24,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Function to export data to CSV
 function exportToCSV(endpoint) {
-    fetch(endpoint)
-        .then(response => response.json())
-        .then(data => {
-            // Convert JSON to CSV
-            const csv = convertToCSV(data);
-            
-            // Create a download link
-            const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
-            const url = URL.createObjectURL(blob);
-            const link = document.createElement('a');
-            link.setAttribute('href', url);
-            link.setAttribute('download', `export-${Date.now()}.csv`);
-            link.style.visibility = 'hidden';
-            document.body.appendChild(link);
-            link.click();
-            document.body.removeChild(link);
-        })
-        .catch(error => {
-            console.error('Error exporting data:', error);
-            alert('Error exporting data. Please try again.');
-        });
-}
-
-// Helper function to convert JSON to CSV
-function convertToCSV(objArray) {
-    if (!objArray || !objArray.length) {
-        return '';
-    }
-    
-    const array = typeof objArray !== 'object' ? JSON.parse(objArray) : objArray;
-    let str = '';
-    
-    // Get headers
-    const headers = Object.keys(array[0]);
-    str += headers.join(',') + '\r\n';
-    
-    // Add data rows
-    for (let i = 0; i < array.length; i++) {
-        let line = '';
-        for (let index in headers) {
-            if (line !== '') line += ',';
-            
-            // Handle nested objects and arrays
-            let value = array[i][headers[index]];
-            if (value === null || value === undefined) {
-                value = '';
-            } else if (typeof value === 'object') {
-                value = JSON.stringify(value);
-            }
-            
-            // Escape quotes and commas in values
-            if (typeof value === 'string') {
-                value = value.replace(/"/g, '""');
-                if (value.includes(',') || value.includes('"') || value.includes('\n')) {
-                    value = `"${value}"`;
-                }
-            }
-            
-            line += value;
-        }
-        str += line + '\r\n';
-    }
-    
-    return str;
+    // The server streams the CSV file; let the browser download it directly
+    const url = new URL(endpoint, window.location.origin);
+    url.searchParams.set('format', 'csv');
+    window.location.href = url.toString();
 }
 
 // Function to toggle sidebar (for mobile)
@@ -10,15 +10,21 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
-    // Handle AJAX search for instant results
+    // Show typeahead suggestions while typing; full results load on submit
     const searchInput = document.getElementById('search-query');
     if (searchInput) {
         let debounceTimer;
         searchInput.addEventListener('input', function() {
             clearTimeout(debounceTimer);
             debounceTimer = setTimeout(function() {
-                performSearch();
-            }, 500); // Debounce for 500ms
+                fetchSuggestions(searchInput);
+            }, 100); // Debounce for 100ms
+        });
+        searchInput.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') hideSuggestions();
+        });
+        document.addEventListener('click', function(e) {
+            if (!searchInput.parentNode.contains(e.target)) hideSuggestions();
         });
     }
     
@@ -44,6 +50,68 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
+// Requests still in flight; a newer request cancels the older one
+let suggestController = null;
+let searchController = null;
+
+function fetchSuggestions(input) {
+    if (suggestController) suggestController.abort();
+    
+    const query = input.value.trim();
+    if (!query) {
+        hideSuggestions();
+        return;
+    }
+    
+    suggestController = new AbortController();
+    fetch(`/search/suggest?q=${encodeURIComponent(query)}`, { signal: suggestController.signal })
+    .then(response => response.json())
+    .then(data => {
+        displaySuggestions(input, data.suggestions);
+    })
+    .catch(error => {
+        if (error.name !== 'AbortError') {
+            console.error('Error fetching suggestions:', error);
+        }
+    });
+}
+
+function displaySuggestions(input, suggestions) {
+    let list = document.getElementById('search-suggestions');
+    if (!list) {
+        list = document.createElement('div');
+        list.id = 'search-suggestions';
+        list.className = 'list-group position-absolute w-100 shadow text-start';
+        list.style.top = '100%';
+        list.style.left = '0';
+        list.style.zIndex = '1050';
+        input.parentNode.appendChild(list);
+    }
+    
+    list.innerHTML = '';
+    suggestions.forEach(suggestion => {
+        const link = document.createElement('a');
+        link.className = 'list-group-item list-group-item-action d-flex justify-content-between align-items-center';
+        link.href = suggestion.url;
+        if (suggestion.type === 'article') link.target = '_blank';
+        
+        const label = document.createElement('span');
+        label.textContent = suggestion.label;
+        const badge = document.createElement('span');
+        badge.className = 'badge bg-secondary';
+        badge.textContent = suggestion.type;
+        
+        link.append(label, badge);
+        list.appendChild(link);
+    });
+    list.classList.toggle('d-none', suggestions.length === 0);
+}
+
+function hideSuggestions() {
+    const list = document.getElementById('search-suggestions');
+    if (list) list.classList.add('d-none');
+}
+
 function performSearch() {
     const searchForm = document.getElementById('search-form');
     const resultsContainer = document.getElementById('search-results');
@@ -56,17 +124,21 @@ function performSearch() {
     // Show loading state
     resultsContainer.innerHTML = '<div class="text-center my-5"><div class="spinner-border text-primary" role="status"><span class="visually-hidden">Loading...</span></div></div>';
     
-    // Make AJAX request
+    // Make AJAX request, cancelling any search still in flight
+    if (searchController) searchController.abort();
+    searchController = new AbortController();
     fetch(`/search/results?${params.toString()}`, {
         headers: {
             'X-Requested-With': 'XMLHttpRequest'
-        }
+        },
+        signal: searchController.signal
     })
     .then(response => response.json())
     .then(data => {
         displaySearchResults(data);
     })
     .catch(error => {
+        if (error.name === 'AbortError') return;
         console.error('Error performing search:', error);
         resultsContainer.innerHTML = '<div class="alert alert-danger">An error occurred while searching. Please try again.</div>';
     });
@@ -118,7 +190,7 @@ function displaySearchResults(data) {
                                     <p class="text-muted mb-0">${journalist.outlet || 'Independent'}</p>
                                 </div>
                             </div>
-                            <p class="card-text">${journalist.bio?.substring(0, 100) || 'No bio available'}${journalist.bio?.length > 100 ? '...' : ''}</p>
+                            <p class="card-text">${journalist.snippet || (journalist.bio?.substring(0, 100) || 'No bio available') + (journalist.bio?.length > 100 ? '...' : '')}</p>
                             <div class="d-flex justify-content-between align-items-center mt-3">
                                 <small class="text-muted">${journalist.location || 'Location unknown'}</small>
                                 <a href="/journalists/${journalist.id}" class="btn btn-sm btn-outline-primary">View Profile</a>
@@ -185,6 +257,7 @@ function displaySearchResults(data) {
                         <h5 class="mb-1">${article.title}</h5>
                         <span class="badge ${sentimentClass}">${article.sentiment_label || 'Unknown'}</span>
                     </div>
+                    ${article.snippet ? `<p class="mb-1 small">${article.snippet}</p>` : ''}
                     <p class="mb-1">
                         <small class="text-muted">By ${article.journalist || 'Unknown'} for ${article.outlet || 'Unknown'}</small>
                     </p>
@@ -0,0 +1,32 @@
+"""
+The add_recent_articles importer keeps its own topic keywords: unlike the
+other importers it never tagged articles with Mining.
+"""
+
+import add_recent_articles
+from models import Article
+
+
+class NewsAPIResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'status': 'ok', 'articles': [{
+            'title': 'Bitcoin miner expands mining operations',
+            'url': 'https://news.example.com/articles/miner',
+            'publishedAt': '2024-01-10T12:00:00Z',
+            'description': 'The miner added capacity.',
+            'source': {'name': 'Coin Daily'},
+            'author': 'Maya Chen'
+        }]}
+
+
+def test_articles_are_not_tagged_with_mining(app, monkeypatch):
+    monkeypatch.setenv('NEWS_API_KEY', 'test-key')
+    monkeypatch.setattr(add_recent_articles.requests, 'get', lambda url, params: NewsAPIResponse())
+
+    assert add_recent_articles.add_recent_articles() == 1
+
+    article = Article.query.one()
+    assert [topic.name for topic in article.topics] == ['Bitcoin']
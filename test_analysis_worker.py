@@ -0,0 +1,47 @@
+"""
+Tests for storing LLM analysis results.
+"""
+
+from datetime import datetime
+
+from app import db
+from models import Article, Topic
+from utils.analysis_worker import TOPIC_NAME_LENGTH, write_analyses
+from utils.ingestion import ingest_articles
+
+
+def ingest_one():
+    result = ingest_articles([{
+        'title': 'Bitcoin ETF approved',
+        'url': 'https://example.com/bitcoin-etf',
+        'published_at': datetime(2024, 1, 10, 12, 0),
+        'source_name': 'Coin Daily',
+        'author': 'Maya Chen',
+        'content': 'Regulators approved the first spot bitcoin ETF.'
+    }])
+    return result.article_ids[0]
+
+
+def analysis(topics):
+    return {'score': 0.4, 'label': 'positive', 'tone': 'confident', 'topics': topics}
+
+
+def test_write_analyses_stores_sentiment_and_topics(app):
+    article_id = ingest_one()
+    write_analyses([(article_id, analysis(['Bitcoin', 'ETFs']))])
+
+    article = db.session.get(Article, article_id)
+    assert article.sentiment_label == 'positive'
+    assert article.tone == 'confident'
+    assert sorted(topic.name for topic in article.topics) == ['Bitcoin', 'ETFs']
+
+
+def test_write_analyses_drops_topic_names_too_long_for_the_column(app):
+    article_id = ingest_one()
+    long_name = 'x' * (TOPIC_NAME_LENGTH + 1)
+    write_analyses([(article_id, analysis(['Bitcoin', long_name]))])
+
+    article = db.session.get(Article, article_id)
+    assert article.sentiment_label == 'positive'
+    assert [topic.name for topic in article.topics] == ['Bitcoin']
+    assert Topic.query.filter_by(name=long_name).count() == 0
@@ -0,0 +1,30 @@
+"""
+The dashboard's statement count must not creep back up: it is a fixed number
+of aggregate and eager-loaded queries whatever the amount of data.
+"""
+
+from conftest import article_records, statement_count
+from utils.ingestion import ingest_articles
+
+# entity counts, latest journalists, latest articles, top topics, sentiment
+DASHBOARD_STATEMENTS = 5
+
+
+def test_dashboard_statement_count_is_capped(client):
+    ingest_articles(article_records(60, outlets=6, authors=12))
+
+    response = client.get('/')
+
+    assert response.status_code == 200
+    assert statement_count(response) <= DASHBOARD_STATEMENTS
+
+
+def test_dashboard_statement_count_does_not_grow_with_data(client):
+    ingest_articles(article_records(5))
+    small = statement_count(client.get('/'))
+
+    # New articles bump the response cache version, so this is a fresh render
+    ingest_articles(article_records(200, outlets=20, authors=40, start=5))
+    large = statement_count(client.get('/'))
+
+    assert large == small
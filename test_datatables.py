@@ -0,0 +1,65 @@
+"""
+DataTables server-side endpoints: paging, ordering, searching and scoping.
+"""
+
+import re
+
+from conftest import article_records
+from models import Outlet
+from utils.ingestion import ingest_articles
+from utils.pagination import MAX_PAGE_SIZE
+
+
+def _table(client, url, **args):
+    response = client.get(url, query_string=args)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _names(data):
+    # Cells are rendered links; keep their text
+    return [re.sub(r'<[^>]+>', '', row['name']).strip() for row in data['data']]
+
+
+def test_outlet_table_pages_and_orders(client):
+    ingest_articles(article_records(5, outlets=5))
+
+    data = _table(client, '/outlets/table', **{
+        'draw': 3, 'start': 1, 'length': 2,
+        'columns[0][data]': 'name', 'order[0][column]': 0, 'order[0][dir]': 'desc'
+    })
+
+    assert (data['draw'], data['recordsTotal'], data['recordsFiltered']) == (3, 5, 5)
+    assert _names(data) == ['Outlet 3', 'Outlet 2']
+
+
+def test_outlet_table_searches_and_ignores_unsortable_columns(client):
+    ingest_articles(article_records(12, outlets=12))
+
+    data = _table(client, '/outlets/table', **{
+        'search[value]': 'Outlet 1',
+        'columns[0][data]': 'website', 'order[0][column]': 0, 'order[0][dir]': 'desc'
+    })
+
+    # Outlet 1, 10 and 11, in the default (name) order
+    assert (data['recordsTotal'], data['recordsFiltered']) == (12, 3)
+    assert _names(data) == ['Outlet 1', 'Outlet 10', 'Outlet 11']
+
+
+def test_article_table_is_scoped_and_uses_full_text_search(client):
+    ingest_articles(article_records(6, outlets=2))
+    outlet = Outlet.query.filter_by(name='Outlet 1').one()
+
+    data = _table(client, '/news/table', outlet_id=outlet.id, **{'search[value]': 'article 3'})
+
+    assert (data['recordsTotal'], data['recordsFiltered']) == (3, 1)
+    assert 'Article 3' in data['data'][0]['title']
+
+
+def test_table_length_is_clamped(client):
+    ingest_articles(article_records(MAX_PAGE_SIZE + 5, outlets=1, authors=MAX_PAGE_SIZE + 5))
+
+    data = _table(client, '/journalists/table', length=-1)
+
+    assert len(data['data']) == MAX_PAGE_SIZE
+    assert data['recordsTotal'] == MAX_PAGE_SIZE + 5
@@ -0,0 +1,29 @@
+"""
+Export downloads: content negotiation of the gzip encoding.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from conftest import article_records
+from utils.ingestion import ingest_articles
+
+
+@pytest.mark.parametrize('accept_encoding, gzipped', [
+    ('gzip, deflate', True),
+    ('*', True),
+    ('gzip;q=0, identity', False),
+    ('identity', False),
+    ('', False),
+])
+def test_export_gzip_follows_accept_encoding(client, accept_encoding, gzipped):
+    ingest_articles(article_records(3, outlets=2))
+
+    response = client.get('/outlets/export?format=json', headers={'Accept-Encoding': accept_encoding})
+
+    assert response.status_code == 200
+    assert response.headers.get('Content-Encoding') == ('gzip' if gzipped else None)
+    body = gzip.decompress(response.data) if gzipped else response.data
+    assert sorted(outlet['name'] for outlet in json.loads(body)) == ['Outlet 0', 'Outlet 1']
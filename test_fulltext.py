@@ -0,0 +1,70 @@
+"""
+Full-text search: query parsing, matching, ranking and snippets.
+"""
+
+from app import db
+from conftest import article_records
+from models import Article
+from utils import fulltext
+from utils.fulltext import SearchTerm, parse_query
+from utils.ingestion import ingest_articles
+
+
+def _ingest(*titles_and_contents):
+    records = article_records(len(titles_and_contents))
+    for record, (title, content) in zip(records, titles_and_contents):
+        record['title'], record['content'] = title, content
+    ingest_articles(records)
+
+
+def _search(text):
+    query, rank = fulltext.search(Article.query, Article, text)
+    return [article.title for article in query.order_by(rank.desc(), Article.id)]
+
+
+def test_parse_query():
+    assert parse_query('Bitcoin "spot ETF" regul* "layer two"*') == [
+        SearchTerm(('bitcoin',)),
+        SearchTerm(('spot', 'etf')),
+        SearchTerm(('regul',), prefix=True),
+        SearchTerm(('layer', 'two'), prefix=True),
+    ]
+    assert parse_query(' -- ') == []
+
+
+def test_search_uses_the_installed_index(app):
+    assert fulltext._backend_for(fulltext.INDEXES[Article]) is not fulltext.LIKE_BACKEND
+
+
+def test_search_matches_words_phrases_and_prefixes(app):
+    _ingest(
+        ('Spot ETF approved', 'Regulators approved a spot bitcoin ETF.'),
+        ('ETF outflows', 'Spot markets fell while ETF outflows grew.'),
+        ('Miners sell', 'Bitcoin miners sold their reserves.'),
+    )
+
+    assert sorted(_search('bitcoin')) == ['Miners sell', 'Spot ETF approved']
+    assert _search('"spot bitcoin"') == ['Spot ETF approved']
+    assert sorted(_search('spot etf')) == ['ETF outflows', 'Spot ETF approved']
+    assert _search('min*') == ['Miners sell']
+    assert _search('') == []
+
+
+def test_search_follows_updates(app):
+    _ingest(('Quiet day', 'Nothing happened.'))
+    article = Article.query.one()
+    article.content = 'A surprise halving rally.'
+    db.session.commit()
+
+    assert _search('halving') == ['Quiet day']
+    assert _search('nothing') == []
+
+
+def test_snippets_are_escaped_and_highlighted(app):
+    _ingest(('Tags', 'The <b>staking</b> yields of staking pools.'))
+    article = Article.query.one()
+
+    snippet = str(fulltext.snippets(Article, [article.id], 'staking')[article.id])
+
+    assert '<mark>staking</mark>' in snippet
+    assert '&lt;b&gt;' in snippet
@@ -0,0 +1,82 @@
+"""
+Batched article ingestion: de-duplication, entity resolution and the
+articles_changed signal.
+"""
+
+from sqlalchemy import func, select
+
+from app import db
+from conftest import article_records
+from models import Article, Journalist, Outlet, Topic, article_topics
+from utils.ingestion import BATCH_SIZE, ingest_articles
+from utils.signals import articles_changed
+
+
+def _count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+
+def test_ingest_creates_articles_and_their_entities_once(app):
+    result = ingest_articles(article_records(12, outlets=3, authors=4))
+
+    assert (result.articles_added, result.outlets_added, result.journalists_added, result.topics_added) == (12, 3, 4, 3)
+    assert result.topic_links_added == 12
+    assert (_count(Article), _count(Outlet), _count(Journalist), _count(Topic)) == (12, 3, 4, 3)
+    assert _count(article_topics) == 12
+    article = Article.query.filter_by(url='https://news.example.com/articles/5').one()
+    assert (article.outlet.name, article.journalist.name, [topic.name for topic in article.topics]) == (
+        'Outlet 2', 'Author 1', ['Regulation'])
+    assert article.journalist.outlet.name == 'Outlet 1'
+
+
+def test_ingest_reuses_existing_entities(app):
+    ingest_articles(article_records(6, outlets=2, authors=2))
+
+    result = ingest_articles(article_records(6, outlets=2, authors=2, start=6))
+
+    assert (result.articles_added, result.outlets_added, result.journalists_added, result.topics_added) == (6, 0, 0, 0)
+    assert (_count(Outlet), _count(Journalist), _count(Topic)) == (2, 2, 3)
+
+
+def test_ingest_skips_known_repeated_and_invalid_records(app):
+    ingest_articles(article_records(3))
+    records = article_records(5)
+    # Same article under a URL that normalizes to a stored one
+    records[0]['url'] = 'https://News.example.com/articles/0/?utm_source=feed'
+    # Repeated within the batch
+    records.append(dict(records[4]))
+    records.append({'title': 'No author', 'url': 'https://news.example.com/x', 'source_name': 'Outlet 0'})
+    records.append(None)
+
+    result = ingest_articles(records)
+
+    assert (result.received, result.invalid, result.duplicates, result.articles_added) == (8, 2, 4, 2)
+    assert _count(Article) == 5
+    # The caller's records are not rewritten
+    assert records[0]['url'] == 'https://News.example.com/articles/0/?utm_source=feed'
+
+
+def test_ingest_splits_large_batches(app):
+    count = BATCH_SIZE * 2 + 10
+    result = ingest_articles(article_records(count, outlets=7, authors=BATCH_SIZE + 3))
+
+    assert result.articles_added == _count(Article) == count
+    assert result.journalists_added == _count(Journalist) == BATCH_SIZE + 3
+    assert sorted(result.article_ids) == sorted(db.session.scalars(select(Article.id)))
+
+
+def test_ingest_sends_articles_changed_after_commit(app):
+    received = []
+
+    def receiver(sender, article_ids=(), **kwargs):
+        received.append(sorted(article_ids))
+
+    with articles_changed.connected_to(receiver):
+        ingest_articles(article_records(3), commit=False)
+        assert received == []
+        db.session.rollback()
+
+        result = ingest_articles(article_records(3))
+        ingest_articles(article_records(3))
+
+    assert received == [sorted(result.article_ids)]
@@ -0,0 +1,62 @@
+"""
+Per-request SQL and timing instrumentation.
+"""
+
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from conftest import article_records, count_statements, statement_count
+from models import Article
+from utils.ingestion import ingest_articles
+
+
+def test_server_timing_reports_the_request_statements(client):
+    ingest_articles(article_records(3))
+
+    response = client.get('/journalists/table')
+
+    timing = response.headers['Server-Timing']
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, app;dur=[\d.]+, total;dur=[\d.]+', timing)
+    # Total count, the page of rows and its outlets in the same SELECT
+    assert statement_count(response) == 2
+
+
+def test_statements_are_counted_only_inside_a_request(app):
+    with count_statements() as stats:
+        Article.query.count()
+        Article.query.first()
+
+    assert stats.statements == 2
+    # No request context: the engine listener has nothing to record into
+    Article.query.count()
+    assert stats.statements == 2
+
+
+def test_failed_statements_do_not_leave_start_times_behind(app):
+    # Per-DBAPI-connection dict; it outlives the session's Connection
+    info = db.session.connection().info
+    with count_statements() as stats:
+        with pytest.raises(OperationalError):
+            db.session.execute(text('SELECT * FROM no_such_table'))
+        db.session.rollback()
+        Article.query.count()
+
+    assert info['query_started'] == []
+    assert stats.statements == 1
+
+
+def test_metrics_aggregate_per_endpoint(client):
+    client.get('/outlets/table')
+    client.get('/outlets/table')
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+
+    assert re.search(r'^http_requests_total\{endpoint="outlets.outlet_table",method="GET",status="200"\} \d+$',
+                     metrics, re.MULTILINE)
+    assert re.search(r'^http_request_sql_statements_total\{endpoint="outlets.outlet_table"\} \d+$',
+                     metrics, re.MULTILINE)
+    assert '# TYPE http_request_duration_seconds histogram' in metrics
@@ -0,0 +1,25 @@
+"""
+Journalist page: loaded by primary key, 404 for unknown journalists.
+"""
+
+import pytest
+
+from conftest import article_records
+from models import Journalist
+from utils.ingestion import ingest_articles
+
+pytestmark = pytest.mark.filterwarnings('error::sqlalchemy.exc.LegacyAPIWarning')
+
+
+def test_journalist_detail_shows_the_journalist(client):
+    ingest_articles(article_records(3, outlets=1, authors=1))
+    journalist = Journalist.query.one()
+
+    response = client.get(f'/journalists/{journalist.id}')
+
+    assert response.status_code == 200
+    assert 'Author 0' in response.get_data(as_text=True)
+
+
+def test_missing_journalist_is_not_found(client):
+    assert client.get('/journalists/999').status_code == 404
@@ -0,0 +1,39 @@
+"""
+Tests for the precompiled sentiment/tone lexicon.
+"""
+
+import spacy
+from spacy.tokens import Doc
+
+from utils.lexicon import DEFAULT_SCORER, Lexicon
+
+nlp = spacy.blank('en')
+
+
+def doc(words, lemmas=None):
+    return Doc(nlp.vocab, words=words, lemmas=lemmas)
+
+
+def test_matches_lowercased_form():
+    lexicon = Lexicon({'positive': ['great'], 'negative': ['awful']})
+    assert lexicon.count(doc(['A', 'GREAT', 'and', 'Great', 'day'])) == [2, 0]
+
+
+def test_matches_lowercased_lemma_of_capitalized_tokens():
+    # Proper-noun lemmas keep their case; the lexicon holds lowercase words
+    lexicon = Lexicon({'analytical': ['analysis'], 'critical': ['problem']})
+    words = doc(['Analyses', 'of', 'Problems'], lemmas=['Analysis', 'of', 'Problem'])
+    assert lexicon.count(words) == [1, 1]
+    counts, lengths = lexicon.count_many([words])
+    assert counts.tolist() == [[1, 1]]
+    assert lengths.tolist() == [3]
+
+
+def test_score_many_matches_score():
+    docs = [
+        doc(['Excellent', 'Research', 'results'], lemmas=['Excellent', 'Research', 'result']),
+        doc(['Terrible', 'news', 'maybe'], lemmas=['terrible', 'news', 'maybe']),
+        doc(['plain', 'words']),
+        doc([])
+    ]
+    assert DEFAULT_SCORER.score_many(docs) == [DEFAULT_SCORER.score(d) for d in docs]
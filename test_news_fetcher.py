@@ -0,0 +1,54 @@
+"""
+News feed processing: downloaded pages are ingested in batches while the
+remaining pages are still downloading.
+"""
+
+from sqlalchemy import func, select
+
+from app import db
+from models import Article
+from utils import news_fetcher
+
+
+def _news_api_articles(count):
+    return [{
+        'title': f'Article {n}',
+        'url': f'https://news.example.com/articles/{n}',
+        'publishedAt': f'2024-01-{n + 1:02d}T00:00:00Z',
+        'description': f'Summary {n}',
+        'source': {'name': 'Outlet'},
+        'author': 'Author'
+    } for n in range(count)]
+
+
+def test_pages_are_ingested_while_later_ones_download(app, monkeypatch):
+    stored_before_download = []
+    analyzed = []
+
+    def fake_downloads(urls):
+        for url in urls:
+            stored_before_download.append(db.session.scalar(select(func.count()).select_from(Article)))
+            yield url, f'Full text of {url}'
+
+    async def fake_analysis(article_ids):
+        analyzed.extend(article_ids)
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(news_fetcher, 'INGEST_BATCH_SIZE', 2)
+    monkeypatch.setattr(news_fetcher, 'iter_website_text_contents', fake_downloads)
+    monkeypatch.setattr(news_fetcher, 'run_analysis_worker', fake_analysis)
+
+    assert news_fetcher.process_news_articles(_news_api_articles(5)) == 5
+
+    assert stored_before_download == [0, 0, 2, 2, 4]
+    assert sorted(analyzed) == sorted(article.id for article in Article.query.all())
+    assert Article.query.filter_by(url='https://news.example.com/articles/4').one().content == (
+        'Full text of https://news.example.com/articles/4')
+
+
+def test_without_analysis_articles_are_ingested_in_one_batch(app, monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setattr(news_fetcher, 'iter_website_text_contents', None)
+
+    assert news_fetcher.process_news_articles(_news_api_articles(3)) == 3
+    assert news_fetcher.process_news_articles(_news_api_articles(3)) == 0
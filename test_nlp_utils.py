@@ -0,0 +1,67 @@
+"""
+Bulk spaCy analysis streams articles through ``nlp.pipe`` and commits once
+per chunk.
+"""
+
+import spacy
+from sqlalchemy import event
+
+from app import db
+from conftest import article_records
+from models import Article
+from utils import nlp_utils
+from utils.ingestion import ingest_articles
+
+
+class StubNLP:
+    """Tokenizer-only pipeline that records the batches ``pipe`` processes."""
+
+    def __init__(self):
+        self.nlp = spacy.blank('en')
+        self.batches = []
+        self.streamed = None
+
+    def pipe(self, texts, as_tuples=False, batch_size=1000, n_process=1):
+        self.streamed = not isinstance(texts, (list, tuple))
+        batch = []
+        for text, context in texts:
+            batch.append((text, context))
+            if len(batch) == batch_size:
+                yield from self._process(batch)
+                batch = []
+        if batch:
+            yield from self._process(batch)
+
+    def _process(self, batch):
+        self.batches.append(len(batch))
+        return [(self.nlp.make_doc(text), context) for text, context in batch]
+
+
+def test_analyze_all_articles_commits_once_per_chunk(app, monkeypatch):
+    records = [
+        {key: value for key, value in record.items() if not key.startswith('sentiment')}
+        for record in article_records(7)
+    ]
+    records[3]['content'] = ''
+    ingest_articles(records)
+
+    nlp = StubNLP()
+    monkeypatch.setattr(nlp_utils, 'get_nlp', lambda: nlp)
+    # The change receivers (rollups) commit on their own; record the notifications instead
+    notified = []
+    monkeypatch.setattr(nlp_utils, 'notify_articles_changed', lambda sender, ids: notified.append(len(ids)))
+    commits = []
+    session = db.session()
+    record_commit = lambda session: commits.append(1)  # noqa: E731
+    event.listen(session, 'after_commit', record_commit)
+    try:
+        analyzed = nlp_utils.analyze_all_articles(chunk_size=3, batch_size=2, n_process=1)
+    finally:
+        event.remove(session, 'after_commit', record_commit)
+
+    assert analyzed == 6
+    assert nlp.streamed
+    assert nlp.batches == [2, 2, 2]
+    assert len(commits) == 2
+    assert notified == [3, 3]
+    assert Article.query.filter(Article.sentiment_label.is_(None)).count() == 1
@@ -0,0 +1,111 @@
+"""
+OpenAI analysis through stub clients: one request per article, none for
+texts already in the persistent analysis cache.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app import db
+from models import Article
+from utils import openai_analyzer
+from utils.analysis_worker import RateLimiter, run_analysis_worker
+from utils.ingestion import ingest_articles
+
+ANSWER = {
+    'sentiment_score': 0.6,
+    'sentiment_label': 'positive',
+    'tone': 'confident',
+    'topics': ['Bitcoin'],
+    'summary': 'Bitcoin rallied.'
+}
+
+
+def _completion():
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(ANSWER)))],
+        usage=SimpleNamespace(total_tokens=120)
+    )
+
+
+class StubCompletions:
+    def __init__(self):
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs['messages'][-1]['content'])
+        return _completion()
+
+
+class AsyncStubCompletions(StubCompletions):
+    async def create(self, **kwargs):
+        return super().create(**kwargs)
+
+
+def stub_client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+@pytest.fixture
+def analysis_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(openai_analyzer, 'ANALYSIS_CACHE_PATH', str(tmp_path / 'analysis.sqlite3'))
+    monkeypatch.setattr(openai_analyzer, '_cache', None)
+    # set_client() replaces these globals; monkeypatch puts the originals back
+    monkeypatch.setattr(openai_analyzer, '_client', None)
+    monkeypatch.setattr(openai_analyzer, '_async_client', None)
+
+
+def test_clients_use_the_configured_base_url(analysis_cache, monkeypatch):
+    monkeypatch.setattr(openai_analyzer, 'OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(openai_analyzer, 'OPENAI_BASE_URL', 'http://127.0.0.1:9999/v1')
+
+    client, owned = openai_analyzer.get_async_client()
+
+    assert owned
+    assert str(client.base_url) == 'http://127.0.0.1:9999/v1/'
+    assert str(openai_analyzer.get_client().base_url) == 'http://127.0.0.1:9999/v1/'
+
+
+def test_analysis_is_requested_once_per_text(analysis_cache):
+    completions = StubCompletions()
+    openai_analyzer.set_client(client=stub_client(completions))
+
+    first = openai_analyzer.analyze_article_content('Bitcoin rallied on ETF inflows.')
+    second = openai_analyzer.analyze_article_content('Bitcoin rallied on ETF inflows.')
+
+    assert completions.requests == ['Bitcoin rallied on ETF inflows.']
+    assert first == second
+    assert (first['label'], first['topics']) == ('positive', ['Bitcoin'])
+
+
+def test_worker_sends_one_request_per_article_and_reuses_cached_analyses(app, analysis_cache):
+    completions = AsyncStubCompletions()
+    openai_analyzer.set_client(async_client=stub_client(completions))
+    records = [{
+        'title': f'Article {n}',
+        'url': f'https://news.example.com/articles/{n}',
+        'published_at': datetime(2024, 1, n + 1),
+        'source_name': 'Coin Daily',
+        'author': 'Maya Chen',
+        'content': f'Body of article {n}'
+    } for n in range(3)]
+    article_ids = ingest_articles(records).article_ids
+
+    stats = asyncio.run(run_analysis_worker(article_ids, limiter=RateLimiter(600, 10 ** 6)))
+
+    assert (stats['analyzed'], stats['cached'], stats['failed']) == (3, 0, 0)
+    assert sorted(completions.requests) == [f'Body of article {n}' for n in range(3)]
+    assert {article.sentiment_label for article in Article.query.all()} == {'positive'}
+
+    # Analyze the same texts again: every answer comes from the cache
+    Article.query.update({Article.sentiment_label: None})
+    db.session.commit()
+    stats = asyncio.run(run_analysis_worker(article_ids, limiter=RateLimiter(600, 10 ** 6)))
+
+    assert (stats['analyzed'], stats['cached']) == (0, 3)
+    assert len(completions.requests) == 3
+    assert {article.sentiment_label for article in Article.query.all()} == {'positive'}
@@ -0,0 +1,38 @@
+"""
+Outlet page: the journalist list is capped, the totals are not.
+"""
+
+import pytest
+
+from conftest import article_records
+from models import Outlet
+from routes.outlet_routes import DETAIL_JOURNALIST_LIMIT
+from utils.ingestion import ingest_articles
+
+
+@pytest.mark.filterwarnings('error::sqlalchemy.exc.LegacyAPIWarning')
+def test_outlet_detail_caps_the_journalist_list(client):
+    authors = DETAIL_JOURNALIST_LIMIT + 5
+    ingest_articles(article_records(authors, outlets=1, authors=authors))
+    outlet = Outlet.query.one()
+
+    page = client.get(f'/outlets/{outlet.id}').get_data(as_text=True)
+
+    assert page.count('View Profile') == DETAIL_JOURNALIST_LIMIT
+    assert f'Journalists ({authors})' in page
+    assert '/journalists/?outlet=Outlet+0' in page
+
+
+def test_outlet_detail_without_more_journalists_has_no_view_all_link(client):
+    ingest_articles(article_records(3, outlets=1, authors=3))
+    outlet = Outlet.query.one()
+
+    page = client.get(f'/outlets/{outlet.id}').get_data(as_text=True)
+
+    assert page.count('View Profile') == 3
+    assert '/journalists/?outlet=' not in page
+
+
+@pytest.mark.filterwarnings('error::sqlalchemy.exc.LegacyAPIWarning')
+def test_missing_outlet_is_not_found(client):
+    assert client.get('/outlets/999').status_code == 404
@@ -0,0 +1,180 @@
+"""
+Tests for the retrying page fetcher, against a scripted in-memory session
+and a local HTTP server.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.page_fetcher import PageFetcher
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+        self.url = 'https://example.com/article'
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class ScriptedSession:
+    """Answers successive GETs with the given responses."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def fetcher_for(*responses):
+    return PageFetcher(retries=2, backoff=0, session=ScriptedSession(*responses))
+
+
+def test_retried_200_clears_earlier_error():
+    fetcher = fetcher_for(FakeResponse(503), FakeResponse(200, b'<html>ok</html>'))
+    result = fetcher.fetch('https://example.com/article')
+    assert result.ok
+    assert result.error is None
+    assert result.content == b'<html>ok</html>'
+    assert result.attempts == 2
+
+
+def test_retried_304_clears_earlier_error():
+    fetcher = fetcher_for(FakeResponse(429), FakeResponse(304))
+    result = fetcher.fetch('https://example.com/article', headers={'If-None-Match': '"abc"'})
+    assert result.not_modified
+    assert result.error is None
+    assert result.attempts == 2
+
+
+def test_client_error_is_not_retried():
+    fetcher = fetcher_for(FakeResponse(404))
+    result = fetcher.fetch('https://example.com/article')
+    assert result.error == 'HTTP 404'
+    assert result.attempts == 1
+    assert fetcher.session.calls == 1
+
+
+def test_gives_up_after_retries():
+    fetcher = fetcher_for(FakeResponse(500), FakeResponse(502), FakeResponse(503))
+    result = fetcher.fetch('https://example.com/article')
+    assert not result.ok
+    assert result.error == 'HTTP 503'
+    assert result.attempts == 3
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """
+    Serves HTML fixtures: /article/<n>, /slow, /missing and /error, tracking
+    how many requests are in flight at once.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+        try:
+            if self.path.startswith('/article/'):
+                time.sleep(server.delay)
+                self._send(200, f'<html><body><p>{self.path}</p></body></html>')
+            elif self.path == '/slow':
+                time.sleep(1)
+                self._send(200, '<html><body>late</body></html>')
+            elif self.path == '/missing':
+                self._send(404, '<html><body>Not found</body></html>')
+            else:
+                self._send(500, '<html><body>Internal error</body></html>')
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status, html):
+        body = html.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def page_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = 0
+    server.hits = {}
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_many_downloads_every_distinct_page(page_server):
+    urls = [f'{page_server.url}/article/{n}' for n in range(10)]
+    fetcher = PageFetcher(max_workers=4, retries=0)
+
+    results = {result.url: result for result in fetcher.fetch_many(urls + urls[:3])}
+
+    assert set(results) == set(urls)
+    assert all(result.ok for result in results.values())
+    assert results[urls[7]].content == b'<html><body><p>/article/7</p></body></html>'
+    assert sum(page_server.hits.values()) == 10
+    fetcher.close()
+
+
+def test_fetch_many_respects_the_per_host_limit(page_server):
+    page_server.delay = 0.1
+    urls = [f'{page_server.url}/article/{n}' for n in range(8)]
+    fetcher = PageFetcher(max_workers=8, per_host=2, retries=0)
+
+    assert all(result.ok for result in fetcher.fetch_many(urls))
+    assert page_server.max_in_flight == 2
+    fetcher.close()
+
+
+def test_read_timeout_is_reported_as_an_error(page_server):
+    fetcher = PageFetcher(timeout=(1, 0.2), retries=0)
+
+    started = time.perf_counter()
+    result = fetcher.fetch(f'{page_server.url}/slow')
+
+    assert time.perf_counter() - started < 1
+    assert not result.ok
+    assert 'timed out' in result.error
+    fetcher.close()
+
+
+def test_error_pages_are_not_returned_as_content(page_server):
+    fetcher = PageFetcher(retries=1, backoff=0)
+
+    missing = fetcher.fetch(f'{page_server.url}/missing')
+    failing = fetcher.fetch(f'{page_server.url}/error')
+
+    assert (missing.status, missing.error, missing.content, missing.attempts) == (404, 'HTTP 404', None, 1)
+    assert (failing.status, failing.error, failing.content, failing.attempts) == (500, 'HTTP 500', None, 2)
+    assert page_server.hits == {'/missing': 1, '/error': 2}
+    fetcher.close()
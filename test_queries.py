@@ -0,0 +1,61 @@
+"""
+The SQL predominant-sentiment filter selects the same journalists as the
+Python rule it replaced: more than a third of a journalist's articles carry
+the label.
+"""
+
+import pytest
+
+from app import db
+from models import Article, Journalist
+from utils.queries import filter_predominant_sentiment
+
+# Article labels per journalist; None is an article not analyzed yet
+LABELS = {
+    'No articles': [],
+    'Exactly a third': ['positive', 'negative', 'neutral'],
+    'Just over a third': ['positive', 'positive', 'negative', 'neutral', 'neutral'],
+    'A quarter positive': ['positive', 'negative', 'negative', 'neutral'],
+    'Only positive': ['positive'],
+    'A third analyzed': ['negative', None, None],
+    'Half unanalyzed': ['negative', None],
+    'Unanalyzed only': [None, None],
+}
+
+
+def python_rule(journalist, sentiment):
+    """The filter as the routes applied it before it moved to SQL."""
+    sentiment_articles = [article for article in journalist.articles if article.sentiment_label == sentiment]
+    return bool(sentiment_articles) and len(sentiment_articles) > len(journalist.articles) / 3
+
+
+@pytest.fixture
+def journalists(app):
+    n = 0
+    for name, labels in LABELS.items():
+        journalist = Journalist(name=name)
+        for label in labels:
+            n += 1
+            journalist.articles.append(
+                Article(title=f'Article {n}', url=f'https://news.example.com/articles/{n}', sentiment_label=label)
+            )
+        db.session.add(journalist)
+    db.session.commit()
+
+
+@pytest.mark.parametrize('sentiment', ['positive', 'negative', 'neutral'])
+def test_sql_filter_matches_the_python_rule(journalists, sentiment):
+    expected = {journalist.name for journalist in Journalist.query.all() if python_rule(journalist, sentiment)}
+
+    selected = {journalist.name for journalist in filter_predominant_sentiment(Journalist.query, sentiment)}
+
+    assert selected == expected
+
+
+def test_boundaries(journalists):
+    positive = {journalist.name for journalist in filter_predominant_sentiment(Journalist.query, 'positive')}
+    negative = {journalist.name for journalist in filter_predominant_sentiment(Journalist.query, 'negative')}
+
+    assert positive == {'Just over a third', 'Only positive'}
+    # Unanalyzed articles count towards the total, so a third is still not enough
+    assert negative == {'A quarter positive', 'Half unanalyzed'}
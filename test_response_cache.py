@@ -0,0 +1,64 @@
+"""
+Rendered page cache: repeat requests, conditional requests and
+invalidation when articles change.
+"""
+
+from conftest import article_records, statement_count
+from utils.ingestion import ingest_articles
+from utils.response_cache import SQLiteBackend
+
+
+def test_repeat_request_is_served_from_the_cache(client):
+    ingest_articles(article_records(3))
+    first = client.get('/news/?days=100000')
+
+    second = client.get('/news/?days=100000')
+
+    assert statement_count(first) > 0
+    assert statement_count(second) == 0
+    assert second.data == first.data
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_matching_etag_gets_a_bodyless_304(client):
+    ingest_articles(article_records(3))
+    etag = client.get('/').headers['ETag']
+
+    response = client.get('/', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_ajax_variant_is_cached_separately(client):
+    ingest_articles(article_records(3))
+    page = client.get('/journalists/')
+
+    data = client.get('/journalists/', headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    assert page.content_type.startswith('text/html')
+    assert data.is_json
+
+
+def test_articles_changed_invalidates_cached_pages(client):
+    ingest_articles(article_records(3))
+    before = client.get('/news/?days=100000')
+
+    ingest_articles(article_records(1, start=3))
+    after = client.get('/news/?days=100000', headers={'If-None-Match': before.headers['ETag']})
+
+    assert after.status_code == 200
+    assert statement_count(after) > 0
+    assert b'Article 3' in after.data and b'Article 3' not in before.data
+
+
+def test_sqlite_backend_version_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'responses.sqlite3')
+    writer, reader = SQLiteBackend(path), SQLiteBackend(path)
+    reader.set('key', b'body', {'etag': 'abc'})
+    version = reader.version()
+
+    writer.bump_version()
+
+    # Keys embed the version, so the reader's old entries are never hit again
+    assert reader.version() != version
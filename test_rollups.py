@@ -0,0 +1,97 @@
+"""
+The analytics rollups must stay equal to a fresh aggregate of the article
+table after every kind of write.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+import migrations
+from app import db
+from conftest import article_records
+from models import Article, ArticleDailyStat, TopicDailyStat
+from utils.ingestion import ingest_articles
+from utils.rollups import article_total, rebuild_rollups, sentiment_totals, topic_totals
+from utils.signals import notify_articles_changed
+
+
+def _rollup_rows():
+    article_rows = db.session.execute(select(
+        ArticleDailyStat.day, ArticleDailyStat.outlet_id, ArticleDailyStat.journalist_id,
+        ArticleDailyStat.sentiment_label, ArticleDailyStat.tone,
+        ArticleDailyStat.article_count, ArticleDailyStat.sentiment_total
+    )).all()
+    topic_rows = db.session.execute(select(
+        TopicDailyStat.day, TopicDailyStat.topic_id, TopicDailyStat.outlet_id, TopicDailyStat.journalist_id,
+        TopicDailyStat.sentiment_label, TopicDailyStat.article_count
+    )).all()
+    return sorted(article_rows, key=repr), sorted(topic_rows, key=repr)
+
+
+def _assert_matches_rebuild():
+    incremental = _rollup_rows()
+    rebuild_rollups()
+    assert incremental == _rollup_rows()
+
+
+def test_ingestion_refreshes_rollups(app):
+    ingest_articles(article_records(30))
+
+    assert article_total() == 30
+    assert sentiment_totals() == {'positive': 10, 'neutral': 10, 'negative': 10}
+    assert {name: count for _, name, count in topic_totals()} == {'Bitcoin': 10, 'Ethereum': 10, 'Regulation': 10}
+    _assert_matches_rebuild()
+
+
+def test_changed_articles_refresh_their_days(app):
+    ingest_articles(article_records(10))
+    article = Article.query.filter_by(url='https://news.example.com/articles/4').one()
+    article.sentiment_label = 'positive'
+    article.sentiment_score = 0.9
+    db.session.commit()
+    notify_articles_changed(__name__, [article.id])
+
+    assert sentiment_totals()['positive'] == 5
+    _assert_matches_rebuild()
+
+
+def test_single_article_writer_refreshes_rollups(app, monkeypatch):
+    import utils.nlp_utils
+    from utils.data_collection import process_article
+
+    ingest_articles(article_records(3))
+    monkeypatch.setattr(utils.nlp_utils, 'analyze_article', lambda article: None)
+    process_article({
+        'title': 'Fed holds rates',
+        'url': 'https://news.example.com/fed',
+        'content': 'The Fed held rates steady.',
+        'source': {'name': 'Outlet 0'},
+        'author': 'Author 0',
+        'publishedAt': '2024-03-01T10:00:00Z'
+    }, [], [])
+
+    assert article_total() == 4
+    _assert_matches_rebuild()
+
+
+def test_dedupe_rebuilds_rollups(app):
+    ingest_articles(article_records(5))
+    original = Article.query.filter_by(url='https://news.example.com/articles/1').one()
+    # A copy stored before URLs were normalized, on another day
+    db.session.execute(insert(Article), [{
+        'title': original.title,
+        'url': 'https://News.example.com/articles/1/?utm_source=feed',
+        'published_at': datetime(2023, 6, 1),
+        'journalist_id': original.journalist_id,
+        'outlet_id': original.outlet_id,
+        'sentiment_label': 'neutral'
+    }])
+    db.session.commit()
+    rebuild_rollups()
+    assert article_total() == 6
+
+    migrations.dedupe_article_urls()
+
+    assert article_total() == 5
+    _assert_matches_rebuild()
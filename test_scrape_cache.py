@@ -0,0 +1,141 @@
+"""
+Scrape cache: TTL expiry, LRU eviction, and conditional-GET and content-hash
+reuse when pages are scraped through it.
+"""
+
+import pytest
+
+from utils import sqlite_cache, web_scraper
+from utils.page_fetcher import FetchResult
+from utils.scrape_cache import ScrapeCache
+from utils.sqlite_cache import SQLiteCache
+
+URL = 'https://news.example.com/articles/1'
+HTML = b'<html><body><p>Bitcoin rallied.</p></body></html>'
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class StubFetcher:
+    """Answers every fetch with the given result and records the request headers."""
+
+    def __init__(self, status, content=None, headers=None):
+        self.status = status
+        self.content = content
+        self.headers = headers or {}
+        self.requests = []
+
+    def fetch(self, url, headers=None):
+        self.requests.append(headers or {})
+        return FetchResult(url=url, status=self.status, content=self.content, headers=self.headers)
+
+    def fetch_many(self, urls, headers_for=None):
+        for url in urls:
+            yield self.fetch(url, headers_for(url) if headers_for else None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sqlite_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ScrapeCache(str(tmp_path / 'scrape.sqlite3'), ttl=60, max_bytes=None)
+
+
+@pytest.fixture
+def no_extraction(monkeypatch):
+    def extract_text(content):
+        raise AssertionError('page should not be extracted again')
+    monkeypatch.setattr(web_scraper, 'extract_text', extract_text)
+
+
+def use_fetcher(monkeypatch, fetcher):
+    monkeypatch.setattr(web_scraper, 'get_default_fetcher', lambda: fetcher)
+    return fetcher
+
+
+def test_pages_go_stale_after_the_ttl(cache, clock):
+    cache.store(URL, HTML, 'Bitcoin rallied.', {'ETag': '"v1"'})
+
+    clock.now += 60
+    assert not cache.lookup(URL).stale
+    clock.now += 1
+    page = cache.lookup(URL)
+    assert page.stale
+    assert (page.text, page.html) == ('Bitcoin rallied.', HTML)
+
+    cache.revalidated(URL)
+    assert not cache.lookup(URL).stale
+
+
+def test_least_recently_used_entries_are_evicted_past_the_budget(tmp_path, clock):
+    lru = SQLiteCache(str(tmp_path / 'lru.sqlite3'), max_bytes=250)
+    for key in ('a', 'b', 'c'):
+        clock.now += 1
+        lru.set(key, b'x' * 100)
+    clock.now += 1
+    lru.get('a')
+
+    assert lru.evict() == 1
+    assert (lru.get('a'), lru.get('b'), lru.get('c')) == (b'x' * 100, None, b'x' * 100)
+
+
+def test_fresh_page_is_served_without_a_request(cache, monkeypatch, no_extraction):
+    cache.store(URL, HTML, 'Bitcoin rallied.')
+    fetcher = use_fetcher(monkeypatch, StubFetcher(200, HTML))
+
+    assert web_scraper.get_website_text_content(URL, cache=cache) == 'Bitcoin rallied.'
+    assert fetcher.requests == []
+
+
+def test_stale_page_is_revalidated_with_a_conditional_get(cache, clock, monkeypatch, no_extraction):
+    cache.store(URL, HTML, 'Bitcoin rallied.', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+    clock.now += 61
+    fetcher = use_fetcher(monkeypatch, StubFetcher(304))
+
+    assert web_scraper.get_website_text_content(URL, cache=cache) == 'Bitcoin rallied.'
+    assert fetcher.requests == [{'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}]
+    assert not cache.lookup(URL).stale
+
+
+def test_unchanged_html_reuses_the_extracted_text(cache, clock, monkeypatch, no_extraction):
+    cache.store(URL, HTML, 'Bitcoin rallied.')
+    clock.now += 61
+    use_fetcher(monkeypatch, StubFetcher(200, HTML, {'ETag': '"v2"'}))
+
+    assert web_scraper.get_website_text_content(URL, cache=cache) == 'Bitcoin rallied.'
+    page = cache.lookup(URL)
+    assert (page.stale, page.etag) == (False, '"v2"')
+
+
+def test_changed_html_is_extracted_again(cache, clock, monkeypatch):
+    cache.store(URL, HTML, 'Bitcoin rallied.')
+    clock.now += 61
+    use_fetcher(monkeypatch, StubFetcher(200, b'<html><body><p>Bitcoin fell.</p></body></html>'))
+    monkeypatch.setattr(web_scraper, 'extract_text', lambda content: 'Bitcoin fell.')
+
+    assert web_scraper.get_website_text_content(URL, cache=cache) == 'Bitcoin fell.'
+    assert cache.lookup(URL).text == 'Bitcoin fell.'
+
+
+def test_batch_scraping_revalidates_and_reuses_cached_pages(cache, clock):
+    other = 'https://news.example.com/articles/2'
+    cache.store(URL, HTML, 'Bitcoin rallied.', {'ETag': '"v1"'})
+    clock.now += 61
+    cache.store(other, HTML, 'Bitcoin fell.')
+    fetcher = StubFetcher(304)
+
+    results = dict(web_scraper.iter_website_text_contents([URL, other], fetcher=fetcher, extractor=object(), cache=cache))
+
+    assert results == {URL: 'Bitcoin rallied.', other: 'Bitcoin fell.'}
+    assert fetcher.requests == [{'If-None-Match': '"v1"'}]
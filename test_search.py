@@ -0,0 +1,34 @@
+"""
+Search result pages: the page id cache and its invalidation.
+"""
+
+from conftest import article_records, count_statements
+from utils.ingestion import ingest_articles
+from utils.search import SearchFilters, result_page
+
+
+def _titles(page):
+    return [article.title for article in page.items]
+
+
+def test_repeated_search_reads_cached_ids(app):
+    ingest_articles(article_records(5))
+    filters = SearchFilters(sentiment='positive')
+    first = result_page('articles', filters, page_size=10)
+
+    with count_statements() as stats:
+        second = result_page('articles', filters, page_size=10)
+
+    assert _titles(second) == _titles(first) == ['Article 3', 'Article 0']
+    # One primary-key read plus the topics, no search query
+    assert stats.statements <= 2
+
+
+def test_articles_changed_clears_cached_pages(app):
+    ingest_articles(article_records(5))
+    filters = SearchFilters(sentiment='positive')
+    result_page('articles', filters, page_size=10)
+
+    ingest_articles(article_records(3, start=5))
+
+    assert _titles(result_page('articles', filters, page_size=10)) == ['Article 6', 'Article 3', 'Article 0']
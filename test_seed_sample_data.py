@@ -0,0 +1,34 @@
+"""
+Sample data is seeded from the command line, once, never by a page view.
+"""
+
+from sqlalchemy import func, select
+
+from app import db
+from models import Article, Journalist, Outlet
+
+
+def _articles():
+    return db.session.scalar(select(func.count(Article.id)))
+
+
+def test_home_page_does_not_seed(client):
+    response = client.get('/')
+
+    assert response.status_code == 200
+    assert b'seed-sample-data' in response.data
+    assert _articles() == 0
+
+
+def test_seed_command_seeds_an_empty_database_once(app):
+    runner = app.test_cli_runner()
+
+    first = runner.invoke(args=['seed-sample-data', '--no-analyze'])
+    seeded = (_articles(), db.session.scalar(select(func.count(Journalist.id))),
+              db.session.scalar(select(func.count(Outlet.id))))
+    second = runner.invoke(args=['seed-sample-data', '--no-analyze'])
+
+    assert first.exit_code == 0 and 'Sample data created.' in first.output
+    assert all(seeded)
+    assert second.exit_code == 0 and 'nothing to do' in second.output
+    assert _articles() == seeded[0]
@@ -0,0 +1,38 @@
+"""
+Serializing a query costs a fixed number of statements, however many rows
+it returns.
+"""
+
+import pytest
+
+from conftest import article_records, count_statements
+from models import Article, Journalist, Outlet, Topic
+from utils.ingestion import ingest_articles
+from utils.serializers import serialize
+
+
+def _serialize_statements(model, rows):
+    with count_statements() as stats:
+        serialized = serialize(model.query.order_by(model.id).limit(rows), model)
+    assert len(serialized) == rows
+    return stats.statements
+
+
+@pytest.mark.parametrize('model, outlets, authors', [
+    (Article, 10, 10),
+    (Journalist, 10, 1000),
+    (Outlet, 1000, 10),
+])
+def test_serialize_statement_count_does_not_depend_on_rows(app, model, outlets, authors):
+    ingest_articles(article_records(1000, outlets=outlets, authors=authors))
+
+    assert _serialize_statements(model, 1) == _serialize_statements(model, 1000)
+
+
+def test_serialize_topics_statement_count_does_not_depend_on_rows(app):
+    records = article_records(1000)
+    for number, record in enumerate(records):
+        record['topics'] = [f'Topic {number}']
+    ingest_articles(records)
+
+    assert _serialize_statements(Topic, 1) == _serialize_statements(Topic, 1000)
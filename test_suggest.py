@@ -0,0 +1,60 @@
+"""
+Typeahead index: kind ranking and incremental updates.
+"""
+
+import random
+
+from utils.suggest import MAX_CANDIDATES, SuggestIndex, Suggestion
+
+
+def _labels(suggestions):
+    return [(suggestion.kind, suggestion.label) for suggestion in suggestions]
+
+
+def test_short_prefix_is_not_crowded_out_by_articles():
+    index = SuggestIndex()
+    # Far more article words starting with "m" than one lookup examines
+    for article_id in range(1, MAX_CANDIDATES * 3):
+        index.add(Suggestion('article', article_id, f'Markets move {article_id}'))
+    index.add(Suggestion('journalist', 1, 'Michael Rodriguez'))
+    index.add(Suggestion('outlet', 1, 'Messari'))
+    index.add(Suggestion('topic', 1, 'Mining'))
+
+    assert _labels(index.lookup('m', limit=4)) == [
+        ('journalist', 'Michael Rodriguez'), ('outlet', 'Messari'), ('topic', 'Mining'), ('article', 'Markets move 1')
+    ]
+
+
+def test_leading_matches_rank_before_kind():
+    index = SuggestIndex()
+    index.add(Suggestion('journalist', 1, 'Ann Bitcoin'))
+    index.add(Suggestion('topic', 1, 'Bitcoin'))
+
+    assert _labels(index.lookup('bit')) == [('topic', 'Bitcoin'), ('journalist', 'Ann Bitcoin')]
+
+
+def test_updates_match_a_fresh_build():
+    rng = random.Random(7)
+    words = ['bitcoin', 'ether', 'market', 'mining', 'miner', 'rates', 'bank', 'etf']
+    incremental = SuggestIndex(article_limit=300)
+    current = {}
+    for step in range(3000):
+        kind = rng.choice(['journalist', 'topic', 'article', 'article'])
+        item_id = rng.randrange(400)
+        if rng.random() < 0.2:
+            incremental.remove(kind, item_id)
+            current.pop((kind, item_id), None)
+            continue
+        item = Suggestion(kind, item_id, ' '.join(rng.sample(words, 3)) + f' {step}')
+        incremental.add(item)
+        current.pop((kind, item_id), None)
+        current[(kind, item_id)] = item
+    # Evicted articles are gone from the incremental index
+    live = {key: item for key, item in current.items() if key in incremental._items}
+
+    fresh = SuggestIndex(article_limit=300)
+    fresh._load(live.values())
+
+    assert len(incremental) == len(fresh)
+    for prefix in ['b', 'bit', 'm', 'min', 'e', 'etf r', 'x']:
+        assert incremental.lookup(prefix, limit=20) == fresh.lookup(prefix, limit=20)
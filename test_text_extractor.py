@@ -0,0 +1,62 @@
+"""
+Batch scraping through the process-pool text extractor, and the in-process
+fallback when worker processes cannot be started.
+"""
+
+import pytest
+
+from utils import text_extractor
+from utils.page_fetcher import FetchResult
+from utils.scrape_cache import ScrapeCache
+from utils.text_extractor import TextExtractor
+from utils.web_scraper import iter_website_text_contents
+
+PARAGRAPH = ('Bitcoin rose above its previous record on Tuesday as inflows into spot exchange-traded '
+             'funds continued for a fifth consecutive week, according to market data.')
+
+
+def page(n):
+    return (f'<html><head><title>Article {n}</title></head><body><article><h1>Article {n}</h1>'
+            f'<p>{PARAGRAPH} Report number {n}.</p><p>{PARAGRAPH}</p></article></body></html>').encode()
+
+
+class PageFetcher:
+    """Serves page(n) for .../articles/<n> without touching the network."""
+
+    def fetch_many(self, urls, headers_for=None):
+        for url in urls:
+            yield FetchResult(url=url, status=200, content=page(int(url.rsplit('/', 1)[1])))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScrapeCache(str(tmp_path / 'scrape.sqlite3'))
+
+
+def scrape(extractor, cache):
+    urls = [f'https://news.example.com/articles/{n}' for n in range(3)]
+    return dict(iter_website_text_contents(urls, fetcher=PageFetcher(), extractor=extractor, cache=cache))
+
+
+def test_pages_are_extracted_in_worker_processes(cache):
+    with TextExtractor(max_workers=2) as extractor:
+        results = scrape(extractor, cache)
+        assert extractor._executor is not None
+
+    assert len(results) == 3
+    assert all(PARAGRAPH in text for text in results.values())
+    assert 'Report number 2.' in results['https://news.example.com/articles/2']
+    assert cache.lookup('https://news.example.com/articles/1').text == results['https://news.example.com/articles/1']
+
+
+def test_pages_are_extracted_in_process_when_the_pool_is_unavailable(cache, monkeypatch):
+    def no_processes(*args, **kwargs):
+        raise OSError('process creation is not permitted')
+    monkeypatch.setattr(text_extractor, 'ProcessPoolExecutor', no_processes)
+
+    with TextExtractor(max_workers=2) as extractor:
+        results = scrape(extractor, cache)
+        assert extractor._pool_unavailable
+
+    assert len(results) == 3
+    assert all(PARAGRAPH in text for text in results.values())
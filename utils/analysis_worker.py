@@ -0,0 +1,291 @@
+"""
+Asynchronous LLM analysis worker.
+
+Articles are ingested without waiting for OpenAI; this worker then picks up
+the unanalyzed ones (``sentiment_label IS NULL``) and runs several completions
+concurrently under a requests-per-minute and tokens-per-minute budget. Results
+are written back in batches, each in its own short transaction. A circuit
+breaker stops the run when the API keeps failing, leaving the remaining
+articles unanalyzed for the next run instead of storing a neutral fallback.
+
+Usage:
+    python -m utils.analysis_worker [--concurrency=4] [--limit=500]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import select, update
+
+from app import app, db
+from models import Article, Topic
+from utils.ingestion import link_article_topics, resolve_topics
+from utils.openai_analyzer import (MAX_INPUT_CHARS, get_async_client, get_cached_analysis,
+                                   request_article_analysis_async, store_analysis)
+from utils.signals import notify_articles_changed
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CONCURRENCY = int(os.environ.get("ANALYSIS_CONCURRENCY", 4))
+ANALYSIS_RPM = int(os.environ.get("ANALYSIS_RPM", 60))
+ANALYSIS_TPM = int(os.environ.get("ANALYSIS_TPM", 90000))
+
+# Topic names longer than the Topic.name column are dropped, as in nlp_utils
+TOPIC_NAME_LENGTH = Topic.__table__.c.name.type.length
+
+# Rough token estimate: prompt text (~4 characters per token) plus the JSON answer
+CHARS_PER_TOKEN = 4
+COMPLETION_TOKENS = 300
+
+
+def estimate_tokens(text):
+    return len(text[:MAX_INPUT_CHARS]) // CHARS_PER_TOKEN + COMPLETION_TOKENS
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously up to a per-minute capacity.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self._refill()
+        self.tokens -= amount
+
+
+class RateLimiter:
+    """
+    Combined requests-per-minute and tokens-per-minute limiter for asyncio tasks.
+    """
+
+    def __init__(self, requests_per_minute=ANALYSIS_RPM, tokens_per_minute=ANALYSIS_TPM):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens):
+        # Holding the lock while waiting keeps callers first-come, first-served
+        async with self._lock:
+            while True:
+                delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+    def settle(self, estimated, actual):
+        """Charge (or refund) the difference once the real token usage is known."""
+        if actual is not None:
+            self.tokens.take(actual - estimated)
+
+
+class CircuitBreaker:
+    """
+    Open after too many consecutive failures and stay open for a cool-down period.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def is_open(self):
+        if self.opened_at is None:
+            return False
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            # Half-open: let the next request through as a trial
+            self.opened_at = None
+            self.failures = self.failure_threshold - 1
+            return False
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold and self.opened_at is None:
+            self.opened_at = time.monotonic()
+            logger.error(f"OpenAI circuit breaker opened after {self.failures} consecutive failures")
+
+
+def _pending_article_ids(article_ids=None, limit=None):
+    query = select(Article.id).where(
+        Article.sentiment_label.is_(None),
+        Article.content.isnot(None),
+        Article.content != ''
+    ).order_by(Article.id)
+    if article_ids is not None:
+        query = query.where(Article.id.in_(list(article_ids)))
+    if limit:
+        query = query.limit(limit)
+    return list(db.session.scalars(query))
+
+
+def write_analyses(results):
+    """
+    Store a batch of (article_id, analysis) pairs in one short transaction.
+    """
+    if not results:
+        return
+    db.session.execute(update(Article), [
+        {
+            'id': article_id,
+            'sentiment_score': analysis['score'],
+            'sentiment_label': analysis['label'],
+            'tone': analysis['tone']
+        }
+        for article_id, analysis in results
+    ])
+    topics = {
+        article_id: [topic for topic in analysis['topics'] if len(topic) <= TOPIC_NAME_LENGTH]
+        for article_id, analysis in results
+    }
+    topic_ids, _ = resolve_topics({topic for names in topics.values() for topic in names})
+    link_article_topics(
+        (article_id, topic_ids[topic]) for article_id, names in topics.items() for topic in names
+    )
+    db.session.commit()
+    notify_articles_changed(__name__, [article_id for article_id, _ in results])
+
+
+async def run_analysis_worker(article_ids=None, concurrency=ANALYSIS_CONCURRENCY, limiter=None,
+                              breaker=None, batch_size=20, limit=None):
+    """
+    Analyze unanalyzed articles with concurrent, rate-limited OpenAI calls.
+
+    Must be called inside an application context.
+
+    Args:
+        article_ids (iterable): Restrict the run to these articles (default: all pending)
+        concurrency (int): Number of completions in flight
+        limiter (RateLimiter): Request/token budget (default: ANALYSIS_RPM / ANALYSIS_TPM)
+        breaker (CircuitBreaker): Stops the run when the API keeps failing
+        batch_size (int): Number of results written per transaction
+        limit (int): Maximum number of articles to analyze
+
+    Returns:
+        dict: Counts of analyzed, cached and failed articles and whether the breaker opened
+    """
+    limiter = limiter or RateLimiter()
+    breaker = breaker or CircuitBreaker()
+    stats = {'analyzed': 0, 'cached': 0, 'failed': 0, 'circuit_open': False}
+
+    ids = _pending_article_ids(article_ids, limit)
+    # Release the connection; texts are loaded in small batches as workers need them
+    db.session.commit()
+    if not ids:
+        return stats
+    logger.info(f"Analyzing {len(ids)} articles with {concurrency} concurrent requests")
+
+    # Bounded queue so only a few batches of article text are held in memory
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    results = []
+
+    def flush(force=False):
+        if results and (force or len(results) >= batch_size):
+            write_analyses(results)
+            results.clear()
+
+    async def analyze(article_id, text):
+        cached = get_cached_analysis(text)
+        if cached:
+            stats['cached'] += 1
+            return cached
+        estimated = estimate_tokens(text)
+        await limiter.acquire(estimated)
+        try:
+            analysis, used_tokens = await request_article_analysis_async(text, client)
+        except Exception as e:
+            breaker.record_failure()
+            stats['failed'] += 1
+            logger.error(f"Error analyzing article {article_id} with OpenAI: {e}")
+            return None
+        breaker.record_success()
+        limiter.settle(estimated, used_tokens)
+        store_analysis(text, analysis)
+        stats['analyzed'] += 1
+        return analysis
+
+    async def producer():
+        for start in range(0, len(ids), batch_size):
+            if stats['circuit_open']:
+                break
+            rows = db.session.execute(
+                select(Article.id, Article.content).where(Article.id.in_(ids[start:start + batch_size]))
+            ).all()
+            db.session.commit()
+            for row in rows:
+                await queue.put(row)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if breaker.is_open:
+                # Keep draining the queue so the producer can stop, but spend nothing
+                stats['circuit_open'] = True
+                continue
+            article_id, text = item
+            analysis = await analyze(article_id, text)
+            if analysis:
+                results.append((article_id, analysis))
+                flush()
+
+    client, owns_client = get_async_client()
+    try:
+        await asyncio.gather(producer(), *(worker() for _ in range(concurrency)))
+    finally:
+        if owns_client:
+            await client.close()
+    flush(force=True)
+
+    if stats['circuit_open']:
+        logger.error("Stopped analysis early because the OpenAI API keeps failing; "
+                     "remaining articles are left for the next run")
+    logger.info(f"Analysis finished: {stats}")
+    return stats
+
+
+def analyze_pending_articles(article_ids=None, **kwargs):
+    """
+    Synchronous entry point: run the analysis worker to completion.
+    """
+    with app.app_context():
+        return asyncio.run(run_analysis_worker(article_ids, **kwargs))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Analyze pending articles with OpenAI')
+    parser.add_argument('--concurrency', type=int, default=ANALYSIS_CONCURRENCY, help='Concurrent completions')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum number of articles to analyze')
+    parser.add_argument('--batch-size', type=int, default=20, help='Results written per transaction')
+    args = parser.parse_args()
+    print(analyze_pending_articles(concurrency=args.concurrency, limit=args.limit, batch_size=args.batch_size))
@@ -5,6 +5,8 @@ import logging
 from datetime import datetime, timedelta
 from app import db
 from models import Journalist, Outlet, Article, Topic
+from utils.signals import notify_articles_changed
+from utils.urls import normalize_url
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
@@ -594,10 +596,11 @@ def populate_crypto_articles():
     ]
     
     articles = []
+    new_article_ids = []
     
     for article_data in crypto_articles:
         # Check if article already exists
-        existing_article = Article.query.filter_by(url=article_data["url"]).first()
+        existing_article = Article.query.filter_by(url=normalize_url(article_data["url"])).first()
         if existing_article:
             articles.append(existing_article)
             continue
@@ -605,7 +608,7 @@ def populate_crypto_articles():
         # Create new article
         article = Article(
             title=article_data["title"],
-            url=article_data["url"],
+            url=normalize_url(article_data["url"]),
             content=article_data["content"],
             published_at=article_data["published_at"],
             journalist_id=article_data["journalist_id"],
@@ -625,8 +628,10 @@ def populate_crypto_articles():
                 article.topics.append(topic)
         
         articles.append(article)
+        new_article_ids.append(article.id)
     
     db.session.commit()
+    notify_articles_changed(__name__, new_article_ids)
     logger.info(f"Created {len(articles)} crypto articles")
     return articles
 
@@ -4,14 +4,23 @@ import random
 import datetime
 import logging
 from urllib.parse import urlparse
+import click
 import requests
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, text
 from app import db
 from models import Journalist, Outlet, Article, Topic
+from utils.ingestion import ingest_articles, resolve_by_name
+from utils.signals import notify_articles_changed
+from utils.urls import normalize_url
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Arbitrary key for the Postgres advisory lock that serializes seeders
+SEED_LOCK_KEY = 0x73656564
+
 # Sample profile images
 JOURNALIST_IMAGES = [
     "/static/img/default-profile.svg",
@@ -175,7 +184,10 @@ def generate_sample_articles(number=10):
 
 def create_sample_outlets():
     """
-    Create sample media outlets for demonstration.
+    Create sample media outlets for demonstration, in one bulk insert.
+    
+    Returns:
+        dict: Outlet name -> id, in sample order
     """
     sample_outlets = [
         {
@@ -236,33 +248,23 @@ def create_sample_outlets():
         }
     ]
     
-    outlets = []
-    
-    for outlet_data in sample_outlets:
-        # Check if outlet already exists
-        existing_outlet = Outlet.query.filter_by(name=outlet_data["name"]).first()
-        if existing_outlet:
-            outlets.append(existing_outlet)
-            continue
-        
-        # Create new outlet
-        outlet = Outlet(
-            name=outlet_data["name"],
-            website=outlet_data["website"],
-            country=outlet_data["country"],
-            description=outlet_data["description"],
-            image_url=outlet_data["image_url"]
-        )
-        
-        db.session.add(outlet)
-        outlets.append(outlet)
-    
-    db.session.commit()
-    return outlets
+    # Outlets that already exist by name are kept as they are
+    now = datetime.datetime.utcnow()
+    outlet_ids, _ = resolve_by_name(Outlet, {
+        outlet_data["name"]: {**outlet_data, "created_at": now, "updated_at": now}
+        for outlet_data in sample_outlets
+    })
+    return {outlet_data["name"]: outlet_ids[outlet_data["name"]] for outlet_data in sample_outlets}
 
-def create_sample_journalists(outlets):
+def create_sample_journalists(outlet_ids):
     """
-    Create sample journalists for demonstration.
+    Create sample journalists for demonstration, in one bulk insert.
+    
+    Args:
+        outlet_ids (dict): Outlet name -> id from create_sample_outlets
+    
+    Returns:
+        dict: Journalist name -> (journalist id, outlet name)
     """
     sample_journalists = [
         {
@@ -309,35 +311,30 @@ def create_sample_journalists(outlets):
         }
     ]
     
-    journalists = []
-    
+    # Assign each journalist to an outlet, round-robin
+    outlet_names = list(outlet_ids)
+    now = datetime.datetime.utcnow()
+    rows = {}
     for i, journalist_data in enumerate(sample_journalists):
-        # Check if journalist already exists
-        existing_journalist = Journalist.query.filter_by(name=journalist_data["name"]).first()
-        if existing_journalist:
-            journalists.append(existing_journalist)
-            continue
-        
-        # Create new journalist
-        journalist = Journalist(
-            name=journalist_data["name"],
-            email=journalist_data["email"],
-            twitter_handle=journalist_data["twitter_handle"],
-            bio=journalist_data["bio"],
-            location=journalist_data["location"],
-            outlet_id=outlets[i % len(outlets)].id,  # Assign to an outlet
-            profile_image_url=JOURNALIST_IMAGES[i % len(JOURNALIST_IMAGES)]
-        )
-        
-        db.session.add(journalist)
-        journalists.append(journalist)
-    
-    db.session.commit()
-    return journalists
+        rows[journalist_data["name"]] = {
+            **journalist_data,
+            "outlet_id": outlet_ids[outlet_names[i % len(outlet_names)]],
+            "profile_image_url": JOURNALIST_IMAGES[i % len(JOURNALIST_IMAGES)],
+            "created_at": now,
+            "updated_at": now
+        }
+    journalist_ids, _ = resolve_by_name(Journalist, rows)
+    return {
+        name: (journalist_ids[name], outlet_names[i % len(outlet_names)])
+        for i, name in enumerate(rows)
+    }
 
 def create_sample_topics():
     """
-    Create sample topics for demonstration.
+    Create sample topics for demonstration, in one bulk insert.
+    
+    Returns:
+        dict: Topic name -> id
     """
     sample_topics = [
         {"name": "Politics", "description": "Political news, policy discussions, and government affairs"},
@@ -352,26 +349,12 @@ def create_sample_topics():
         {"name": "International", "description": "Global affairs, diplomacy, and world events"}
     ]
     
-    topics = []
-    
-    for topic_data in sample_topics:
-        # Check if topic already exists
-        existing_topic = Topic.query.filter_by(name=topic_data["name"]).first()
-        if existing_topic:
-            topics.append(existing_topic)
-            continue
-        
-        # Create new topic
-        topic = Topic(
-            name=topic_data["name"],
-            description=topic_data["description"]
-        )
-        
-        db.session.add(topic)
-        topics.append(topic)
-    
-    db.session.commit()
-    return topics
+    now = datetime.datetime.utcnow()
+    topic_ids, _ = resolve_by_name(Topic, {
+        topic_data["name"]: {**topic_data, "created_at": now, "updated_at": now}
+        for topic_data in sample_topics
+    })
+    return topic_ids
 
 def process_article(article_data, journalists, topics):
     """
@@ -379,7 +362,7 @@ def process_article(article_data, journalists, topics):
     """
     # Extract fields from the article data
     title = article_data.get("title", "Untitled")
-    url = article_data.get("url", "")
+    url = normalize_url(article_data.get("url", ""))
     content = article_data.get("content", "")
     source_name = article_data.get("source", {}).get("name", "")
     
@@ -441,6 +424,7 @@ def process_article(article_data, journalists, topics):
     
     db.session.add(article)
     db.session.commit()
+    notify_articles_changed(__name__, [article.id])
     
     # Analyze article sentiment and update
     from utils.nlp_utils import analyze_article
@@ -466,82 +450,94 @@ def fetch_and_process_articles(api_key=None, number=10):
     
     return processed_articles
 
-def populate_sample_data():
+def _seed_lock():
     """
-    Populate the database with sample data for demonstration.
-    """
-    logger.info("Populating database with sample data")
+    Serialize seeders until the end of the current transaction.
     
-    # Create sample outlets
-    outlets = create_sample_outlets()
-    logger.info(f"Created {len(outlets)} sample outlets")
+    Taken before checking whether the database is empty, so concurrent
+    seeders (several workers or deploy hooks starting at once) run one after
+    the other and only the first one finds the database empty.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        db.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': SEED_LOCK_KEY})
+    elif dialect == 'sqlite':
+        # Take the write lock up front rather than at the first INSERT
+        db.session.execute(text("BEGIN IMMEDIATE"))
+
+def sample_article_records(journalists, topic_names, number=20):
+    """
+    Ingestion records for the generated sample articles.
     
-    # Create sample journalists
-    journalists = create_sample_journalists(outlets)
-    logger.info(f"Created {len(journalists)} sample journalists")
+    Args:
+        journalists (dict): Journalist name -> (id, outlet name) from create_sample_journalists
+        topic_names (list): Topics to tag the articles with (1-3 each)
+        number (int): Number of articles to generate
+    """
+    records = []
+    for article_data in generate_sample_articles(number):
+        # Attribute each article to a random journalist at their own outlet
+        author = random.choice(list(journalists))
+        records.append({
+            "title": article_data["title"],
+            "url": normalize_url(article_data["url"]),
+            "content": article_data["content"],
+            "published_at": datetime.datetime.fromisoformat(article_data["publishedAt"]),
+            "source_name": journalists[author][1],
+            "author": author,
+            "topics": random.sample(topic_names, random.randint(1, min(3, len(topic_names))))
+        })
+    return records
+
+def populate_sample_data(analyze=True):
+    """
+    Populate an empty database with sample data for demonstration.
     
-    # Create sample topics
-    topics = create_sample_topics()
-    logger.info(f"Created {len(topics)} sample topics")
+    Outlets, journalists, topics and articles are bulk-inserted in a single
+    transaction under a lock, so concurrent seeders cannot seed twice. The
+    articles are then analyzed in batches with ``analyze_all_articles``.
+    This is write-heavy: run it from the command line
+    (``flask --app main seed-sample-data``), not from a request.
     
-    # Check if articles already exist
-    article_count = Article.query.count()
-    if article_count > 0:
-        logger.info(f"Found {article_count} existing articles, skipping article creation")
-        return True
+    Args:
+        analyze (bool): Whether to run sentiment/topic analysis on the new articles
     
-    # Fetch and process articles
-    api_key = os.environ.get("NEWS_API_KEY")
-    logger.info(f"Processing articles with API key: {'Using sample data' if not api_key else 'Using API key'}")
+    Returns:
+        bool: True if sample data was created, False if the database already had articles
+    """
+    _seed_lock()
+    article_count = db.session.scalar(select(func.count(Article.id)))
+    if article_count:
+        db.session.rollback()
+        logger.info(f"Found {article_count} existing articles, skipping sample data")
+        return False
     
+    logger.info("Populating database with sample data")
     try:
-        # Generate sample articles directly
-        sample_articles_data = generate_sample_articles(20)
-        processed_articles = []
-        
-        for article_data in sample_articles_data:
-            # Directly assign a random journalist and outlet
-            try:
-                random_journalist = random.choice(journalists) if journalists else None
-                random_outlet = random_journalist.outlet if random_journalist and random_journalist.outlet else random.choice(outlets) if outlets else None
-                
-                if not random_outlet and outlets:
-                    random_outlet = random.choice(outlets)
-                
-                # Create article
-                article = Article(
-                    title=article_data.get("title", "Untitled"),
-                    url=article_data.get("url", "https://example.com"),
-                    content=article_data.get("content", ""),
-                    published_at=datetime.datetime.fromisoformat(article_data.get("publishedAt", "").replace("Z", "+00:00")),
-                    journalist_id=random_journalist.id if random_journalist else None,
-                    outlet_id=random_outlet.id if random_outlet else None
-                )
-                
-                # Add random topics (1-3)
-                num_topics = random.randint(1, min(3, len(topics)))
-                article.topics = random.sample(topics, num_topics)
-                
-                db.session.add(article)
-                processed_articles.append(article)
-                
-            except Exception as e:
-                logger.error(f"Error creating article: {e}")
-                continue
-        
+        outlet_ids = create_sample_outlets()
+        journalists = create_sample_journalists(outlet_ids)
+        topic_ids = create_sample_topics()
+        result = ingest_articles(sample_article_records(journalists, list(topic_ids)), commit=False)
         db.session.commit()
-        logger.info(f"Created {len(processed_articles)} sample articles")
-        
-        # Analyze the articles
-        for article in processed_articles:
-            try:
-                from utils.nlp_utils import analyze_article
-                analyze_article(article)
-            except Exception as e:
-                logger.error(f"Error analyzing article {article.id}: {e}")
-        
-        return True
-    except Exception as e:
-        logger.error(f"Error populating sample articles: {e}")
+    except Exception:
         db.session.rollback()
-        return False
+        raise
+    notify_articles_changed(__name__, result.article_ids)
+    logger.info(f"Created {len(outlet_ids)} outlets, {len(journalists)} journalists, "
+                f"{len(topic_ids)} topics and {result.articles_added} sample articles")
+    
+    if analyze:
+        # Parsed in batches through nlp.pipe, one commit per chunk
+        from utils.nlp_utils import analyze_all_articles
+        analyze_all_articles()
+    return True
+
+@click.command('seed-sample-data')
+@click.option('--no-analyze', is_flag=True, help='Skip sentiment and topic analysis of the sample articles.')
+@with_appcontext
+def seed_sample_data_command(no_analyze):
+    """Populate an empty database with sample outlets, journalists and articles."""
+    if populate_sample_data(analyze=not no_analyze):
+        click.echo("Sample data created.")
+    else:
+        click.echo("The database already has articles; nothing to do.")
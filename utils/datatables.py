@@ -0,0 +1,125 @@
+"""
+Server-side processing for DataTables.
+
+Tables with a ``data-source`` attribute are drawn by DataTables in server-side
+mode: every page change, sort or search sends the ``draw``/``start``/
+``length``/``order``/``search`` parameters to the table's endpoint, which
+answers with only the visible rows plus the total and filtered counts.
+
+Only columns declared sortable (backed by an index) can be ordered by, and the
+primary key is always appended as a tie-breaker so pages are stable. Cells are
+rendered with the macros in ``templates/partials/table_cells.html`` so
+server-side rows look the same as server-rendered ones.
+"""
+
+from dataclasses import dataclass
+
+from flask import get_template_attribute, jsonify, request
+from sqlalchemy import or_
+
+from utils.pagination import MAX_PAGE_SIZE
+
+DEFAULT_TABLE_LENGTH = 10
+CELL_TEMPLATE = 'partials/table_cells.html'
+
+
+@dataclass
+class TableColumn:
+    """
+    One DataTables column.
+
+    Attributes:
+        name: Column key sent by the client as ``columns[i][data]``
+        macro: Cell macro in CELL_TEMPLATE, called with the row object
+        sort: SQL column the table may be ordered by (None: not orderable)
+        search: SQL column matched by the search box (None: not searched)
+    """
+    name: str
+    macro: str
+    sort: object = None
+    search: object = None
+
+
+def _table_order(columns):
+    by_name = {column.name: column for column in columns}
+    order = []
+    index = 0
+    while f'order[{index}][column]' in request.args:
+        position = request.args.get(f'order[{index}][column]', type=int)
+        name = request.args.get(f'columns[{position}][data]')
+        column = by_name.get(name)
+        if column is not None and column.sort is not None:
+            descending = request.args.get(f'order[{index}][dir]') == 'desc'
+            order.append(column.sort.desc() if descending else column.sort.asc())
+        index += 1
+    return order
+
+
+def table_args(columns):
+    """
+    Parse the DataTables server-side request parameters.
+
+    Unknown or non-sortable order columns are ignored and the page length is
+    clamped to MAX_PAGE_SIZE (``length=-1``, "All", is not honoured).
+
+    Returns:
+        dict: draw, start, length, search (str) and order (list of SQL clauses)
+    """
+    length = request.args.get('length', DEFAULT_TABLE_LENGTH, type=int)
+    if length is None or length < 1:
+        length = MAX_PAGE_SIZE
+    return {
+        'draw': request.args.get('draw', 0, type=int) or 0,
+        'start': max(0, request.args.get('start', 0, type=int) or 0),
+        'length': min(length, MAX_PAGE_SIZE),
+        'search': request.args.get('search[value]', '').strip(),
+        'order': _table_order(columns)
+    }
+
+
+def table_response(query, columns, id_column, default_order=(), search=None, prepare=None):
+    """
+    Answer a DataTables server-side request for an ORM query.
+
+    Args:
+        query: ORM query for all rows of the table (already scoped/filtered)
+        columns (list): TableColumn definitions, in any order
+        id_column: Unique tie-breaker column (usually the primary key)
+        default_order (tuple): ORDER BY clauses used when the client sends none
+        search (callable): ``search(query, value)`` applying the search box,
+            instead of ILIKE over the columns' ``search`` attributes
+        prepare (callable): Called with the page's rows before cells are rendered
+
+    Returns:
+        Response: JSON with draw, recordsTotal, recordsFiltered and data
+    """
+    args = table_args(columns)
+
+    records_total = query.order_by(None).count()
+    records_filtered = records_total
+    searched = [column.search for column in columns if column.search is not None]
+    if args['search'] and search is not None:
+        query = search(query, args['search'])
+        records_filtered = query.order_by(None).count()
+    elif args['search'] and searched:
+        term = f"%{args['search']}%"
+        query = query.filter(or_(*(column.ilike(term) for column in searched)))
+        records_filtered = query.order_by(None).count()
+
+    order = args['order'] or list(default_order)
+    rows = (
+        query.order_by(*order, id_column)
+        .offset(args['start'])
+        .limit(args['length'])
+        .all()
+    )
+    if prepare is not None:
+        prepare(rows)
+
+    macros = {column.name: get_template_attribute(CELL_TEMPLATE, column.macro) for column in columns}
+    return jsonify({
+        'draw': args['draw'],
+        'recordsTotal': records_total,
+        'recordsFiltered': records_filtered,
+        'data': [{name: str(macro(row)).strip() for name, macro in macros.items()} for row in rows]
+    })
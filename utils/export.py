@@ -0,0 +1,262 @@
+"""
+Streaming exports.
+
+Export endpoints stream their rows instead of building one big list for
+``jsonify``: rows are read with ``yield_per`` (a server-side cursor on
+Postgres), turned into flat records without lazy loads, and encoded chunk by
+chunk, so memory stays flat however many rows are exported.
+
+Formats (``format=`` parameter):
+
+- ``json`` (default): a JSON array, or an object of arrays for multi-section
+  exports such as search results;
+- ``ndjson``: one JSON object per line (with a ``type`` key in multi-section
+  exports);
+- ``csv``: one header row, list values joined with ``"; "``.
+
+The response is gzip-compressed on the fly when the client accepts it.
+"""
+
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from flask import Response, abort, request, stream_with_context
+from sqlalchemy.orm import joinedload, selectinload, undefer
+
+from models import Article, Journalist, Outlet
+
+EXPORT_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8'
+}
+EXPORT_BATCH_SIZE = 1000
+# Encoded output is sent in chunks of about this many bytes
+CHUNK_SIZE = 64 * 1024
+
+JOURNALIST_FIELDS = ('id', 'name', 'email', 'twitter_handle', 'profile_image_url', 'bio', 'location',
+                     'region', 'verified', 'beat', 'last_contacted', 'outlet_id', 'outlet', 'topics',
+                     'article_count')
+OUTLET_FIELDS = ('id', 'name', 'website', 'country', 'description', 'image_url', 'journalist_count')
+ARTICLE_FIELDS = ('id', 'title', 'url', 'published_at', 'sentiment_score', 'sentiment_label', 'tone',
+                  'journalist_id', 'journalist', 'outlet_id', 'outlet', 'topics')
+
+
+@dataclass
+class ExportSection:
+    """
+    A named group of records with a fixed field order.
+    """
+    name: str
+    fields: tuple
+    records: object
+
+
+def journalist_records(query):
+    """
+    Flat export records for a Journalist query, read in batches.
+    """
+    rows = (
+        query.options(joinedload(Journalist.outlet), selectinload(Journalist.topics),
+                      undefer(Journalist.article_count))
+        .order_by(Journalist.id)
+        .yield_per(EXPORT_BATCH_SIZE)
+    )
+    for journalist in rows:
+        yield {
+            'id': journalist.id,
+            'name': journalist.name,
+            'email': journalist.email,
+            'twitter_handle': journalist.twitter_handle,
+            'profile_image_url': journalist.profile_image_url,
+            'bio': journalist.bio,
+            'location': journalist.location,
+            'region': journalist.region,
+            'verified': journalist.verified,
+            'beat': journalist.beat,
+            'last_contacted': journalist.last_contacted,
+            'outlet_id': journalist.outlet_id,
+            'outlet': journalist.outlet.name if journalist.outlet else None,
+            'topics': [topic.name for topic in journalist.topics],
+            'article_count': journalist.article_count
+        }
+
+
+def outlet_records(query):
+    """
+    Flat export records for an Outlet query, read in batches.
+    """
+    rows = query.options(undefer(Outlet.journalist_count)).order_by(Outlet.id).yield_per(EXPORT_BATCH_SIZE)
+    for outlet in rows:
+        yield {
+            'id': outlet.id,
+            'name': outlet.name,
+            'website': outlet.website,
+            'country': outlet.country,
+            'description': outlet.description,
+            'image_url': outlet.image_url,
+            'journalist_count': outlet.journalist_count
+        }
+
+
+def article_records(query):
+    """
+    Flat export records for an Article query, read in batches.
+    """
+    rows = (
+        query.options(joinedload(Article.journalist), joinedload(Article.outlet), selectinload(Article.topics))
+        .order_by(Article.id)
+        .yield_per(EXPORT_BATCH_SIZE)
+    )
+    for article in rows:
+        yield {
+            'id': article.id,
+            'title': article.title,
+            'url': article.url,
+            'published_at': article.published_at,
+            'sentiment_score': article.sentiment_score,
+            'sentiment_label': article.sentiment_label,
+            'tone': article.tone,
+            'journalist_id': article.journalist_id,
+            'journalist': article.journalist.name if article.journalist else None,
+            'outlet_id': article.outlet_id,
+            'outlet': article.outlet.name if article.outlet else None,
+            'topics': [topic.name for topic in article.topics]
+        }
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(record):
+    return json.dumps(record, default=_json_default, separators=(',', ':'))
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return '; '.join(str(item) for item in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_json(sections, single):
+    if single:
+        yield '['
+    else:
+        yield '{'
+    for position, section in enumerate(sections):
+        if not single:
+            yield ('' if position == 0 else ',') + json.dumps(section.name) + ':['
+        for count, record in enumerate(section.records):
+            yield ('' if count == 0 else ',') + _dumps(record)
+        if not single:
+            yield ']'
+    yield ']' if single else '}'
+
+
+def _encode_ndjson(sections, single):
+    for section in sections:
+        for record in section.records:
+            if not single:
+                record = {'type': section.name, **record}
+            yield _dumps(record) + '\n'
+
+
+def _encode_csv(sections, single):
+    fields = []
+    for section in sections:
+        fields.extend(field for field in section.fields if field not in fields)
+    if not single:
+        fields.insert(0, 'type')
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    writer.writerow(fields)
+    yield flush()
+    for section in sections:
+        for record in section.records:
+            if not single:
+                record = {'type': section.name, **record}
+            writer.writerow([_csv_value(record.get(field)) for field in fields])
+            yield flush()
+
+
+ENCODERS = {'json': _encode_json, 'ndjson': _encode_ndjson, 'csv': _encode_csv}
+
+
+def _chunked(pieces):
+    # Join the many small encoded pieces into fewer, larger writes
+    chunk = []
+    size = 0
+    for piece in pieces:
+        chunk.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield ''.join(chunk).encode('utf-8')
+            chunk = []
+            size = 0
+    if chunk:
+        yield ''.join(chunk).encode('utf-8')
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_format():
+    """
+    The requested export format; aborts with 400 if it is not supported.
+    """
+    fmt = request.args.get('format', 'json').lower()
+    if fmt not in EXPORT_FORMATS:
+        abort(400, description=f"Unsupported export format '{fmt}', use one of: {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def export_response(sections, filename, fmt=None):
+    """
+    Stream export sections in the requested format.
+
+    Args:
+        sections (list): ExportSection objects; a single section is exported
+            as a plain array/rows, several as named groups
+        filename (str): Download file name without extension
+        fmt (str): Format name (default: the ``format`` request argument)
+
+    Returns:
+        Response: Streaming response, gzip-encoded if the client accepts it
+    """
+    fmt = fmt or export_format()
+    single = len(sections) == 1
+    chunks = _chunked(ENCODERS[fmt](sections, single))
+
+    headers = {'Vary': 'Accept-Encoding'}
+    if fmt != 'json':
+        headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    if request.accept_encodings['gzip'] > 0:
+        chunks = _gzipped(chunks)
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(stream_with_context(chunks), content_type=EXPORT_FORMATS[fmt], headers=headers)
@@ -0,0 +1,336 @@
+"""
+Full-text search over articles and journalists.
+
+The search box accepts words (all must match), ``"quoted phrases"`` and
+prefixes (``journ*``). The query is matched against a full-text index whose
+implementation depends on the database:
+
+- Postgres: a stored, generated ``search_vector`` tsvector column with a GIN
+  index. Postgres recomputes the column on every insert and update.
+- SQLite: an external-content FTS5 table (``<table>_fts``) kept in sync by
+  insert/update/delete triggers.
+- Anything else, or an index that has not been installed yet: ``ILIKE``
+  matching, so search keeps working (slowly) until the index is added.
+
+New databases get the index when ``db.create_all()`` creates the tables.
+Existing databases add it with ``python migrations.py``; restart the app
+afterwards so it stops using the ``ILIKE`` fallback.
+
+Matches carry a relevance ``rank`` (higher is better on every backend), and
+``snippets`` returns escaped, highlighted excerpts for a page of results.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+
+from markupsafe import Markup, escape
+from sqlalchemy import and_, column, event, false, func, literal, literal_column, or_, select, table, text
+
+from app import db
+from models import Article, Journalist
+
+logger = logging.getLogger(__name__)
+
+TEXT_SEARCH_CONFIG = 'english'
+SNIPPET_WORDS = 24
+
+# Highlight markers placed by the database, swapped for <mark> after escaping
+_START, _STOP = '\x02', '\x03'
+_QUOTED_OR_BARE = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+_WORD = re.compile(r'\w+')
+
+
+@dataclass(frozen=True)
+class SearchTerm:
+    """A word or phrase of a search query; ``prefix`` applies to its last word."""
+    words: tuple
+    prefix: bool = False
+
+
+@dataclass(frozen=True)
+class FullTextIndex:
+    """
+    The searchable columns of one model.
+
+    Attributes:
+        model: Indexed model
+        weights: Column name -> Postgres weight (A is the most relevant)
+        snippet_column: Column excerpts are taken from
+    """
+    model: type
+    weights: dict
+    snippet_column: str
+
+    @property
+    def table_name(self):
+        return self.model.__tablename__
+
+    @property
+    def fts_name(self):
+        return f'{self.table_name}_fts'
+
+
+INDEXES = {
+    Article: FullTextIndex(Article, {'title': 'A', 'content': 'B'}, 'content'),
+    Journalist: FullTextIndex(
+        Journalist,
+        {'name': 'A', 'beat': 'B', 'location': 'B', 'bio': 'C', 'email': 'D', 'twitter_handle': 'D'},
+        'bio'
+    )
+}
+
+
+def parse_query(query_text):
+    """
+    Split search box input into terms.
+
+    Returns:
+        list: SearchTerm objects (empty if the input has no words)
+    """
+    terms = []
+    for match in _QUOTED_OR_BARE.finditer(query_text or ''):
+        phrase, quoted_prefix, bare = match.groups()
+        if phrase is not None:
+            words, prefix = _WORD.findall(phrase), bool(quoted_prefix)
+        else:
+            words, prefix = _WORD.findall(bare), bare.endswith('*')
+        if words:
+            terms.append(SearchTerm(tuple(word.lower() for word in words), prefix))
+    return terms
+
+
+def highlight(raw):
+    """
+    Escape a snippet from the database and turn its markers into <mark> tags.
+    """
+    if not raw:
+        return Markup('')
+    escaped = str(escape(raw)).replace(_START, '<mark>').replace(_STOP, '</mark>')
+    return Markup(escaped)
+
+
+class PostgresBackend:
+    name = 'postgresql'
+
+    def _vector(self, index):
+        return literal_column(f'{index.table_name}.search_vector')
+
+    def _tsquery(self, terms):
+        parts = []
+        for term in terms:
+            words = list(term.words)
+            if term.prefix:
+                words[-1] += ':*'
+            parts.append('(' + ' <-> '.join(words) + ')')
+        return func.to_tsquery(TEXT_SEARCH_CONFIG, ' & '.join(parts))
+
+    def install_sql(self, index, concurrently=False):
+        document = ' || '.join(
+            f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({name}, '')), '{weight}')"
+            for name, weight in index.weights.items()
+        )
+        build = "CONCURRENTLY " if concurrently else ""
+        return [
+            f"ALTER TABLE {index.table_name} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({document}) STORED",
+            f"CREATE INDEX {build}IF NOT EXISTS ix_{index.table_name}_search_vector "
+            f"ON {index.table_name} USING GIN (search_vector)"
+        ]
+
+    def populate_sql(self, index):
+        # The generated column is computed for existing rows when it is added
+        return []
+
+    def is_installed(self, conn, index):
+        return conn.execute(text(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = :table AND column_name = 'search_vector'"
+        ), {'table': index.table_name}).first() is not None
+
+    def matches(self, index, terms):
+        tsquery = self._tsquery(terms)
+        vector = self._vector(index)
+        return (
+            select(index.model.id.label('id'), func.ts_rank_cd(vector, tsquery).label('rank'))
+            .where(vector.op('@@')(tsquery))
+        )
+
+    def snippets(self, index, ids, terms):
+        options = f'StartSel={_START}, StopSel={_STOP}, MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}'
+        source = func.coalesce(getattr(index.model, index.snippet_column), '')
+        return select(
+            index.model.id,
+            func.ts_headline(TEXT_SEARCH_CONFIG, source, self._tsquery(terms), options)
+        ).where(index.model.id.in_(ids))
+
+
+class SqliteBackend:
+    name = 'sqlite'
+
+    def _table(self, index):
+        return table(index.fts_name, column('rowid'), column('rank'))
+
+    def _match(self, index, terms):
+        query = ' AND '.join(
+            '"' + ' '.join(term.words) + '"' + (' *' if term.prefix else '') for term in terms
+        )
+        return literal_column(index.fts_name).op('MATCH')(query)
+
+    def install_sql(self, index, concurrently=False):
+        columns = list(index.weights)
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{name}' for name in columns)
+        old_values = ', '.join(f'old.{name}' for name in columns)
+        fts, source = index.fts_name, index.table_name
+        delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+        insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{source}', "
+            f"content_rowid='id', tokenize='porter unicode61', prefix='2 3')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN {insert_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN {delete_old} END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {source} "
+            f"BEGIN {delete_old} {insert_new} END"
+        ]
+
+    def populate_sql(self, index):
+        # Index the rows that existed before the FTS table was created
+        return [f"INSERT INTO {index.fts_name}({index.fts_name}) VALUES ('rebuild')"]
+
+    def is_installed(self, conn, index):
+        return conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        ), {'name': index.fts_name}).first() is not None
+
+    def matches(self, index, terms):
+        fts = self._table(index)
+        # bm25 rank: lower is better, so negate it
+        return (
+            select(fts.c.rowid.label('id'), (-fts.c.rank).label('rank'))
+            .where(self._match(index, terms))
+        )
+
+    def snippets(self, index, ids, terms):
+        fts = self._table(index)
+        return select(
+            fts.c.rowid,
+            func.snippet(literal_column(index.fts_name), -1, _START, _STOP, '…', SNIPPET_WORDS)
+        ).where(self._match(index, terms), fts.c.rowid.in_(ids))
+
+
+class LikeBackend:
+    """
+    Fallback without an index: every term must appear in one of the columns.
+    """
+    name = 'like'
+
+    def install_sql(self, index, concurrently=False):
+        return []
+
+    def populate_sql(self, index):
+        return []
+
+    def is_installed(self, conn, index):
+        return True
+
+    def matches(self, index, terms):
+        columns = [getattr(index.model, name) for name in index.weights]
+        conditions = [
+            or_(*(col.ilike(f"%{' '.join(term.words)}%") for col in columns)) for term in terms
+        ]
+        return select(index.model.id.label('id'), literal(0.0).label('rank')).where(and_(*conditions))
+
+    def snippets(self, index, ids, terms):
+        return None
+
+
+BACKENDS = {backend.name: backend for backend in (PostgresBackend(), SqliteBackend())}
+LIKE_BACKEND = LikeBackend()
+
+# Indexes found installed, per database URL; misses are checked again next time
+_installed = set()
+
+
+def _backend_for(index):
+    backend = BACKENDS.get(db.engine.dialect.name)
+    if backend is None:
+        return LIKE_BACKEND
+    key = (str(db.engine.url), index.table_name)
+    if key not in _installed:
+        if not backend.is_installed(db.session.connection(), index):
+            logger.warning(f"Full-text index for {index.table_name} is missing; "
+                           f"using ILIKE until `python migrations.py` adds it")
+            return LIKE_BACKEND
+        _installed.add(key)
+    return backend
+
+
+def search(query, model, query_text):
+    """
+    Restrict an ORM query to the rows matching a search query.
+
+    Args:
+        query: ORM query over ``model``
+        model: Article or Journalist
+        query_text (str): Search box input
+
+    Returns:
+        tuple: (filtered query, relevance rank column to order by, higher first)
+    """
+    terms = parse_query(query_text)
+    if not terms:
+        return query.filter(false()), literal(0.0)
+    index = INDEXES[model]
+    matches = _backend_for(index).matches(index, terms).subquery()
+    return query.join(matches, matches.c.id == model.id), matches.c.rank
+
+
+def snippets(model, ids, query_text):
+    """
+    Highlighted excerpts of the given rows for a search query.
+
+    Returns:
+        dict: id -> Markup snippet (empty when the backend has no snippets)
+    """
+    terms = parse_query(query_text)
+    ids = list(ids)
+    if not terms or not ids:
+        return {}
+    index = INDEXES[model]
+    statement = _backend_for(index).snippets(index, ids, terms)
+    if statement is None:
+        return {}
+    return {row_id: highlight(raw) for row_id, raw in db.session.execute(statement)}
+
+
+def _install(conn, index, concurrently=False):
+    backend = BACKENDS.get(conn.dialect.name)
+    if backend is None:
+        return
+    existed = backend.is_installed(conn, index)
+    statements = backend.install_sql(index, concurrently)
+    if not existed:
+        statements += backend.populate_sql(index)
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+def install_fulltext(conn, concurrently=False):
+    """
+    Create the full-text index of every indexed model on a connection.
+
+    Args:
+        conn: Connection (AUTOCOMMIT if ``concurrently`` is set on Postgres)
+        concurrently (bool): Build Postgres GIN indexes without blocking writes
+    """
+    for index in INDEXES.values():
+        _install(conn, index, concurrently)
+
+
+def _install_on_create(target, connection, **kwargs):
+    _install(connection, next(index for index in INDEXES.values() if index.model.__table__ is target))
+
+
+# Fresh databases get their index as db.create_all() creates each table
+for _index in INDEXES.values():
+    event.listen(_index.model.__table__, 'after_create', _install_on_create)
@@ -0,0 +1,338 @@
+"""
+Batched ingestion engine shared by every news importer.
+
+Instead of looking up each article, outlet, journalist and topic one row at a
+time, a batch of article records is resolved with a handful of set-based
+``IN (...)`` lookups, the missing rows are bulk-inserted and the
+``article_topics`` links are written with a single executemany.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+
+from app import db
+from models import Article, Journalist, Outlet, Topic, article_topics
+from utils.signals import notify_articles_changed
+from utils.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of values bound into a single IN (...) clause or executemany
+BATCH_SIZE = 500
+
+# Crypto topics and the keywords that tag an article with them
+CRYPTO_TOPIC_KEYWORDS = {
+    'Bitcoin': ['bitcoin', 'btc'],
+    'Ethereum': ['ethereum', 'eth'],
+    'DeFi': ['defi', 'decentralized finance'],
+    'NFT': ['nft', 'non-fungible'],
+    'Regulation': ['regulation', 'sec', 'compliance', 'legal'],
+    'Mining': ['mining', 'miner'],
+    'Exchanges': ['exchange', 'trading', 'binance', 'coinbase'],
+    'Cryptocurrency': ['cryptocurrency', 'crypto']
+}
+
+
+@dataclass
+class IngestResult:
+    """Counts and per-phase timings (in seconds) of one ingestion run."""
+    received: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    articles_added: int = 0
+    outlets_added: int = 0
+    journalists_added: int = 0
+    topics_added: int = 0
+    topic_links_added: int = 0
+    article_ids: list = field(default_factory=list)
+    timings: dict = field(default_factory=dict)
+
+    def add_timing(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def summary(self):
+        timings = ', '.join(f"{phase}={seconds:.3f}s" for phase, seconds in self.timings.items())
+        return (f"{self.articles_added} articles added ({self.duplicates} duplicates, "
+                f"{self.invalid} invalid), {self.outlets_added} outlets, "
+                f"{self.journalists_added} journalists, {self.topics_added} topics, "
+                f"{self.topic_links_added} topic links [{timings}]")
+
+
+def _chunks(items, size=BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def match_keyword_topics(text, topic_keywords=CRYPTO_TOPIC_KEYWORDS):
+    """
+    Return the topic names whose keywords appear in the given text.
+    """
+    text = (text or '').lower()
+    return [topic_name for topic_name, keywords in topic_keywords.items()
+            if any(keyword.lower() in text for keyword in keywords)]
+
+
+def parse_published_at(value):
+    """
+    Parse a News API ``publishedAt`` timestamp, falling back to now.
+    """
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+    except (TypeError, ValueError):
+        return datetime.utcnow()
+
+
+def article_from_news_api(article_data, topic_keywords=None, default_sentiment=False):
+    """
+    Convert a News API article dictionary into an ingestion record.
+
+    Args:
+        article_data (dict): Article as returned by the News API
+        topic_keywords (dict): Optional topic -> keywords map used to tag the article
+        default_sentiment (bool): Whether to store a neutral sentiment up front
+
+    Returns:
+        dict: Ingestion record, or None if critical fields are missing
+    """
+    if not all(article_data.get(k) for k in ['title', 'url', 'publishedAt']):
+        return None
+
+    description = article_data.get('description') or ''
+    record = {
+        'title': article_data['title'],
+        'url': normalize_url(article_data['url']),
+        'content': description,  # Use description initially
+        'published_at': parse_published_at(article_data['publishedAt']),
+        'source_name': (article_data.get('source') or {}).get('name') or 'Unknown Source',
+        'author': article_data.get('author') or 'Unknown Author',
+        'topics': []
+    }
+
+    if topic_keywords:
+        record['topics'] = match_keyword_topics(article_data['title'] + ' ' + description, topic_keywords)
+
+    if default_sentiment:
+        record['sentiment_score'] = 0.0
+        record['sentiment_label'] = 'neutral'
+
+    return record
+
+
+def find_existing_urls(urls):
+    """
+    Return the subset of the given URLs that are already stored as articles.
+    """
+    existing = set()
+    for chunk in _chunks(set(urls)):
+        existing.update(db.session.scalars(select(Article.url).where(Article.url.in_(chunk))))
+    return existing
+
+
+def filter_new_records(records):
+    """
+    Drop records whose URL is already in the database (or repeated in the batch).
+    """
+    existing = find_existing_urls(record['url'] for record in records)
+    new_records = []
+    for record in records:
+        if record['url'] in existing:
+            continue
+        existing.add(record['url'])
+        new_records.append(record)
+    return new_records
+
+
+def _lookup_ids(model, names):
+    """Map names to the lowest matching primary key, one IN (...) query per chunk."""
+    ids = {}
+    for chunk in _chunks(names):
+        rows = db.session.execute(
+            select(model.name, func.min(model.id)).where(model.name.in_(chunk)).group_by(model.name)
+        )
+        ids.update(dict(rows.all()))
+    return ids
+
+
+def resolve_by_name(model, rows_by_name):
+    """
+    Map every name to an id, bulk-inserting the rows that don't exist yet.
+
+    Returns:
+        tuple: (dict of name -> id, number of rows inserted)
+    """
+    if not rows_by_name:
+        return {}, 0
+
+    ids = _lookup_ids(model, rows_by_name.keys())
+    missing = [name for name in rows_by_name if name not in ids]
+    for chunk in _chunks(missing):
+        db.session.execute(insert(model), [rows_by_name[name] for name in chunk])
+    if missing:
+        ids.update(_lookup_ids(model, missing))
+    return ids, len(missing)
+
+
+def resolve_topics(topic_names):
+    """
+    Map topic names to ids, creating the missing topics in bulk.
+
+    Returns:
+        tuple: (dict of name -> id, number of topics created)
+    """
+    now = datetime.utcnow()
+    return resolve_by_name(Topic, {
+        name: {'name': name, 'created_at': now, 'updated_at': now}
+        for name in topic_names if name
+    })
+
+
+def link_article_topics(links, skip_existing=True):
+    """
+    Insert (article_id, topic_id) pairs into article_topics with one executemany.
+
+    Args:
+        links (iterable): (article_id, topic_id) pairs
+        skip_existing (bool): Whether to drop pairs that are already linked
+
+    Returns:
+        int: Number of links inserted
+    """
+    links = set(links)
+    if not links:
+        return 0
+
+    article_ids = {article_id for article_id, _ in links} if skip_existing else ()
+    for chunk in _chunks(article_ids):
+        rows = db.session.execute(
+            select(article_topics.c.article_id, article_topics.c.topic_id)
+            .where(article_topics.c.article_id.in_(chunk))
+        )
+        links.difference_update(tuple(row) for row in rows)
+
+    if links:
+        db.session.execute(insert(article_topics), [
+            {'article_id': article_id, 'topic_id': topic_id} for article_id, topic_id in sorted(links)
+        ])
+    return len(links)
+
+
+def ingest_articles(records, outlet_description="News source: {name}", journalist_region=None, commit=True):
+    """
+    Store a batch of article records, creating outlets, journalists and topics as needed.
+
+    Each record is a dictionary with ``title``, ``url``, ``published_at``,
+    ``source_name`` and ``author`` keys, plus optional ``content``,
+    ``topics`` (list of names), ``sentiment_score``, ``sentiment_label``
+    and ``tone``. URLs are normalized before storing, and articles whose
+    normalized URL already exists are skipped.
+
+    Args:
+        records (list): Article records to ingest
+        outlet_description (str): Description template for new outlets
+        journalist_region (str): Region assigned to new journalists
+        commit (bool): Whether to commit the session at the end (and send
+            ``articles_changed``; callers passing False must send it after committing)
+
+    Returns:
+        IngestResult: Counts and timings of the run
+    """
+    result = IngestResult()
+    started = time.perf_counter()
+
+    valid_records = []
+    for record in records:
+        result.received += 1
+        if not record or not all(record.get(k) for k in ['title', 'url', 'source_name', 'author']):
+            result.invalid += 1
+            continue
+        # Normalize a copy; the caller's records are left untouched
+        valid_records.append({**record, 'url': normalize_url(record['url'])})
+
+    for chunk in _chunks(valid_records):
+        _ingest_chunk(chunk, result, outlet_description, journalist_region)
+
+    if commit and result.articles_added:
+        phase_started = time.perf_counter()
+        db.session.commit()
+        result.add_timing('commit', time.perf_counter() - phase_started)
+        notify_articles_changed(__name__, result.article_ids)
+
+    result.add_timing('total', time.perf_counter() - started)
+    logger.info(f"Ingestion finished: {result.summary()}")
+    return result
+
+
+def _ingest_chunk(records, result, outlet_description, journalist_region):
+    phase_started = time.perf_counter()
+    new_records = filter_new_records(records)
+    result.duplicates += len(records) - len(new_records)
+    if not new_records:
+        result.add_timing('resolve', time.perf_counter() - phase_started)
+        return
+
+    now = datetime.utcnow()
+
+    outlet_ids, created = resolve_by_name(Outlet, {
+        record['source_name']: {
+            'name': record['source_name'],
+            'description': outlet_description.format(name=record['source_name']),
+            'created_at': now,
+            'updated_at': now
+        }
+        for record in new_records
+    })
+    result.outlets_added += created
+
+    # A new journalist is attached to the outlet of their first article in the batch
+    journalist_rows = {}
+    for record in new_records:
+        if record['author'] not in journalist_rows:
+            journalist_rows[record['author']] = {
+                'name': record['author'],
+                'outlet_id': outlet_ids[record['source_name']],
+                'region': journalist_region,
+                'created_at': now,
+                'updated_at': now
+            }
+    journalist_ids, created = resolve_by_name(Journalist, journalist_rows)
+    result.journalists_added += created
+
+    topic_ids, created = resolve_topics({name for record in new_records for name in record.get('topics') or []})
+    result.topics_added += created
+    result.add_timing('resolve', time.perf_counter() - phase_started)
+
+    phase_started = time.perf_counter()
+    db.session.execute(insert(Article), [
+        {
+            'title': record['title'],
+            'url': record['url'],
+            'content': record.get('content'),
+            'published_at': record['published_at'],
+            'journalist_id': journalist_ids[record['author']],
+            'outlet_id': outlet_ids[record['source_name']],
+            'sentiment_score': record.get('sentiment_score'),
+            'sentiment_label': record.get('sentiment_label'),
+            'tone': record.get('tone'),
+            'created_at': now,
+            'updated_at': now
+        }
+        for record in new_records
+    ])
+    article_ids = dict(db.session.execute(
+        select(Article.url, Article.id).where(Article.url.in_([record['url'] for record in new_records]))
+    ).all())
+
+    result.topic_links_added += link_article_topics((
+        (article_ids[record['url']], topic_ids[name])
+        for record in new_records
+        for name in record.get('topics') or []
+        if name
+    ), skip_existing=False)
+    result.articles_added += len(new_records)
+    result.article_ids.extend(article_ids[record['url']] for record in new_records)
+    result.add_timing('insert', time.perf_counter() - phase_started)
@@ -0,0 +1,243 @@
+"""
+Per-request SQL and timing instrumentation.
+
+Every request records the number of SQL statements it ran, the time spent in
+the database, the slowest statements, the time spent rendering templates and
+the remaining (Python) time. The numbers are reported three ways:
+
+- a ``Server-Timing`` response header (``db``, ``tpl``, ``app`` and
+  ``total``), visible in the browser's network panel;
+- a warning log line with the slowest statements for requests slower than
+  SLOW_REQUEST_MS;
+- aggregated per endpoint at ``/metrics`` in the Prometheus text format.
+  Pages with a high ``http_request_sql_statements_total`` to
+  ``http_requests_total`` ratio are the N+1-bound ones.
+
+Metrics are kept per process: with several gunicorn workers each worker
+reports its own counters.
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", 500))
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "1").lower() in ("1", "true", "yes")
+# Number of slowest statements kept per request for the slow-request log
+SLOWEST_STATEMENTS = 5
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """Measurements of the current request, kept on ``flask.g``."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.slowest = []
+        self.template_time = 0.0
+        self._template_started = []
+
+    def start_template(self):
+        self._template_started.append((time.perf_counter(), self.db_time))
+
+    def finish_template(self):
+        # Lazy loads run while rendering count as database time, not template time
+        if self._template_started:
+            started, db_time = self._template_started.pop()
+            self.template_time += time.perf_counter() - started - (self.db_time - db_time)
+
+    def add_statement(self, duration, statement):
+        self.statements += 1
+        self.db_time += duration
+        entry = (duration, self.statements, statement)
+        if len(self.slowest) < SLOWEST_STATEMENTS:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def slowest_statements(self):
+        return [(duration, statement) for duration, _, statement in sorted(self.slowest, reverse=True)]
+
+
+class Metrics:
+    """
+    Per-endpoint request counters and duration histograms.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)
+        self._buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+        self._duration = defaultdict(float)
+        self._count = defaultdict(int)
+        self._statements = defaultdict(int)
+        self._db_time = defaultdict(float)
+        self._template_time = defaultdict(float)
+
+    def observe(self, endpoint, method, status, duration, stats):
+        with self._lock:
+            self._requests[(endpoint, method, status)] += 1
+            buckets = self._buckets[endpoint]
+            for position, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    buckets[position] += 1
+            self._duration[endpoint] += duration
+            self._count[endpoint] += 1
+            self._statements[endpoint] += stats.statements
+            self._db_time[endpoint] += stats.db_time
+            self._template_time[endpoint] += stats.template_time
+
+    def render(self):
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            family('http_requests_total', 'counter', 'Requests by endpoint, method and status.')
+            for (endpoint, method, status), value in sorted(self._requests.items()):
+                lines.append(f'http_requests_total{{endpoint="{_label(endpoint)}",method="{method}",'
+                             f'status="{status}"}} {value}')
+
+            family('http_request_duration_seconds', 'histogram', 'Request duration by endpoint.')
+            for endpoint in sorted(self._count):
+                label = _label(endpoint)
+                for bound, value in zip(DURATION_BUCKETS, self._buckets[endpoint]):
+                    lines.append(f'http_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {value}')
+                lines.append(f'http_request_duration_seconds_bucket{{endpoint="{label}",le="+Inf"}} '
+                             f'{self._count[endpoint]}')
+                lines.append(f'http_request_duration_seconds_sum{{endpoint="{label}"}} {self._duration[endpoint]:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{endpoint="{label}"}} {self._count[endpoint]}')
+
+            for name, values, help_text in (
+                ('http_request_sql_statements_total', self._statements, 'SQL statements run by endpoint.'),
+                ('http_request_db_seconds_total', self._db_time, 'Time spent in SQL statements by endpoint.'),
+                ('http_request_template_seconds_total', self._template_time,
+                 'Time spent rendering templates by endpoint.')
+            ):
+                family(name, 'counter', help_text)
+                for endpoint in sorted(values):
+                    value = values[endpoint]
+                    formatted = value if isinstance(value, int) else f'{value:.6f}'
+                    lines.append(f'{name}{{endpoint="{_label(endpoint)}"}} {formatted}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = Metrics()
+
+
+def _current_stats():
+    if not has_request_context():
+        return None
+    return g.get('request_stats')
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    stats = _current_stats()
+    if stats is not None:
+        stats.add_statement(duration, statement)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    if context.connection is None:
+        return
+    started = context.connection.info.get('query_started')
+    if started:
+        started.pop()
+
+
+def _before_render(sender, template, context, **kwargs):
+    stats = _current_stats()
+    if stats is not None:
+        stats.start_template()
+
+
+def _after_render(sender, template, context, **kwargs):
+    stats = _current_stats()
+    if stats is not None:
+        stats.finish_template()
+
+
+def _server_timing(stats, total):
+    python_time = max(0.0, total - stats.db_time - stats.template_time)
+    return ', '.join([
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} queries"',
+        f'tpl;dur={stats.template_time * 1000:.1f}',
+        f'app;dur={python_time * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}'
+    ])
+
+
+def _start_request():
+    g.request_stats = RequestStats()
+
+
+def _finish_request(response):
+    stats = g.pop('request_stats', None)
+    if stats is None:
+        return response
+    total = time.perf_counter() - stats.started
+    endpoint = request.endpoint or 'unmatched'
+    metrics.observe(endpoint, request.method, response.status_code, total, stats)
+
+    if SERVER_TIMING:
+        response.headers['Server-Timing'] = _server_timing(stats, total)
+
+    if total * 1000 >= SLOW_REQUEST_MS:
+        slowest = '\n'.join(
+            f"  {duration * 1000:.1f}ms {' '.join(statement.split())[:300]}"
+            for duration, statement in stats.slowest_statements()
+        )
+        logger.warning(
+            f"Slow request {request.method} {request.full_path.rstrip('?')} -> {response.status_code}: "
+            f"{total * 1000:.0f}ms total, {stats.statements} queries in {stats.db_time * 1000:.0f}ms, "
+            f"templates {stats.template_time * 1000:.0f}ms" + (f"\n{slowest}" if slowest else '')
+        )
+    return response
+
+
+def metrics_view():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def init_instrumentation(app):
+    """
+    Record per-request SQL and timing statistics and serve them at /metrics.
+    """
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -0,0 +1,169 @@
+"""
+Precompiled word lexicon for sentiment and tone scoring.
+
+Every lexicon word is compiled once into spaCy's 64-bit string hash and a
+bitmask of the categories it belongs to (positive, negative and each tone).
+A document is then scored in a single pass over its tokens, matching the
+lowercased form first and the lowercased lemma second. ``score_many`` scores
+many documents at once with numpy instead of a Python loop per token.
+"""
+
+import numpy
+from spacy.attrs import LEMMA, LOWER
+from spacy.strings import get_string_id
+
+POSITIVE_WORDS = ['good', 'great', 'excellent', 'positive', 'amazing', 'wonderful',
+                  'fantastic', 'terrific', 'outstanding', 'superb', 'brilliant',
+                  'happy', 'pleased', 'delighted', 'satisfied', 'impressed']
+
+NEGATIVE_WORDS = ['bad', 'terrible', 'awful', 'poor', 'negative', 'horrible',
+                  'dreadful', 'disappointing', 'inadequate', 'inferior', 'mediocre',
+                  'annoyed', 'angry', 'upset', 'dissatisfied', 'troubled']
+
+# Tones in priority order: ties go to the tone listed first
+TONE_WORDS = {
+    'analytical': ['analyze', 'analysis', 'research', 'study', 'data', 'evidence', 'investigate'],
+    'confident': ['confident', 'certain', 'sure', 'definitely', 'absolutely', 'undoubtedly'],
+    'tentative': ['maybe', 'perhaps', 'possibly', 'might', 'could', 'uncertain', 'unclear'],
+    'informative': ['inform', 'information', 'explain', 'clarify', 'detail', 'elaborate'],
+    'critical': ['criticize', 'problem', 'issue', 'concern', 'flaw', 'defect', 'negative']
+}
+
+# Score above/below which an article counts as positive/negative
+SENTIMENT_THRESHOLD = 0.05
+
+
+class Lexicon:
+    """
+    Map lowercased words and lemmas to category ids and count them per document.
+
+    Args:
+        categories (dict): Category name -> list of words, in category id order
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        masks = {}
+        for category_id, words in enumerate(categories.values()):
+            for word in words:
+                key = get_string_id(word.lower())
+                masks[key] = masks.get(key, 0) | (1 << category_id)
+
+        # Sorted hash array for vectorized lookups with searchsorted
+        self._lookup = masks
+        self._keys = numpy.array(sorted(masks), dtype=numpy.uint64)
+        self._masks = numpy.array([masks[key] for key in sorted(masks)], dtype=numpy.int64)
+        self._bits = numpy.arange(len(self.categories), dtype=numpy.int64)
+        # Lemma hash -> hash of the lowercased lemma
+        self._lowered = {}
+
+    def _lowered_lemma(self, lemma, strings):
+        # LEMMA keeps the case of proper nouns ("Bitcoin"), so look up its lowercased form
+        lowered = self._lowered.get(lemma)
+        if lowered is None:
+            lowered = self._lowered[lemma] = get_string_id(strings[lemma].lower())
+        return lowered
+
+    def category_id(self, name):
+        return self.categories.index(name)
+
+    def count(self, doc):
+        """
+        Count category hits in one document in a single pass over its tokens.
+
+        Returns:
+            list: Hit count per category id
+        """
+        counts = [0] * len(self.categories)
+        lookup = self._lookup
+        for token in doc:
+            mask = lookup.get(token.lower) or lookup.get(self._lowered_lemma(token.lemma, doc.vocab.strings))
+            while mask:
+                lowest = mask & -mask
+                counts[lowest.bit_length() - 1] += 1
+                mask ^= lowest
+        return counts
+
+    def _masks_for(self, hashes):
+        if not len(self._keys):
+            return numpy.zeros(len(hashes), dtype=numpy.int64)
+        positions = numpy.searchsorted(self._keys, hashes)
+        positions[positions == len(self._keys)] = 0
+        return numpy.where(self._keys[positions] == hashes, self._masks[positions], 0)
+
+    def count_many(self, docs):
+        """
+        Count category hits for many documents at once.
+
+        Returns:
+            tuple: (counts array of shape (docs, categories), token count per doc)
+        """
+        docs = list(docs)
+        lengths = numpy.array([len(doc) for doc in docs], dtype=numpy.int64)
+        counts = numpy.zeros((len(docs), len(self.categories)), dtype=numpy.int64)
+        if not lengths.sum():
+            return counts, lengths
+
+        tokens = numpy.concatenate([doc.to_array([LOWER, LEMMA]) for doc in docs if len(doc)])
+        masks = self._masks_for(tokens[:, 0])
+        lemmas, positions = numpy.unique(tokens[:, 1], return_inverse=True)
+        strings = docs[0].vocab.strings
+        lowered = numpy.array([self._lowered_lemma(int(lemma), strings) for lemma in lemmas], dtype=numpy.uint64)
+        masks = numpy.where(masks != 0, masks, self._masks_for(lowered[positions]))
+
+        hits = (masks[:, None] >> self._bits) & 1
+        doc_index = numpy.repeat(numpy.arange(len(docs)), lengths)
+        for category_id in range(len(self.categories)):
+            counts[:, category_id] = numpy.bincount(doc_index, weights=hits[:, category_id], minlength=len(docs))
+        return counts, lengths
+
+
+class SentimentScorer:
+    """
+    Turn lexicon counts into the sentiment dictionary stored on articles.
+    """
+
+    def __init__(self, positive=POSITIVE_WORDS, negative=NEGATIVE_WORDS, tones=TONE_WORDS):
+        self.tones = list(tones)
+        self.lexicon = Lexicon({'positive': positive, 'negative': negative, **tones})
+
+    def _result(self, counts, total_words):
+        if total_words > 0:
+            sentiment_score = counts[0] / total_words - counts[1] / total_words
+        else:
+            sentiment_score = 0.0
+
+        if sentiment_score > SENTIMENT_THRESHOLD:
+            sentiment_label = 'positive'
+        elif sentiment_score < -SENTIMENT_THRESHOLD:
+            sentiment_label = 'negative'
+        else:
+            sentiment_label = 'neutral'
+
+        tone_counts = list(counts[2:])
+        tone = self.tones[tone_counts.index(max(tone_counts))] if any(tone_counts) else 'neutral'
+
+        return {
+            'score': float(sentiment_score),
+            'label': sentiment_label,
+            'tone': tone
+        }
+
+    def score(self, doc):
+        """
+        Score one parsed spaCy Doc.
+        """
+        return self._result(self.lexicon.count(doc), len(doc))
+
+    def score_many(self, docs):
+        """
+        Score many parsed spaCy Docs in one vectorized pass.
+
+        Returns:
+            list: One sentiment dictionary per doc, in input order
+        """
+        counts, lengths = self.lexicon.count_many(docs)
+        return [self._result(row.tolist(), int(length)) for row, length in zip(counts, lengths)]
+
+
+DEFAULT_SCORER = SentimentScorer()
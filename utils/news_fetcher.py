@@ -1,12 +1,13 @@
+import asyncio
 import requests
 import logging
 import os
 from datetime import datetime, timedelta
 from flask import Flask
 import importlib
-from models import Article, Journalist, Outlet, Topic, db
-from utils.openai_analyzer import analyze_article_sentiment, extract_article_topics, summarize_article
-from utils.web_scraper import get_website_text_content
+from utils.analysis_worker import run_analysis_worker
+from utils.web_scraper import iter_website_text_contents
+from utils.ingestion import article_from_news_api, filter_new_records, ingest_articles
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +23,9 @@ CRYPTO_KEYWORDS = [
     "crypto", "defi", "nft", "token", "coinbase", "binance"
 ]
 
+# Downloaded articles are ingested in batches of this size while the rest download
+INGEST_BATCH_SIZE = 20
+
 def fetch_latest_crypto_news(days=1):
     """
     Fetch the latest cryptocurrency news articles using the News API.
@@ -81,108 +85,49 @@ def process_news_articles(articles, analyze_content=True):
         int: Number of new articles added
     """
     # Import app directly inside the function to avoid circular imports
-    from app import app
+    from app import app, db
     
     with app.app_context():
+        records = [article_from_news_api(article_data) for article_data in articles]
+        # Skip articles we already have before spending time on analysis
+        records = filter_new_records([record for record in records if record])
+        # Don't keep the read transaction open while pages download
+        db.session.commit()
+        
         articles_added = 0
+        article_ids = []
         
-        for article_data in articles:
-            # Skip if missing critical fields
-            if not all(k in article_data for k in ['title', 'url', 'publishedAt']):
-                continue
-                
-            # Check if article already exists
-            existing = Article.query.filter_by(url=article_data['url']).first()
-            if existing:
-                continue
-                
-            # Get or create outlet
-            source_name = article_data.get('source', {}).get('name', 'Unknown Source')
-            outlet = Outlet.query.filter_by(name=source_name).first()
-            if not outlet:
-                outlet = Outlet(
-                    name=source_name,
-                    website=None,  # We don't have the website URL from the API
-                    country=None,  # We don't have country info
-                    description=f"News source: {source_name}",
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                db.session.add(outlet)
-                db.session.flush()  # Get ID without committing
-            
-            # Get or create journalist
-            author = article_data.get('author', 'Unknown Author')
-            journalist = Journalist.query.filter_by(name=author).first()
-            if not journalist:
-                journalist = Journalist(
-                    name=author,
-                    outlet_id=outlet.id,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                db.session.add(journalist)
-                db.session.flush()  # Get ID without committing
-            
-            # Parse published date
-            try:
-                published_at = datetime.strptime(article_data['publishedAt'], '%Y-%m-%dT%H:%M:%SZ')
-            except ValueError:
-                published_at = datetime.utcnow()
-            
-            # Create article
-            article = Article(
-                title=article_data['title'],
-                url=article_data['url'],
-                content=article_data.get('description', ''),  # Use description initially
-                published_at=published_at,
-                journalist_id=journalist.id,
-                outlet_id=outlet.id,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            
-            # If analyze_content is True and we have OpenAI API key, get more data
-            if analyze_content and os.environ.get("OPENAI_API_KEY"):
-                try:
-                    # Try to get full article content
-                    full_content = get_website_text_content(article_data['url'])
-                    if full_content:
-                        article.content = full_content
-                        
-                        # Analyze sentiment
-                        sentiment_data = analyze_article_sentiment(full_content)
-                        if sentiment_data:
-                            article.sentiment_score = sentiment_data.get('score', 0)
-                            article.sentiment_label = sentiment_data.get('label', 'neutral')
-                        
-                        # Extract topics
-                        topic_names = extract_article_topics(full_content)
-                        if topic_names:
-                            for topic_name in topic_names:
-                                # Get or create topic
-                                topic = Topic.query.filter_by(name=topic_name).first()
-                                if not topic:
-                                    topic = Topic(
-                                        name=topic_name,
-                                        created_at=datetime.utcnow(),
-                                        updated_at=datetime.utcnow()
-                                    )
-                                    db.session.add(topic)
-                                    db.session.flush()
-                                
-                                # Add topic to article
-                                article.topics.append(topic)
-                except Exception as e:
-                    logger.error(f"Error analyzing article {article_data['url']}: {e}")
-            
-            # Add and commit
-            db.session.add(article)
-            articles_added += 1
+        def ingest(batch):
+            nonlocal articles_added
+            if batch:
+                result = ingest_articles(batch, outlet_description="News source: {name}")
+                articles_added += result.articles_added
+                article_ids.extend(result.article_ids)
+        
+        # If analyze_content is True and we have OpenAI API key, get more data
+        analyze_content = analyze_content and bool(os.environ.get("OPENAI_API_KEY"))
+        if analyze_content:
+            records_by_url = {record['url']: record for record in records}
+            # Full pages are downloaded concurrently and stored with the article;
+            # finished pages are ingested in batches while later ones are still
+            # downloading
+            batch = []
+            for url, full_content in iter_website_text_contents(records_by_url):
+                record = records_by_url[url]
+                if full_content:
+                    record['content'] = full_content
+                batch.append(record)
+                if len(batch) >= INGEST_BATCH_SIZE:
+                    ingest(batch)
+                    batch = []
+            ingest(batch)
+        else:
+            ingest(records)
         
-        if articles_added > 0:
-            db.session.commit()
-            logger.info(f"Added {articles_added} new articles")
+        # OpenAI analysis runs after the ingestion transactions have been committed,
+        # so slow completions never hold the database session open
+        if analyze_content and article_ids:
+            asyncio.run(run_analysis_worker(article_ids))
         
         return articles_added
 
@@ -1,29 +1,55 @@
+import os
 import spacy
 import logging
-import nltk
+import threading
+from sqlalchemy import select, update
 from app import db
 from models import Article
+from utils.ingestion import link_article_topics, resolve_topics
+from utils.lexicon import DEFAULT_SCORER
+from utils.signals import notify_articles_changed
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Download necessary NLTK data (small resources)
-try:
-    nltk.download('punkt', quiet=True)
-    logger.info("Successfully downloaded NLTK punkt tokenizer")
-except Exception as e:
-    logger.warning(f"Error downloading NLTK data: {e}")
+# Number of processes nlp.pipe uses for bulk analysis; defaults to one per core
+NLP_PROCESSES = int(os.environ.get("NLP_PROCESSES", 0)) or os.cpu_count() or 1
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("Successfully loaded spaCy model")
-except Exception as e:
-    logger.warning(f"Error loading spaCy model: {e}")
-    # Fallback to a basic model that should work
-    nlp = spacy.blank("en")
-    logger.info("Loaded fallback spaCy model")
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """
+    Return the shared spaCy pipeline, loading it on first use.
+    Loading is guarded by a lock so concurrent first requests load it once.
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = _load_nlp()
+    return _nlp
+
+def _load_nlp():
+    try:
+        model = spacy.load(SPACY_MODEL)
+        logger.info("Successfully loaded spaCy model")
+    except Exception as e:
+        logger.warning(f"Error loading spaCy model: {e}")
+        # Fallback to a basic model that should work
+        model = spacy.blank("en")
+        logger.info("Loaded fallback spaCy model")
+    return model
+
+def preload_models():
+    """
+    Load the NLP models now instead of on first use, e.g. in the gunicorn
+    master before workers are forked so they share the loaded pages.
+    """
+    return get_nlp()
 
 def analyze_sentiment(text):
     """
@@ -38,69 +64,16 @@ def analyze_sentiment(text):
         }
     
     # Process the text with spaCy
-    doc = nlp(text)
-    
-    # Basic sentiment analysis
+    return sentiment_from_doc(get_nlp()(text))
+
+def sentiment_from_doc(doc):
+    """
+    Derive sentiment score, label and tone from an already parsed spaCy Doc.
+    """
+    # Basic lexicon-based sentiment analysis (see utils.lexicon)
     # This is a simplified approach - in a production system, you would use
     # a more sophisticated sentiment analysis model
-    
-    positive_words = set(['good', 'great', 'excellent', 'positive', 'amazing', 'wonderful', 
-                        'fantastic', 'terrific', 'outstanding', 'superb', 'brilliant',
-                        'happy', 'pleased', 'delighted', 'satisfied', 'impressed'])
-    
-    negative_words = set(['bad', 'terrible', 'awful', 'poor', 'negative', 'horrible', 
-                        'dreadful', 'disappointing', 'inadequate', 'inferior', 'mediocre',
-                        'annoyed', 'angry', 'upset', 'dissatisfied', 'troubled'])
-    
-    # Count positive and negative words
-    positive_count = 0
-    negative_count = 0
-    
-    for token in doc:
-        if token.text.lower() in positive_words:
-            positive_count += 1
-        elif token.text.lower() in negative_words:
-            negative_count += 1
-    
-    # Calculate a simple sentiment score
-    total_words = len(doc)
-    if total_words > 0:
-        positive_score = positive_count / total_words
-        negative_score = negative_count / total_words
-        sentiment_score = positive_score - negative_score
-    else:
-        sentiment_score = 0.0
-    
-    # Determine sentiment label
-    if sentiment_score > 0.05:
-        sentiment_label = 'positive'
-    elif sentiment_score < -0.05:
-        sentiment_label = 'negative'
-    else:
-        sentiment_label = 'neutral'
-    
-    # Detect tone (simplified)
-    # In a production system, you would use a more sophisticated tone detection model
-    tone_words = {
-        'analytical': set(['analyze', 'analysis', 'research', 'study', 'data', 'evidence', 'investigate']),
-        'confident': set(['confident', 'certain', 'sure', 'definitely', 'absolutely', 'undoubtedly']),
-        'tentative': set(['maybe', 'perhaps', 'possibly', 'might', 'could', 'uncertain', 'unclear']),
-        'informative': set(['inform', 'information', 'explain', 'clarify', 'detail', 'elaborate']),
-        'critical': set(['criticize', 'problem', 'issue', 'concern', 'flaw', 'defect', 'negative'])
-    }
-    
-    tone_counts = {}
-    for tone, words in tone_words.items():
-        count = sum(1 for token in doc if token.text.lower() in words)
-        tone_counts[tone] = count
-    
-    tone = max(tone_counts.items(), key=lambda x: x[1])[0] if any(tone_counts.values()) else 'neutral'
-    
-    return {
-        'score': sentiment_score,
-        'label': sentiment_label,
-        'tone': tone
-    }
+    return DEFAULT_SCORER.score(doc)
 
 def extract_topics(text):
     """
@@ -111,21 +84,27 @@ def extract_topics(text):
         return []
     
     # Process the text with spaCy
-    doc = nlp(text)
-    
+    return topics_from_doc(get_nlp()(text))
+
+def topics_from_doc(doc):
+    """
+    Derive topic names from an already parsed spaCy Doc.
+    """
     # Extract entities that could be topics
     topics = []
     for ent in doc.ents:
         if ent.label_ in ['ORG', 'GPE', 'PERSON', 'EVENT', 'LAW', 'WORK_OF_ART']:
             topics.append(ent.text)
     
-    # Also add noun chunks as potential topics
-    for chunk in doc.noun_chunks:
-        if len(chunk.text.split()) <= 3:  # Limit to short phrases
-            topics.append(chunk.text)
+    # Also add noun chunks as potential topics (needs a dependency parser,
+    # which the blank fallback model doesn't have)
+    if doc.has_annotation("DEP"):
+        for chunk in doc.noun_chunks:
+            if len(chunk.text.split()) <= 3:  # Limit to short phrases
+                topics.append(chunk.text)
     
-    # Return unique topics
-    return list(set(topics))
+    # Return unique topics that fit in the topic name column
+    return list({topic for topic in topics if len(topic) <= 100})
 
 def analyze_article(article):
     """
@@ -136,14 +115,15 @@ def analyze_article(article):
         return
     
     try:
-        # Analyze sentiment
-        sentiment_result = analyze_sentiment(article.content)
+        # Parse once and derive sentiment and topics from the same Doc
+        doc = get_nlp()(article.content)
+        sentiment_result = sentiment_from_doc(doc)
         article.sentiment_score = sentiment_result['score']
         article.sentiment_label = sentiment_result['label']
         article.tone = sentiment_result['tone']
         
         # Extract topics
-        topic_names = extract_topics(article.content)
+        topic_names = topics_from_doc(doc)
         
         # Create or get Topic objects and associate with article
         from models import Topic
@@ -159,24 +139,99 @@ def analyze_article(article):
         
         # Update article in database
         db.session.commit()
+        notify_articles_changed(__name__, [article.id])
         logger.info(f"Successfully analyzed article {article.id}")
         
     except Exception as e:
         logger.error(f"Error analyzing article {article.id}: {e}")
         db.session.rollback()
 
-def analyze_all_articles():
-    """
-    Analyze all articles in the database that haven't been analyzed yet.
+def _iter_unanalyzed_articles(chunk_size):
     """
-    articles = Article.query.filter(
-        (Article.sentiment_score.is_(None)) | 
-        (Article.sentiment_label.is_(None))
-    ).all()
+    Yield (content, article_id) pairs for unanalyzed articles in id order.
     
-    logger.info(f"Found {len(articles)} articles to analyze")
+    Rows are read in keyset-paginated chunks so only one chunk of article
+    text is held in memory at a time.
+    """
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Article.id, Article.content)
+            .where(
+                (Article.sentiment_score.is_(None)) | 
+                (Article.sentiment_label.is_(None)),
+                Article.id > last_id
+            )
+            .order_by(Article.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        for article_id, content in rows:
+            if content:
+                yield content, article_id
+            else:
+                logger.warning(f"Article {article_id} has no content to analyze")
+        last_id = rows[-1][0]
+
+def _write_analysis_results(parsed):
+    """
+    Score a chunk of parsed (article_id, doc) pairs, store the results and commit.
+    """
+    sentiments = DEFAULT_SCORER.score_many(doc for _, doc in parsed)
+    results = [
+        (article_id, sentiment, topics_from_doc(doc))
+        for (article_id, doc), sentiment in zip(parsed, sentiments)
+    ]
+    db.session.execute(update(Article), [
+        {
+            'id': article_id,
+            'sentiment_score': sentiment['score'],
+            'sentiment_label': sentiment['label'],
+            'tone': sentiment['tone']
+        }
+        for article_id, sentiment, _ in results
+    ])
+    topic_ids, _ = resolve_topics({name for _, _, names in results for name in names})
+    link_article_topics(
+        (article_id, topic_ids[name]) for article_id, _, names in results for name in names
+    )
+    db.session.commit()
+    notify_articles_changed(__name__, [article_id for article_id, _, _ in results])
+
+def analyze_all_articles(chunk_size=500, batch_size=64, n_process=None):
+    """
+    Analyze all articles in the database that haven't been analyzed yet.
     
-    for article in articles:
-        analyze_article(article)
+    Articles are streamed in id-ordered chunks and parsed once each through
+    ``nlp.pipe``; sentiment, tone and topics are all derived from that single
+    Doc and every chunk is committed in one transaction.
     
-    logger.info("Finished analyzing articles")
+    Args:
+        chunk_size (int): Number of articles read and committed at a time
+        batch_size (int): Number of texts spaCy processes per batch
+        n_process (int): Number of spaCy worker processes (defaults to NLP_PROCESSES)
+        
+    Returns:
+        int: Number of articles analyzed
+    """
+    n_process = n_process or NLP_PROCESSES
+    analyzed = 0
+    parsed = []
+    
+    docs = get_nlp().pipe(_iter_unanalyzed_articles(chunk_size), as_tuples=True,
+                          batch_size=batch_size, n_process=n_process)
+    for doc, article_id in docs:
+        parsed.append((article_id, doc))
+        if len(parsed) >= chunk_size:
+            _write_analysis_results(parsed)
+            analyzed += len(parsed)
+            logger.info(f"Analyzed {analyzed} articles")
+            parsed = []
+    
+    if parsed:
+        _write_analysis_results(parsed)
+        analyzed += len(parsed)
+    
+    logger.info(f"Finished analyzing {analyzed} articles")
+    return analyzed
@@ -1,97 +1,224 @@
 import os
 import json
+import hashlib
 import logging
-from openai import OpenAI
+import threading
+from openai import AsyncOpenAI, OpenAI
+from utils.sqlite_cache import SQLiteCache
 
 logger = logging.getLogger(__name__)
 
 # The newest OpenAI model is "gpt-4o" which was released May 13, 2024.
 # Do not change this unless explicitly requested by the user
+OPENAI_MODEL = "gpt-4o"
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-openai = OpenAI(api_key=OPENAI_API_KEY)
+# Point this at a local stub server to run without the real API
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")
 
-def analyze_article_sentiment(text):
+# Only the start of each article is sent to the API
+MAX_INPUT_CHARS = 4000
+
+# Bump whenever the prompt or the shape of the result changes, so cached
+# analyses produced by an older prompt are not reused
+PROMPT_VERSION = "2"
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Set ANALYSIS_CACHE_PATH to an empty string to disable the cache
+ANALYSIS_CACHE_PATH = os.environ.get("ANALYSIS_CACHE_PATH", os.path.join(BASE_DIR, "instance", "analysis_cache.sqlite3"))
+
+ANALYSIS_PROMPT = (
+    "You are a cryptocurrency news analyst specializing in sentiment analysis, topic extraction "
+    + "and summarization. Analyze this crypto news article and return a JSON object with: "
+    + "1. sentiment_score: a float between -1.0 (very negative) and 1.0 (very positive) where 0 is neutral "
+    + "2. sentiment_label: one of 'positive', 'negative', or 'neutral' "
+    + "3. tone: the overall tone (analytical, confident, concerned, etc.) "
+    + "4. topics: a list of 2-5 specific crypto topics like 'Bitcoin', 'DeFi', 'Regulation', 'NFTs', 'Mining' "
+    + "5. summary: a concise 2-3 sentence summary focused on the key facts and implications for the crypto industry"
+)
+
+DEFAULT_ANALYSIS = {
+    "score": 0.0,
+    "label": "neutral",
+    "tone": "unknown",
+    "topics": [],
+    "summary": "Summary not available."
+}
+
+_client = None
+_async_client = None
+_cache = None
+_lock = threading.Lock()
+
+def get_client():
     """
-    Analyze the sentiment of an article using OpenAI's API.
-    Returns sentiment score (-1.0 to 1.0) and label (positive, negative, neutral).
+    Return the OpenAI client, creating it on first use.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+        return _client
+
+def get_async_client():
+    """
+    Return an asyncio OpenAI client for the running event loop.
+    Async clients are bound to the loop that uses them, so a new one is made
+    per call unless one was installed with set_client().
+    
+    Returns:
+        tuple: (client, owned) - the caller should close clients it owns
+    """
+    with _lock:
+        if _async_client is not None:
+            return _async_client, False
+    return AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL), True
+
+def set_client(client=None, async_client=None):
+    """
+    Replace the OpenAI clients, e.g. with ones pointed at a local stub server.
+    """
+    global _client, _async_client
+    with _lock:
+        if client is not None:
+            _client = client
+        if async_client is not None:
+            _async_client = async_client
+
+def get_analysis_cache():
+    """
+    Return the persistent analysis cache, or None if it is disabled.
+    """
+    global _cache
+    if not ANALYSIS_CACHE_PATH:
+        return None
+    with _lock:
+        if _cache is None:
+            _cache = SQLiteCache(ANALYSIS_CACHE_PATH, table='article_analysis')
+        return _cache
+
+def analysis_cache_key(text):
+    """
+    Cache key for an article: the prompt version, model and the truncated text
+    actually sent to the API.
+    """
+    payload = f"{PROMPT_VERSION}\0{OPENAI_MODEL}\0{text[:MAX_INPUT_CHARS]}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def build_analysis_messages(text):
+    return [
+        {"role": "system", "content": ANALYSIS_PROMPT},
+        {"role": "user", "content": text[:MAX_INPUT_CHARS]}  # Limit to first 4000 chars for API limits
+    ]
+
+def parse_analysis(content):
+    """
+    Normalize the JSON returned by the model into the analysis dictionary.
+    """
+    result = json.loads(content)
+
+    try:
+        score = max(-1.0, min(1.0, float(result.get("sentiment_score", 0.0))))
+    except (TypeError, ValueError):
+        score = 0.0
+
+    label = str(result.get("sentiment_label", "")).lower()
+    if label not in ("positive", "negative", "neutral"):
+        label = "positive" if score > 0.05 else "negative" if score < -0.05 else "neutral"
+
+    topics = result.get("topics") or result.get("key_topics") or []
+    if not isinstance(topics, list):
+        topics = [topics]
+
+    return {
+        "score": score,
+        "label": label,
+        "tone": result.get("tone") or "unknown",
+        "topics": [str(topic).strip() for topic in topics if str(topic).strip()],
+        "summary": (result.get("summary") or DEFAULT_ANALYSIS["summary"]).strip()
+    }
+
+def get_cached_analysis(text):
+    cache = get_analysis_cache()
+    if not cache:
+        return None
+    cached = cache.get(analysis_cache_key(text))
+    return json.loads(cached) if cached else None
+
+def store_analysis(text, analysis):
+    cache = get_analysis_cache()
+    if cache:
+        cache.set(analysis_cache_key(text), json.dumps(analysis).encode('utf-8'))
+
+def request_article_analysis(text):
+    """
+    Run the combined analysis through the API, raising on failure.
+    """
+    response = get_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=build_analysis_messages(text),
+        response_format={"type": "json_object"},
+    )
+    return parse_analysis(response.choices[0].message.content)
+
+async def request_article_analysis_async(text, client):
+    """
+    Async variant of request_article_analysis using the given AsyncOpenAI client.
+
+    Returns:
+        tuple: (analysis dictionary, total tokens used or None)
+    """
+    response = await client.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=build_analysis_messages(text),
+        response_format={"type": "json_object"},
+    )
+    usage = getattr(response, "usage", None)
+    return parse_analysis(response.choices[0].message.content), getattr(usage, "total_tokens", None)
+
+def analyze_article_content(text):
     """
+    Analyze an article with a single OpenAI call.
+    Returns a dictionary with sentiment score (-1.0 to 1.0), label (positive,
+    negative, neutral), tone, topics and summary. Results are cached on disk
+    so the same text is never sent to the API twice.
+    """
+    cached = get_cached_analysis(text)
+    if cached:
+        return cached
+
     try:
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a sentiment analysis expert specializing in cryptocurrency journalism. "
-                    + "Analyze the sentiment of this crypto news article and return a JSON object with: "
-                    + "1. sentiment_score: a float between -1.0 (very negative) and 1.0 (very positive) where 0 is neutral "
-                    + "2. sentiment_label: one of 'positive', 'negative', or 'neutral' "
-                    + "3. tone: the overall tone (analytical, confident, concerned, etc.) "
-                    + "4. key_topics: a list of 2-4 crypto-specific topics mentioned"
-                },
-                {"role": "user", "content": text[:4000]}  # Limit to first 4000 chars for API limits
-            ],
-            response_format={"type": "json_object"},
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return result
+        analysis = request_article_analysis(text)
     except Exception as e:
         logger.error(f"Error analyzing article with OpenAI: {e}")
-        # Return default values if API fails
-        return {
-            "sentiment_score": 0.0,
-            "sentiment_label": "neutral",
-            "tone": "unknown",
-            "key_topics": []
-        }
+        # Return default values if API fails; failures are not cached
+        return dict(DEFAULT_ANALYSIS)
+
+    store_analysis(text, analysis)
+    return analysis
+
+def analyze_article_sentiment(text):
+    """
+    Analyze the sentiment of an article using OpenAI's API.
+    Returns sentiment score (-1.0 to 1.0) and label (positive, negative, neutral).
+    """
+    analysis = analyze_article_content(text)
+    return {
+        "sentiment_score": analysis["score"],
+        "sentiment_label": analysis["label"],
+        "tone": analysis["tone"],
+        "key_topics": analysis["topics"]
+    }
 
 def extract_article_topics(text):
     """
     Extract the main topics from an article using OpenAI's API.
     Returns a list of topic names relevant to crypto journalism.
     """
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a cryptocurrency news analyst specializing in topic extraction. "
-                    + "Extract the main crypto-related topics from this article and return only a JSON array "
-                    + "with 2-5 topic names. Focus on specific cryptocurrency topics like 'Bitcoin', 'DeFi', "
-                    + "'Regulation', 'NFTs', 'Mining', etc. Be specific and accurate to crypto terminology."
-                },
-                {"role": "user", "content": text[:4000]}  # Limit to first 4000 chars for API limits
-            ],
-            response_format={"type": "json_object"},
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return result.get("topics", [])
-    except Exception as e:
-        logger.error(f"Error extracting topics with OpenAI: {e}")
-        return []
+    return analyze_article_content(text)["topics"]
 
 def summarize_article(text):
     """
     Generate a concise summary of an article using OpenAI's API.
     Returns a string with the summary.
     """
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a cryptocurrency news summarizer. "
-                    + "Create a concise 2-3 sentence summary of this crypto news article. "
-                    + "Focus on the key facts and implications for the crypto industry."
-                },
-                {"role": "user", "content": text[:4000]}  # Limit to first 4000 chars for API limits
-            ]
-        )
-        
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        logger.error(f"Error summarizing article with OpenAI: {e}")
-        return "Summary not available."
\ No newline at end of file
+    return analyze_article_content(text)["summary"]
@@ -0,0 +1,196 @@
+"""
+Bounded concurrent page downloader used by the scraper.
+
+Pages are fetched on a thread pool through one shared keep-alive
+``requests.Session``. Each host gets its own connection limit, failed
+requests are retried with exponential backoff, and results are yielded as
+soon as each download completes so callers can start processing early pages
+while later ones are still in flight.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; JournalistTracker/1.0; +https://github.com/SonGoku-real/JournalistTracker)"
+
+# Status codes worth retrying; anything else is returned to the caller as-is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of downloading a single URL."""
+    url: str
+    status: int = None
+    content: bytes = None
+    headers: dict = field(default_factory=dict)
+    error: str = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == 200 and self.content is not None
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+class PageFetcher:
+    """
+    Download pages concurrently with per-host limits, timeouts and retries.
+
+    Args:
+        max_workers (int): Maximum number of downloads in flight overall
+        per_host (int): Maximum number of concurrent downloads per host
+        timeout (tuple): (connect, read) timeout in seconds
+        retries (int): Number of retries after the first attempt
+        backoff (float): Base delay in seconds for exponential backoff
+        max_bytes (int): Responses larger than this are truncated
+        session (requests.Session): Optional session to share (e.g. in tests)
+    """
+
+    def __init__(self, max_workers=8, per_host=2, timeout=(5, 20), retries=2, backoff=0.5,
+                 max_bytes=20 * 1024 * 1024, session=None, user_agent=DEFAULT_USER_AGENT):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_bytes = max_bytes
+        self.session = session or self._build_session(user_agent)
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+
+    def _build_session(self, user_agent):
+        session = requests.Session()
+        # One keep-alive pool per host, sized so every worker can hold a connection
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = user_agent
+        return session
+
+    def _slot_for(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** (attempt - 1)) * (0.5 + random.random())
+
+    def _read_body(self, response):
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                logger.warning(f"Truncating {response.url} at {self.max_bytes} bytes")
+                break
+        return b''.join(chunks)
+
+    def fetch(self, url, headers=None):
+        """
+        Download a single URL, retrying transient failures.
+
+        Args:
+            url (str): URL to download
+            headers (dict): Extra request headers (e.g. If-None-Match)
+
+        Returns:
+            FetchResult: The response body and metadata, or the last error
+        """
+        result = FetchResult(url=url)
+        started = time.perf_counter()
+        slot = self._slot_for(url)
+
+        while result.attempts <= self.retries:
+            result.attempts += 1
+            retry_after = None
+            try:
+                with slot:
+                    with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                        result.status = response.status_code
+                        result.headers = response.headers
+                        if response.status_code not in RETRY_STATUSES:
+                            if response.status_code == 200:
+                                result.content = self._read_body(response)
+                            # A 304 after a retried 429/5xx is a success too: drop the earlier error
+                            if response.status_code in (200, 304):
+                                result.error = None
+                            else:
+                                result.error = f"HTTP {response.status_code}"
+                            break
+                        retry_after = response.headers.get('Retry-After')
+                        result.error = f"HTTP {response.status_code}"
+            except requests.exceptions.RequestException as e:
+                result.error = str(e)
+
+            if result.attempts <= self.retries:
+                time.sleep(self._delay(result.attempts, retry_after))
+
+        result.elapsed = time.perf_counter() - started
+        if result.error:
+            logger.error(f"Failed to download content from {url}: {result.error}")
+        return result
+
+    def fetch_many(self, urls, headers_for=None):
+        """
+        Download many URLs concurrently, yielding results as they complete.
+
+        Args:
+            urls (iterable): URLs to download (duplicates are fetched once)
+            headers_for (callable): Optional url -> headers dict hook
+
+        Yields:
+            FetchResult: One result per distinct URL, in completion order
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)),
+                                thread_name_prefix='page-fetcher') as executor:
+            futures = [
+                executor.submit(self.fetch, url, headers_for(url) if headers_for else None)
+                for url in urls
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def close(self):
+        self.session.close()
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def get_default_fetcher():
+    """
+    Return the process-wide fetcher so every caller shares one connection pool.
+    """
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = PageFetcher()
+        return _default_fetcher
@@ -0,0 +1,202 @@
+"""
+Keyset (cursor) pagination for list and search pages.
+
+Pages are ordered by a sort column plus the primary key as a tie-breaker,
+e.g. ``(published_at DESC, id DESC)`` or ``(name, id)``. Instead of an
+OFFSET, the next page starts after the last row of the current one, so every
+page costs one bounded index range scan however deep the client pages. The
+position is handed to clients as an opaque, URL-safe ``cursor`` string.
+Rows with a NULL sort value come last in both directions.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from flask import abort, request, url_for
+from sqlalchemy import DateTime, and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class Page:
+    """One page of results and the cursor of the page after it."""
+    items: list
+    page_size: int
+    next_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(value, row_id):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_column):
+    """
+    Decode a cursor into (sort value, id).
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if not isinstance(row_id, int):
+        raise ValueError("Invalid cursor: id must be an integer")
+    if value is not None and isinstance(sort_column.type, DateTime):
+        value = datetime.fromisoformat(value)
+    return value, row_id
+
+
+def page_args(prefix=''):
+    """
+    Read ``<prefix>cursor`` and ``page_size`` from the request arguments.
+
+    Returns:
+        tuple: (cursor or None, page size clamped to 1..MAX_PAGE_SIZE)
+    """
+    cursor = request.args.get(f'{prefix}cursor') or None
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    return cursor, max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def _cursor_position(cursor, sort_column):
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, sort_column)
+    except ValueError:
+        abort(400, description="Invalid pagination cursor")
+
+
+def _beyond(column, bound, descending):
+    return column < bound if descending else column > bound
+
+
+def _fetch(query, sort_column, id_column, descending, limit, after=None):
+    if after is not None:
+        value, row_id = after
+        query = query.filter(or_(
+            _beyond(sort_column, value, descending),
+            and_(sort_column == value, _beyond(id_column, row_id, descending))
+        ))
+    if descending:
+        order = (sort_column.desc(), id_column.desc())
+    else:
+        order = (sort_column.asc(), id_column.asc())
+    return query.order_by(*order).limit(limit).all()
+
+
+def paginate(query, sort_column, id_column, cursor=None, page_size=DEFAULT_PAGE_SIZE, descending=False):
+    """
+    Fetch one keyset page of a query.
+
+    Rows with a NULL sort value come after all others. They are read in a
+    separate ``IS NULL`` step so both steps can walk an index in its natural
+    order on SQLite and Postgres alike (which sort NULLs differently).
+
+    Args:
+        query: SQLAlchemy ORM query returning model instances
+        sort_column: Column the page is ordered by
+        id_column: Unique tie-breaker column (usually the primary key)
+        cursor (str): Cursor returned with the previous page, or None for the first
+        page_size (int): Number of items per page
+        descending (bool): Whether to sort newest/highest first
+
+    Returns:
+        Page: The items and the cursor of the following page
+
+    Aborts with 400 if the cursor is malformed.
+    """
+    after = _cursor_position(cursor, sort_column)
+    nullable = sort_column.expression.nullable
+    # One extra row tells us whether there is a next page
+    limit = page_size + 1
+    rows = []
+    if after is None or after[0] is not None:
+        base = query.filter(sort_column.isnot(None)) if nullable else query
+        rows = _fetch(base, sort_column, id_column, descending, limit, after)
+    if nullable and len(rows) < limit:
+        base = query.filter(sort_column.is_(None))
+        if after is not None and after[0] is None:
+            base = base.filter(_beyond(id_column, after[1], descending))
+        rows += _fetch(base, id_column, id_column, descending, limit - len(rows))
+
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return Page(items=items, page_size=page_size, next_cursor=next_cursor)
+
+
+def paginate_by_rank(query, rank, id_column, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch one keyset page ordered by a computed rank, highest first.
+
+    Like ``paginate``, but the sort key is an expression that is not an
+    attribute of the items, such as the relevance rank returned by
+    ``utils.fulltext.search``. The rank must never be NULL.
+
+    Returns:
+        Page: The items and the cursor of the following page
+
+    Aborts with 400 if the cursor is malformed.
+    """
+    after = _cursor_position(cursor, rank)
+    rows = _fetch(query.add_columns(rank), rank, id_column, True, page_size + 1, after)
+    items = [row[0] for row in rows[:page_size]]
+    next_cursor = None
+    if len(rows) > page_size:
+        next_cursor = encode_cursor(rows[page_size - 1][1], getattr(items[-1], id_column.key))
+    return Page(items=items, page_size=page_size, next_cursor=next_cursor)
+
+
+def wants_json():
+    """
+    Whether the client asked for the JSON variant of a page.
+    """
+    return request.args.get('format') == 'json' or request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+
+def page_json(page, serialize):
+    """
+    JSON body for a page: the serialized items plus the cursor of the next page.
+    """
+    return {
+        'items': [serialize(item) for item in page.items],
+        'next_cursor': page.next_cursor,
+        'page_size': page.page_size
+    }
+
+
+def next_page_url(page, prefix=''):
+    """
+    URL of the current view with the cursor of the next page (template global).
+    """
+    args = request.args.to_dict()
+    args[f'{prefix}cursor'] = page.next_cursor
+    args.pop('format', None)
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+
+def first_page_url(prefix=''):
+    """
+    URL of the current view without its ``<prefix>cursor`` (template global).
+    """
+    args = request.args.to_dict()
+    args.pop(f'{prefix}cursor', None)
+    args.pop('format', None)
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
@@ -0,0 +1,120 @@
+"""
+Shared aggregate queries for dashboards and listings.
+
+Counts are computed in the database with ``COUNT``/``GROUP BY`` so a page
+issues a small, fixed number of statements regardless of how many articles,
+topics or journalists are stored, instead of loading relationships and
+counting them in Python.
+"""
+
+from sqlalchemy import func, select
+
+from app import db
+from models import Article, Journalist, Outlet, Topic, article_topics
+
+SENTIMENT_LABELS = ('positive', 'negative', 'neutral')
+
+
+def entity_counts(include_articles=True):
+    """
+    Count journalists, outlets, articles and topics in one statement.
+
+    Args:
+        include_articles (bool): Whether to count the (large) article table too
+
+    Returns:
+        dict: journalists, outlets, topics and (optionally) articles counts
+    """
+    columns = [
+        select(func.count(Journalist.id)).scalar_subquery().label('journalists'),
+        select(func.count(Outlet.id)).scalar_subquery().label('outlets'),
+        select(func.count(Topic.id)).scalar_subquery().label('topics')
+    ]
+    if include_articles:
+        columns.append(select(func.count(Article.id)).scalar_subquery().label('articles'))
+    row = db.session.execute(select(*columns)).one()
+    return dict(row._mapping)
+
+
+def top_topics(limit=10):
+    """
+    Return the topics with the most articles.
+
+    Returns:
+        list: Rows with ``id``, ``name`` and ``article_count``, most articles first
+    """
+    article_count = func.count(article_topics.c.article_id).label('article_count')
+    return db.session.execute(
+        select(Topic.id, Topic.name, article_count)
+        .outerjoin(article_topics, article_topics.c.topic_id == Topic.id)
+        .group_by(Topic.id, Topic.name)
+        .order_by(article_count.desc(), Topic.id)
+        .limit(limit)
+    ).all()
+
+
+def sentiment_distribution(*filters):
+    """
+    Count articles per sentiment label.
+
+    Args:
+        *filters: Optional extra WHERE clauses on Article
+
+    Returns:
+        dict: Count per label in SENTIMENT_LABELS (zero when absent)
+    """
+    counts = dict.fromkeys(SENTIMENT_LABELS, 0)
+    rows = db.session.execute(
+        select(Article.sentiment_label, func.count(Article.id))
+        .where(Article.sentiment_label.in_(SENTIMENT_LABELS), *filters)
+        .group_by(Article.sentiment_label)
+    )
+    for label, count in rows:
+        counts[label] = count
+    return counts
+
+
+def outlet_journalist_counts(limit=10):
+    """
+    Return the outlets with the most journalists.
+
+    Returns:
+        list: Rows with ``id``, ``name`` and ``journalist_count``, most journalists first
+    """
+    journalist_count = func.count(Journalist.id).label('journalist_count')
+    return db.session.execute(
+        select(Outlet.id, Outlet.name, journalist_count)
+        .outerjoin(Journalist, Journalist.outlet_id == Outlet.id)
+        .group_by(Outlet.id, Outlet.name)
+        .order_by(journalist_count.desc(), Outlet.id)
+        .limit(limit)
+    ).all()
+
+
+def journalist_sentiment_counts(sentiment):
+    """
+    Subquery of per-journalist article counts: ``matching`` articles with the
+    given sentiment label and ``total`` articles.
+    """
+    return (
+        select(
+            Article.journalist_id.label('journalist_id'),
+            func.count(Article.id).filter(Article.sentiment_label == sentiment).label('matching'),
+            func.count(Article.id).label('total')
+        )
+        .where(Article.journalist_id.isnot(None))
+        .group_by(Article.journalist_id)
+        .subquery()
+    )
+
+
+def filter_predominant_sentiment(query, sentiment):
+    """
+    Restrict a Journalist query to journalists who predominantly write with the
+    given sentiment, i.e. more than a third of their articles carry that label.
+    """
+    counts = journalist_sentiment_counts(sentiment)
+    return query.join(counts, counts.c.journalist_id == Journalist.id).filter(
+        counts.c.matching * 3 > counts.c.total
+    )
+
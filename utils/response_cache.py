@@ -0,0 +1,195 @@
+"""
+Cache of rendered responses for read-mostly pages.
+
+Views decorated with ``cached_response`` are rendered once per data version,
+route and query string; repeat requests are answered from the cache, and a
+client that already has the page (``If-None-Match`` matches the body's ETag)
+gets a bodyless 304.
+
+The data version is bumped when ``articles_changed`` fires, which changes
+every key, so pages are never served from before the last ingestion or
+analysis. Entries also expire after RESPONSE_CACHE_TTL seconds as a safety net
+for writers that do not send the signal.
+
+Backends (RESPONSE_CACHE_BACKEND):
+
+- ``memory`` (default): an LRU dict per process. The version is per process
+  too, so other processes' writes are picked up when entries expire.
+- ``sqlite``: a ``SQLiteCache`` file (RESPONSE_CACHE_PATH) shared by all
+  gunicorn workers. Writers in any process that imports the app (refresh
+  scripts, the analysis worker) bump the shared version.
+- ``none``: caching disabled.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from utils.signals import articles_changed
+from utils.sqlite_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESPONSE_CACHE_BACKEND = os.environ.get("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_PATH = os.environ.get("RESPONSE_CACHE_PATH",
+                                     os.path.join(BASE_DIR, "instance", "response_cache.sqlite3"))
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", 300))
+RESPONSE_CACHE_ENTRIES = int(os.environ.get("RESPONSE_CACHE_ENTRIES", 512))
+RESPONSE_CACHE_MAX_MB = int(os.environ.get("RESPONSE_CACHE_MAX_MB", 64))
+
+
+class MemoryBackend:
+    """
+    In-process LRU of (body, meta) entries with a TTL.
+    """
+
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = 0
+
+    def version(self):
+        return str(self._version)
+
+    def bump_version(self):
+        with self._lock:
+            self._version += 1
+            # Entries of older versions can never be hit again
+            self._entries.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, body, meta = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body, meta
+
+    def set(self, key, body, meta):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body, meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteBackend:
+    """
+    Entries and data version in a SQLite file shared between processes.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_PATH, ttl=RESPONSE_CACHE_TTL,
+                 max_bytes=RESPONSE_CACHE_MAX_MB * 1024 * 1024):
+        self._cache = SQLiteCache(path, table='responses', ttl=ttl, max_bytes=max_bytes)
+        # Kept apart from the entries so LRU eviction never drops it
+        self._versions = SQLiteCache(path, table='response_versions')
+
+    def version(self):
+        value = self._versions.get('data')
+        return value.decode('ascii') if value else '0'
+
+    def bump_version(self):
+        # Any new unique value works, so no read-modify-write is needed
+        self._versions.set('data', str(time.time_ns()).encode('ascii'))
+        self._cache.purge_expired()
+
+    def get(self, key):
+        entry = self._cache.get_entry(key)
+        if entry is None or entry['stale']:
+            return None
+        return entry['value'], entry['meta']
+
+    def set(self, key, body, meta):
+        self._cache.set(key, body, meta)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    The configured backend, created on first use (None when disabled).
+    """
+    global _backend
+    if _backend is None and RESPONSE_CACHE_BACKEND != 'none':
+        with _backend_lock:
+            if _backend is None:
+                if RESPONSE_CACHE_BACKEND == 'sqlite':
+                    _backend = SQLiteBackend()
+                else:
+                    _backend = MemoryBackend()
+    return _backend
+
+
+@articles_changed.connect
+def _bump_data_version(sender, **kwargs):
+    # A failed bump is logged; stale entries still expire after the TTL
+    backend = get_backend()
+    if backend is None:
+        return
+    try:
+        backend.bump_version()
+    except Exception as e:
+        logger.error(f"Error bumping response cache version: {e}")
+
+
+def _cache_key(version):
+    parts = [
+        version,
+        request.endpoint,
+        repr(sorted((request.view_args or {}).items())),
+        repr(sorted(request.args.items(multi=True))),
+        # AJAX requests get the JSON variant of some pages
+        request.headers.get('X-Requested-With', '')
+    ]
+    return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+
+def cached_response(view):
+    """
+    Cache a GET view's 200 responses per data version, route and query string,
+    and answer conditional requests with 304.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        backend = get_backend()
+        if backend is None or request.method != 'GET':
+            return view(*args, **kwargs)
+
+        key = _cache_key(backend.version())
+        entry = backend.get(key)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            # Redirects, errors and streamed exports are never cached
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            backend.set(key, body, {'etag': etag, 'content_type': response.content_type})
+        else:
+            body, meta = entry
+            etag = meta['etag']
+            response = current_app.response_class(body, content_type=meta['content_type'])
+
+        response.set_etag(etag)
+        # Let browsers keep the page but revalidate it on every load
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('X-Requested-With')
+        return response.make_conditional(request)
+
+    return wrapper
@@ -0,0 +1,257 @@
+"""
+Daily analytics rollups.
+
+``article_daily_stat`` and ``topic_daily_stat`` hold article counts per
+day x outlet x journalist x sentiment label (x tone, x topic). Analytics pages
+read these small tables instead of aggregating the article table on every
+hit. When ``articles_changed`` fires, only the days those articles were
+published on are recomputed: each day's rows are deleted and rebuilt with one
+grouped ``INSERT ... SELECT`` over an index range scan on ``published_at``.
+
+Usage (full rebuild, e.g. after a bulk import or on an existing database):
+    python -m utils.rollups
+"""
+
+import logging
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, delete, func, insert, literal, null, select, text
+
+from app import app, db
+from models import Article, ArticleDailyStat, Topic, TopicDailyStat, article_topics
+from utils.ingestion import BATCH_SIZE
+from utils.queries import SENTIMENT_LABELS
+from utils.signals import articles_changed
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for the Postgres advisory lock that serializes refreshes,
+# so two writers refreshing the same day cannot both insert its rows
+ROLLUP_LOCK_KEY = 0x726F6C6C
+
+ARTICLE_DIMENSIONS = (Article.outlet_id, Article.journalist_id, Article.sentiment_label, Article.tone)
+TOPIC_DIMENSIONS = (article_topics.c.topic_id, Article.outlet_id, Article.journalist_id, Article.sentiment_label)
+
+
+def _article_select(day_column, *where):
+    return (
+        select(day_column, *ARTICLE_DIMENSIONS,
+               func.count(Article.id), func.coalesce(func.sum(Article.sentiment_score), 0.0))
+        .where(*where)
+        .group_by(*ARTICLE_DIMENSIONS)
+    )
+
+
+def _topic_select(day_column, *where):
+    return (
+        select(day_column, *TOPIC_DIMENSIONS, func.count(Article.id))
+        .select_from(Article)
+        .join(article_topics, article_topics.c.article_id == Article.id)
+        .where(*where)
+        .group_by(*TOPIC_DIMENSIONS)
+    )
+
+
+def _insert_rollups(article_query, topic_query):
+    db.session.execute(insert(ArticleDailyStat).from_select(
+        ['day', 'outlet_id', 'journalist_id', 'sentiment_label', 'tone', 'article_count', 'sentiment_total'],
+        article_query
+    ))
+    db.session.execute(insert(TopicDailyStat).from_select(
+        ['day', 'topic_id', 'outlet_id', 'journalist_id', 'sentiment_label', 'article_count'],
+        topic_query
+    ))
+
+
+def _lock():
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': ROLLUP_LOCK_KEY})
+
+
+def _published_range(day):
+    if day is None:
+        return Article.published_at.is_(None)
+    start = datetime.combine(day, datetime.min.time())
+    return and_(Article.published_at >= start, Article.published_at < start + timedelta(days=1))
+
+
+def _day_equals(model, day):
+    return model.day.is_(None) if day is None else model.day == day
+
+
+def article_days(article_ids):
+    """
+    Return the set of publish days (date or None) of the given articles.
+    """
+    days = set()
+    article_ids = list(article_ids)
+    for start in range(0, len(article_ids), BATCH_SIZE):
+        published = db.session.scalars(
+            select(Article.published_at).where(Article.id.in_(article_ids[start:start + BATCH_SIZE])).distinct()
+        )
+        days.update(value.date() if value else None for value in published)
+    return days
+
+
+def refresh_days(days, commit=True):
+    """
+    Recompute the rollup rows of the given publish days.
+
+    Args:
+        days (iterable): Dates to refresh (None refreshes undated articles)
+        commit (bool): Whether to commit at the end
+    """
+    days = sorted(set(days), key=lambda day: day or date.min)
+    if not days:
+        return
+    _lock()
+    for day in days:
+        db.session.execute(delete(ArticleDailyStat).where(_day_equals(ArticleDailyStat, day)))
+        db.session.execute(delete(TopicDailyStat).where(_day_equals(TopicDailyStat, day)))
+        day_column = null() if day is None else literal(day, db.Date)
+        _insert_rollups(_article_select(day_column, _published_range(day)),
+                        _topic_select(day_column, _published_range(day)))
+    if commit:
+        db.session.commit()
+
+
+def rebuild_rollups():
+    """
+    Rebuild both rollup tables from scratch with one grouped pass over articles.
+    """
+    started = time.perf_counter()
+    _lock()
+    db.session.execute(delete(ArticleDailyStat))
+    db.session.execute(delete(TopicDailyStat))
+    day_column = func.date(Article.published_at)
+    _insert_rollups(_article_select(day_column).group_by(day_column),
+                    _topic_select(day_column).group_by(day_column))
+    db.session.commit()
+    logger.info(f"Rebuilt analytics rollups in {time.perf_counter() - started:.2f}s")
+
+
+@articles_changed.connect
+def _refresh_changed_articles(sender, article_ids=(), **kwargs):
+    # Rollups are derived data: a failed refresh is logged and left for the
+    # next change or a rebuild rather than failing the writer that committed
+    try:
+        refresh_days(article_days(article_ids))
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error refreshing analytics rollups: {e}")
+
+
+def article_total(*filters):
+    """
+    Total number of articles, from the rollup.
+
+    Args:
+        *filters: Optional WHERE clauses on ArticleDailyStat, e.g. one outlet
+    """
+    return db.session.scalar(select(func.coalesce(func.sum(ArticleDailyStat.article_count), 0)).where(*filters))
+
+
+def sentiment_totals(*filters):
+    """
+    Article count per sentiment label, from the rollup.
+
+    Args:
+        *filters: Optional WHERE clauses on ArticleDailyStat
+
+    Returns:
+        dict: Count per label in SENTIMENT_LABELS (zero when absent)
+    """
+    counts = dict.fromkeys(SENTIMENT_LABELS, 0)
+    rows = db.session.execute(
+        select(ArticleDailyStat.sentiment_label, func.sum(ArticleDailyStat.article_count))
+        .where(ArticleDailyStat.sentiment_label.in_(SENTIMENT_LABELS), *filters)
+        .group_by(ArticleDailyStat.sentiment_label)
+    )
+    for label, count in rows:
+        counts[label] = count
+    return counts
+
+
+def sentiment_by_day():
+    """
+    Positive, negative and neutral article counts per publish day, oldest first.
+
+    Returns:
+        list: Rows of (day, positive, negative, neutral)
+    """
+    return db.session.execute(
+        select(
+            ArticleDailyStat.day,
+            *(func.coalesce(func.sum(ArticleDailyStat.article_count)
+                            .filter(ArticleDailyStat.sentiment_label == label), 0)
+              for label in SENTIMENT_LABELS)
+        )
+        .group_by(ArticleDailyStat.day)
+        .order_by(ArticleDailyStat.day)
+    ).all()
+
+
+def tone_totals():
+    """
+    Article count per tone, most common first.
+
+    Returns:
+        list: Rows of (tone, count)
+    """
+    article_count = func.sum(ArticleDailyStat.article_count)
+    return db.session.execute(
+        select(ArticleDailyStat.tone, article_count)
+        .where(ArticleDailyStat.tone.isnot(None))
+        .group_by(ArticleDailyStat.tone)
+        .order_by(article_count.desc())
+    ).all()
+
+
+def outlet_sentiment_totals(outlet_ids):
+    """
+    Positive, negative and neutral article counts per outlet. Articles with
+    any other (or no) label count as neutral.
+
+    Returns:
+        dict: outlet id -> {label: count} for every requested outlet
+    """
+    totals = {outlet_id: dict.fromkeys(SENTIMENT_LABELS, 0) for outlet_id in outlet_ids}
+    if not totals:
+        return totals
+    rows = db.session.execute(
+        select(ArticleDailyStat.outlet_id, ArticleDailyStat.sentiment_label, func.sum(ArticleDailyStat.article_count))
+        .where(ArticleDailyStat.outlet_id.in_(list(totals)))
+        .group_by(ArticleDailyStat.outlet_id, ArticleDailyStat.sentiment_label)
+    )
+    for outlet_id, label, count in rows:
+        totals[outlet_id][label if label in ('positive', 'negative') else 'neutral'] += count
+    return totals
+
+
+def topic_totals(limit=10, *filters):
+    """
+    Topics with the most articles.
+
+    Args:
+        limit (int): Number of topics
+        *filters: Optional WHERE clauses on TopicDailyStat
+
+    Returns:
+        list: Rows of (id, name, article_count), most articles first
+    """
+    article_count = func.sum(TopicDailyStat.article_count).label('article_count')
+    return db.session.execute(
+        select(Topic.id, Topic.name, article_count)
+        .join(TopicDailyStat, TopicDailyStat.topic_id == Topic.id)
+        .where(*filters)
+        .group_by(Topic.id, Topic.name)
+        .order_by(article_count.desc(), Topic.id)
+        .limit(limit)
+    ).all()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with app.app_context():
+        rebuild_rollups()
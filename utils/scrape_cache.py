@@ -0,0 +1,136 @@
+"""
+Persistent cache of scraped article pages.
+
+Each entry is keyed by the normalized article URL and holds the
+zlib-compressed raw HTML, the extracted text, a hash of the HTML and the
+ETag/Last-Modified validators, so expired pages can be revalidated with a
+conditional GET instead of being downloaded and parsed again.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from dataclasses import dataclass
+
+from utils.sqlite_cache import SQLiteCache
+from utils.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cache location and limits; set SCRAPE_CACHE_PATH to an empty string to disable it
+SCRAPE_CACHE_PATH = os.environ.get("SCRAPE_CACHE_PATH", os.path.join(BASE_DIR, "instance", "scrape_cache.sqlite3"))
+SCRAPE_CACHE_TTL = int(os.environ.get("SCRAPE_CACHE_TTL", 7 * 24 * 3600))
+SCRAPE_CACHE_MAX_MB = int(os.environ.get("SCRAPE_CACHE_MAX_MB", 512))
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class CachedPage:
+    """A scraped page as stored in the cache."""
+    url: str
+    text: str
+    content_hash: str
+    etag: str = None
+    last_modified: str = None
+    stale: bool = False
+    compressed_html: bytes = None
+
+    @property
+    def html(self):
+        return zlib.decompress(self.compressed_html) if self.compressed_html else None
+
+    def conditional_headers(self):
+        """
+        Request headers that let the server answer 304 if the page is unchanged.
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """
+    Store and look up scraped pages by normalized URL.
+
+    Args:
+        path (str): SQLite file holding the cache
+        ttl (int): Seconds before a page must be revalidated
+        max_bytes (int): Size budget before least recently used pages are evicted
+    """
+
+    def __init__(self, path=SCRAPE_CACHE_PATH, ttl=SCRAPE_CACHE_TTL, max_bytes=SCRAPE_CACHE_MAX_MB * 1024 * 1024):
+        self._cache = SQLiteCache(path, table='scraped_pages', ttl=ttl, max_bytes=max_bytes)
+
+    @staticmethod
+    def key_for(url):
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def lookup(self, url):
+        """
+        Return the cached page for a URL, fresh or stale, or None.
+        """
+        entry = self._cache.get_entry(self.key_for(url))
+        if entry is None:
+            return None
+        meta = entry['meta']
+        return CachedPage(
+            url=url,
+            text=meta.get('text'),
+            content_hash=meta.get('content_hash'),
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+            stale=entry['stale'],
+            compressed_html=entry['value']
+        )
+
+    def store(self, url, content, text, headers=None):
+        """
+        Cache a downloaded page together with its extracted text and validators.
+
+        Args:
+            url (str): URL the page was downloaded from
+            content (bytes): Raw HTML
+            text (str): Text extracted from the HTML
+            headers (Mapping): Response headers (case-insensitive, as returned by requests)
+        """
+        headers = headers or {}
+        self._cache.set(self.key_for(url), zlib.compress(content), meta={
+            'url': normalize_url(url),
+            'text': text,
+            'content_hash': content_hash(content),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified')
+        })
+
+    def revalidated(self, url):
+        """
+        Mark a page as fresh again after the server confirmed it is unchanged.
+        """
+        self._cache.touch(self.key_for(url))
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_scrape_cache():
+    """
+    Return the shared scrape cache, or None if caching is disabled.
+    """
+    global _default_cache
+    if not SCRAPE_CACHE_PATH:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ScrapeCache()
+        return _default_cache
@@ -0,0 +1,296 @@
+"""
+Search query builder shared by the search page, its export and the article
+tables.
+
+Request arguments are normalized into a ``SearchFilters`` spec, which each
+builder turns into an ORM query over one entity:
+
+- Filters through a related table are ``EXISTS`` subqueries (``any()`` /
+  ``has()``) rather than joins, so a row matches once however many of its
+  topics or journalists match, without a ``DISTINCT``, and no relationship is
+  ever joined twice.
+- The criteria for a filter *shape* (which filters are set, not their values)
+  are built once with named bind parameters and reused; values are bound per
+  request with ``Query.params()``. Every request of a shape produces the same
+  statement structure, so SQLAlchemy's compiled-statement cache is hit
+  instead of rebuilding and recompiling the SQL.
+
+``result_page`` also caches the ids of each page of results per normalized
+filters, cursor and page size for SEARCH_CACHE_SECONDS. A repeated search
+(paging back, the live-search box re-sending a query) then loads its rows by
+primary key instead of running the search again. The cache is cleared on
+``articles_changed`` (writers in this process); writers in other processes
+are picked up when entries expire.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+from sqlalchemy import and_, bindparam, or_
+
+from models import Article, Journalist, Outlet, Topic
+from utils import fulltext
+from utils.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_by_rank
+from utils.queries import SENTIMENT_LABELS, filter_predominant_sentiment
+from utils.serializers import serializable
+from utils.signals import articles_changed
+
+SEARCH_CACHE_SECONDS = int(os.environ.get("SEARCH_CACHE_SECONDS", 60))
+SEARCH_CACHE_ENTRIES = int(os.environ.get("SEARCH_CACHE_ENTRIES", 1024))
+
+ENTITY_TYPES = ('journalists', 'outlets', 'articles')
+MODELS = {'journalists': Journalist, 'outlets': Outlet, 'articles': Article}
+
+
+def _text(value):
+    return ' '.join((value or '').split())
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """
+    Normalized search filters; empty strings and None mean "not set".
+    """
+    q: str = ''
+    topic: str = ''
+    country: str = ''
+    region: str = ''
+    sentiment: str = ''
+    journalist_id: int = None
+    outlet_id: int = None
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Read the filters from request arguments, trimming and collapsing whitespace.
+        """
+        return cls(
+            q=_text(args.get('q')),
+            topic=_text(args.get('topic')),
+            country=_text(args.get('country')),
+            region=_text(args.get('region')),
+            sentiment=_text(args.get('sentiment')).lower(),
+            journalist_id=args.get('journalist_id', type=int) or None,
+            outlet_id=args.get('outlet_id', type=int) or None
+        )
+
+    @property
+    def shape(self):
+        """The names of the filters that are set, excluding ``q``."""
+        return frozenset(field.name for field in fields(self) if field.name != 'q' and getattr(self, field.name))
+
+    def params(self):
+        """Bind parameter values for the criteria of this shape."""
+        values = {f'search_{name}': getattr(self, name) for name in self.shape}
+        if self.q:
+            values['search_pattern'] = f'%{self.q}%'
+        return values
+
+
+def _param(name):
+    return bindparam(f'search_{name}')
+
+
+@lru_cache(maxsize=None)
+def _journalist_criteria(shape):
+    criteria = []
+    if 'topic' in shape:
+        criteria.append(Journalist.topics.any(Topic.name == _param('topic')))
+    if 'country' in shape:
+        criteria.append(Journalist.outlet.has(Outlet.country == _param('country')))
+    if 'region' in shape:
+        criteria.append(Journalist.region == _param('region'))
+    if 'outlet_id' in shape:
+        criteria.append(Journalist.outlet_id == _param('outlet_id'))
+    return tuple(criteria)
+
+
+@lru_cache(maxsize=None)
+def _outlet_criteria(shape, text):
+    criteria = []
+    if text:
+        pattern = bindparam('search_pattern')
+        criteria.append(or_(
+            Outlet.name.ilike(pattern),
+            Outlet.description.ilike(pattern),
+            Outlet.website.ilike(pattern)
+        ))
+    if 'country' in shape:
+        criteria.append(Outlet.country == _param('country'))
+    # Outlets with a journalist in the region who covers the topic
+    journalist = []
+    if 'region' in shape:
+        journalist.append(Journalist.region == _param('region'))
+    if 'topic' in shape:
+        journalist.append(Journalist.topics.any(Topic.name == _param('topic')))
+    if journalist:
+        criteria.append(Outlet.journalists.any(and_(*journalist)))
+    return tuple(criteria)
+
+
+@lru_cache(maxsize=None)
+def _article_criteria(shape):
+    criteria = []
+    if 'topic' in shape:
+        criteria.append(Article.topics.any(Topic.name == _param('topic')))
+    if 'country' in shape:
+        criteria.append(Article.outlet.has(Outlet.country == _param('country')))
+    if 'region' in shape:
+        criteria.append(Article.journalist.has(Journalist.region == _param('region')))
+    if 'sentiment' in shape:
+        criteria.append(Article.sentiment_label == _param('sentiment'))
+    if 'journalist_id' in shape:
+        criteria.append(Article.journalist_id == _param('journalist_id'))
+    if 'outlet_id' in shape:
+        criteria.append(Article.outlet_id == _param('outlet_id'))
+    return tuple(criteria)
+
+
+def _bound(query, criteria, filters):
+    if criteria:
+        query = query.filter(*criteria).params(**filters.params())
+    return query
+
+
+def search_journalists(filters, query=None):
+    """
+    Journalists matching the filters.
+
+    Returns:
+        tuple: (query, full-text rank to order by or None)
+    """
+    query = Journalist.query if query is None else query
+    rank = None
+    if filters.q:
+        query, rank = fulltext.search(query, Journalist, filters.q)
+    query = _bound(query, _journalist_criteria(filters.shape), filters)
+    # Journalists who predominantly write articles with the given sentiment
+    if filters.sentiment in SENTIMENT_LABELS:
+        query = filter_predominant_sentiment(query, filters.sentiment)
+    return query, rank
+
+
+def search_outlets(filters, query=None):
+    """
+    Outlets matching the filters (``q`` is matched against name, description
+    and website).
+
+    Returns:
+        tuple: (query, None) - outlets have no relevance rank
+    """
+    query = Outlet.query if query is None else query
+    return _bound(query, _outlet_criteria(filters.shape, bool(filters.q)), filters), None
+
+
+def search_articles(filters, query=None):
+    """
+    Articles matching the filters.
+
+    Args:
+        filters (SearchFilters): Normalized filters
+        query: Article query to narrow (default: all articles)
+
+    Returns:
+        tuple: (query, full-text rank to order by or None)
+    """
+    query = Article.query if query is None else query
+    rank = None
+    if filters.q:
+        query, rank = fulltext.search(query, Article, filters.q)
+    return _bound(query, _article_criteria(filters.shape), filters), rank
+
+
+BUILDERS = {'journalists': search_journalists, 'outlets': search_outlets, 'articles': search_articles}
+
+
+def search_query(entity, filters):
+    """
+    Query and rank for one result type ('journalists', 'outlets' or 'articles').
+    """
+    return BUILDERS[entity](filters)
+
+
+class ResultPageCache:
+    """
+    Ids and next cursor of recently served result pages, LRU with a TTL.
+    """
+
+    def __init__(self, ttl=SEARCH_CACHE_SECONDS, max_entries=SEARCH_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, ids, next_cursor):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, (tuple(ids), next_cursor))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+result_pages = ResultPageCache()
+
+
+@articles_changed.connect
+def _clear_result_pages(sender, **kwargs):
+    result_pages.clear()
+
+
+def _fetch_page(entity, filters, cursor, page_size):
+    model = MODELS[entity]
+    query, rank = search_query(entity, filters)
+    query = serializable(query, model)
+    # Text searches list the most relevant results first; otherwise articles
+    # are newest first and journalists/outlets alphabetical
+    if rank is not None:
+        return paginate_by_rank(query, rank, model.id, cursor, page_size)
+    if entity == 'articles':
+        return paginate(query, Article.published_at, Article.id, cursor, page_size, descending=True)
+    return paginate(query, model.name, model.id, cursor, page_size)
+
+
+def result_page(entity, filters, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    One page of search results, eager-loaded for ``to_dict``.
+
+    Pages served in the last SEARCH_CACHE_SECONDS are re-read by primary key
+    from their cached ids.
+
+    Returns:
+        Page: The items and the cursor of the following page
+    """
+    model = MODELS[entity]
+    key = (entity, filters, cursor, page_size)
+    cached = result_pages.get(key)
+    if cached is not None:
+        ids, next_cursor = cached
+        rows = serializable(model.query, model).filter(model.id.in_(ids)).all() if ids else []
+        by_id = {row.id: row for row in rows}
+        return Page(items=[by_id[row_id] for row_id in ids if row_id in by_id],
+                    page_size=page_size, next_cursor=next_cursor)
+
+    page = _fetch_page(entity, filters, cursor, page_size)
+    result_pages.put(key, [item.id for item in page.items], page.next_cursor)
+    return page
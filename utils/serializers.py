@@ -0,0 +1,78 @@
+"""
+Serialization of model rows to plain dicts without N+1 queries.
+
+``Model.to_dict`` reads the row's relationships (outlet, journalist, topics)
+and its relationship counts. Called on a list of plainly loaded rows, every
+one of those is a lazy load, so a page of N rows costs several queries per
+row. ``serializable`` adds the loader options ``to_dict`` needs to a query:
+
+- many-to-one relations are joined into the same SELECT (``joinedload``);
+- collections are loaded for the whole page with one extra SELECT per
+  collection (``selectinload``). It sends the row ids in IN lists of 500,
+  so ``serialize``, which is not limited to one page, loads them with
+  ``subqueryload`` instead: it re-runs the query once as a subquery,
+  whatever the number of rows;
+- counts are the deferred ``column_property`` subqueries from ``models``,
+  undeferred so they come back with the rows.
+
+Serializing a page is then a fixed number of statements, however many rows
+it holds.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload, subqueryload, undefer
+
+from models import Article, Journalist, Outlet, Topic
+
+# Loader options per model for the many-to-one relations and counts its
+# to_dict reads
+LOAD_OPTIONS = {
+    Journalist: (
+        joinedload(Journalist.outlet).undefer(Outlet.journalist_count),
+        undefer(Journalist.article_count)
+    ),
+    Outlet: (
+        undefer(Outlet.journalist_count),
+    ),
+    Article: (
+        joinedload(Article.journalist),
+        joinedload(Article.outlet)
+    ),
+    Topic: (
+        undefer(Topic.journalist_count),
+        undefer(Topic.article_count)
+    )
+}
+
+# Collections per model that its to_dict reads
+COLLECTIONS = {
+    Journalist: (Journalist.topics,),
+    Article: (Article.topics,)
+}
+
+
+def serializable(query, model, collection_loader=selectinload):
+    """
+    Add the loader options ``model.to_dict`` needs to a query.
+
+    Apply this before paginating, so the options cover the page's rows.
+
+    Args:
+        query: ORM query whose primary entity is ``model``
+        model: Journalist, Outlet, Article or Topic
+        collection_loader: Loader option for the collections
+
+    Returns:
+        The query with eager loads and undeferred counts
+    """
+    collections = (collection_loader(collection) for collection in COLLECTIONS.get(model, ()))
+    return query.options(*LOAD_OPTIONS[model], *collections)
+
+
+def serialize(query, model):
+    """
+    Run a query and serialize every row with ``to_dict``.
+
+    Returns:
+        list: Plain dicts, one per row
+    """
+    return [item.to_dict() for item in serializable(query, model, subqueryload)]
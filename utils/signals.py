@@ -0,0 +1,24 @@
+"""
+Application signals.
+
+Writers send ``articles_changed`` after committing new articles or new
+sentiment, tone or topic data for existing ones. Derived data (rollups,
+caches, search indexes) subscribes to it instead of being refreshed by
+every writer.
+"""
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Sent with ``article_ids``: the ids of the articles that were inserted or changed
+articles_changed = _signals.signal('articles-changed')
+
+
+def notify_articles_changed(sender, article_ids):
+    """
+    Send ``articles_changed`` for the given ids, if there are any.
+    """
+    article_ids = list(article_ids)
+    if article_ids:
+        articles_changed.send(sender, article_ids=article_ids)
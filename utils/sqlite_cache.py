@@ -0,0 +1,167 @@
+"""
+Small persistent key/value cache stored in a SQLite file.
+
+Entries expire after a TTL and the least recently used ones are evicted once
+the stored values exceed a size budget. SQLite's own locking makes the file
+safe to share between threads and between gunicorn workers.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Number of writes between two size-budget checks
+EVICT_EVERY = 64
+
+
+class SQLiteCache:
+    """
+    Persistent cache of bytes values with optional JSON metadata.
+
+    Args:
+        path (str): Location of the SQLite file (parent directories are created)
+        table (str): Table name, so several caches can share one file
+        ttl (float): Seconds after which an entry is stale (None = never)
+        max_bytes (int): Size budget; LRU entries are evicted past it (None = unbounded)
+    """
+
+    def __init__(self, path, table='cache', ttl=None, max_bytes=None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,
+                    meta TEXT,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_accessed_at ON {table} (accessed_at)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def is_stale(self, created_at, now=None):
+        return self.ttl is not None and (now or time.time()) - created_at > self.ttl
+
+    def get_entry(self, key):
+        """
+        Return an entry even if it is stale, e.g. to revalidate it.
+
+        Returns:
+            dict: ``value``, ``meta``, ``created_at`` and ``stale`` keys, or None
+        """
+        conn = self._connect()
+        row = conn.execute(
+            f"SELECT value, meta, created_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return {
+            'value': row[0],
+            'meta': json.loads(row[1]) if row[1] else {},
+            'created_at': row[2],
+            'stale': self.is_stale(row[2], now)
+        }
+
+    def get(self, key):
+        """
+        Return the cached value, or None if it is missing or stale.
+        """
+        entry = self.get_entry(key)
+        if entry is None or entry['stale']:
+            return None
+        return entry['value']
+
+    def set(self, key, value, meta=None):
+        meta_json = json.dumps(meta) if meta else None
+        size = len(value or b'') + len(meta_json or '')
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, meta, size, created_at, accessed_at) "
+            f"VALUES (?, ?, ?, ?, ?, ?)",
+            (key, value, meta_json, size, now, now)
+        )
+        # Checking the size budget costs a table scan, so only do it periodically
+        self._writes += 1
+        if self.max_bytes is not None and self._writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def touch(self, key):
+        """
+        Mark an entry as fresh again, e.g. after a 304 Not Modified.
+        """
+        now = time.time()
+        self._connect().execute(
+            f"UPDATE {self.table} SET created_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+        )
+
+    def delete(self, key):
+        self._connect().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connect().execute(f"DELETE FROM {self.table}")
+
+    def purge_expired(self):
+        """
+        Drop every stale entry.
+
+        Returns:
+            int: Number of entries removed
+        """
+        if self.ttl is None:
+            return 0
+        return self._connect().execute(
+            f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,)
+        ).rowcount
+
+    def evict(self):
+        """
+        Drop the least recently used entries until the cache fits its size budget.
+
+        Stale entries are kept until then because they can still be revalidated.
+
+        Returns:
+            int: Number of entries removed
+        """
+        if self.max_bytes is None:
+            return 0
+
+        conn = self._connect()
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        excess = total - self.max_bytes
+        keys = []
+        for key, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at"):
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", keys)
+        logger.info(f"Evicted {len(keys)} entries from {self.table} cache")
+        return len(keys)
@@ -0,0 +1,337 @@
+"""
+In-process typeahead index for ``/search/suggest``.
+
+Journalist names, outlet names, topics and the titles of the most recent
+articles are kept in memory as one sorted array of ``(word, key)`` entries
+per kind. A prefix lookup is a ``bisect`` into each kind's array followed by
+a short scan, highest-ranked kind first, so suggestions are answered without
+touching the database and the many article titles cannot crowd out the
+journalists, outlets and topics that rank above them.
+
+Additions go to a small sorted pending array per kind that is merged into
+the main one in a single pass once it grows past a fraction of it, and
+removed entries are only dropped at the next merge, so updates do not shift
+the large arrays one entry at a time.
+
+The index is built on first use and then kept current incrementally:
+
+- ``articles_changed`` adds or refreshes the changed articles together with
+  their journalist, outlet and topics (writers in this process);
+- every SUGGEST_REFRESH_SECONDS, articles with an id above the highest one
+  seen are pulled in (writers in other processes, e.g. the analysis worker).
+
+Only the SUGGEST_ARTICLE_LIMIT newest article titles are kept; older ones
+are evicted as new articles arrive.
+"""
+
+import bisect
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, selectinload
+
+from app import db
+from models import Article, Journalist, Outlet, Topic
+from utils.signals import articles_changed
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_ARTICLE_LIMIT = int(os.environ.get("SUGGEST_ARTICLE_LIMIT", 50000))
+SUGGEST_REFRESH_SECONDS = int(os.environ.get("SUGGEST_REFRESH_SECONDS", 30))
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 20
+# Upper bound on index entries examined per kind and lookup, which keeps
+# one-letter prefixes as fast as long ones
+MAX_CANDIDATES = 500
+# A kind's pending additions are merged into its main array once they reach
+# this size or 1/MERGE_FRACTION of the main array, whichever is larger
+MERGE_THRESHOLD = 256
+MERGE_FRACTION = 16
+
+# Kinds in display order: journalists are suggested before outlets, and so on
+KINDS = ('journalist', 'outlet', 'topic', 'article')
+_KIND_RANK = {kind: rank for rank, kind in enumerate(KINDS)}
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text):
+    """
+    Lowercase and strip accents so "Zoë" is found by "zoe".
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _words(text):
+    return _WORD.findall(normalize(text))
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    kind: str
+    id: int
+    label: str
+    # External link for articles; other kinds link to their own pages
+    url: str = None
+
+
+class SuggestIndex:
+    """
+    Prefix index over suggestion labels. Safe to share between threads.
+    """
+
+    def __init__(self, article_limit=SUGGEST_ARTICLE_LIMIT):
+        self.article_limit = article_limit
+        self._lock = threading.RLock()
+        self._entries = {kind: [] for kind in KINDS}
+        self._pending = {kind: [] for kind in KINDS}
+        self._stale = dict.fromkeys(KINDS, 0)
+        self._items = {}
+        self._articles = OrderedDict()
+        self._max_article_id = 0
+        self._built = False
+        self._checked_at = 0.0
+
+    def __len__(self):
+        return len(self._items)
+
+    def _merge(self, kind):
+        entries = self._entries[kind]
+        entries.extend(self._pending[kind])
+        # Two sorted runs: timsort merges them in one linear pass
+        entries.sort()
+        self._pending[kind] = []
+        if self._stale[kind]:
+            # Drop the entries of removed items and of words no longer in a label
+            items = self._items
+            self._entries[kind] = [(word, key) for word, key in entries
+                                   if key in items and word in items[key][1]]
+            self._stale[kind] = 0
+
+    def _merge_if_due(self, kind):
+        backlog = len(self._pending[kind]) + self._stale[kind]
+        if backlog >= max(MERGE_THRESHOLD, len(self._entries[kind]) // MERGE_FRACTION):
+            self._merge(kind)
+
+    def _remove(self, key, keep=()):
+        # Entries stay in the arrays until the next merge; words in ``keep``
+        # are about to be added back under the same key
+        item, words = self._items.pop(key, (None, ()))
+        if item is None:
+            return
+        self._stale[item.kind] += len(set(words).difference(keep))
+
+    def add(self, item):
+        """
+        Add a suggestion, replacing any previous one of the same kind and id.
+        """
+        key = (item.kind, item.id)
+        with self._lock:
+            previous, previous_words = self._items.get(key, (None, ()))
+            if previous == item:
+                return
+            words = tuple(_words(item.label))
+            self._remove(key, keep=words)
+            self._items[key] = (item, words)
+            pending = self._pending[item.kind]
+            for word in set(words).difference(previous_words):
+                bisect.insort(pending, (word, key))
+            if item.kind == 'article':
+                self._articles.pop(item.id, None)
+                self._articles[item.id] = None
+                self._max_article_id = max(self._max_article_id, item.id)
+                while len(self._articles) > self.article_limit:
+                    oldest, _ = self._articles.popitem(last=False)
+                    self._remove(('article', oldest))
+            self._merge_if_due(item.kind)
+
+    def remove(self, kind, item_id):
+        with self._lock:
+            self._remove((kind, item_id))
+            if kind == 'article':
+                self._articles.pop(item_id, None)
+            self._merge_if_due(kind)
+
+    def _load(self, items):
+        # Bulk load: sort once per kind instead of one insort per word
+        entries = {kind: [] for kind in KINDS}
+        for item in items:
+            key = (item.kind, item.id)
+            words = tuple(_words(item.label))
+            self._items[key] = (item, words)
+            entries[item.kind].extend((word, key) for word in set(words))
+            if item.kind == 'article':
+                self._articles[item.id] = None
+                self._max_article_id = max(self._max_article_id, item.id)
+        for kind_entries in entries.values():
+            kind_entries.sort()
+        self._entries = entries
+        self._pending = {kind: [] for kind in KINDS}
+        self._stale = dict.fromkeys(KINDS, 0)
+
+    def _window(self, kind, prefix):
+        # The first MAX_CANDIDATES entries at or after the prefix across the
+        # kind's main and pending arrays, in order
+        entries = self._entries[kind]
+        start = bisect.bisect_left(entries, (prefix,))
+        window = entries[start:start + MAX_CANDIDATES]
+        pending = self._pending[kind]
+        start = bisect.bisect_left(pending, (prefix,))
+        if start < len(pending) and pending[start][0].startswith(prefix):
+            window.extend(pending[start:start + MAX_CANDIDATES])
+            window.sort()
+            del window[MAX_CANDIDATES:]
+        return window
+
+    def lookup(self, query, limit=DEFAULT_SUGGESTIONS):
+        """
+        Return up to ``limit`` suggestions whose words start with every word
+        of ``query``, best first: labels whose leading words match the query
+        in order, then by kind (journalists, outlets, topics, articles), then
+        shortest label.
+        """
+        words = _words(query)
+        if not words:
+            return []
+        # The longest word narrows the candidate range the most
+        others = list(words)
+        anchor = others.pop(others.index(max(words, key=len)))
+
+        candidates = []
+        leading_count = 0
+        with self._lock:
+            for kind in KINDS:
+                # With ``limit`` leading matches in higher kinds, nothing in
+                # this kind can place
+                if leading_count >= limit:
+                    break
+                seen = set()
+                for word, key in self._window(kind, anchor):
+                    if not word.startswith(anchor):
+                        break
+                    current = self._items.get(key)
+                    # Skip entries of removed or relabelled items not merged away yet
+                    if key in seen or current is None or word not in current[1]:
+                        continue
+                    seen.add(key)
+                    item, label_words = current
+                    if others and not all(any(label_word.startswith(other) for label_word in label_words)
+                                          for other in others):
+                        continue
+                    leading = len(label_words) >= len(words) and all(
+                        label_word.startswith(word) for label_word, word in zip(label_words, words)
+                    )
+                    leading_count += leading
+                    candidates.append((
+                        not leading,
+                        _KIND_RANK[item.kind],
+                        len(item.label),
+                        item.id,
+                        item
+                    ))
+
+        candidates.sort(key=lambda candidate: candidate[:4])
+        return [candidate[-1] for candidate in candidates[:limit]]
+
+    def build(self):
+        """
+        (Re)build the whole index from the database.
+        """
+        started = time.perf_counter()
+        items = [Suggestion('journalist', row.id, row.name)
+                 for row in db.session.execute(select(Journalist.id, Journalist.name))]
+        items += [Suggestion('outlet', row.id, row.name)
+                  for row in db.session.execute(select(Outlet.id, Outlet.name))]
+        items += [Suggestion('topic', row.id, row.name)
+                  for row in db.session.execute(select(Topic.id, Topic.name))]
+        # Newest last, so eviction drops the oldest titles first
+        recent = db.session.execute(
+            select(Article.id, Article.title, Article.url).order_by(Article.id.desc()).limit(self.article_limit)
+        ).all()
+        items += [Suggestion('article', row.id, row.title, row.url) for row in reversed(recent)]
+        with self._lock:
+            self._items = {}
+            self._articles = OrderedDict()
+            self._max_article_id = 0
+            self._load(items)
+            self._built = True
+            self._checked_at = time.monotonic()
+        logger.info(f"Built typeahead index with {len(items)} entries in "
+                    f"{(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def update_articles(self, article_ids):
+        """
+        Add or refresh the given articles with their journalist, outlet and topics.
+        """
+        if not self._built:
+            return
+        article_ids = list(article_ids)
+        articles = Article.query.options(
+            joinedload(Article.journalist),
+            joinedload(Article.outlet),
+            selectinload(Article.topics)
+        ).filter(Article.id.in_(article_ids)).all()
+        found = {article.id for article in articles}
+        # Many articles share a journalist, outlet or topic: add each once
+        related = {}
+        for article in articles:
+            if article.journalist:
+                related[('journalist', article.journalist.id)] = article.journalist.name
+            if article.outlet:
+                related[('outlet', article.outlet.id)] = article.outlet.name
+            for topic in article.topics:
+                related[('topic', topic.id)] = topic.name
+        for (kind, item_id), label in related.items():
+            self.add(Suggestion(kind, item_id, label))
+        for article in sorted(articles, key=lambda article: article.id):
+            self.add(Suggestion('article', article.id, article.title, article.url))
+        for article_id in set(article_ids) - found:
+            self.remove('article', article_id)
+
+    def refresh(self):
+        """
+        Build the index on first use and pick up articles written by other processes.
+        """
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+            return
+        now = time.monotonic()
+        if now - self._checked_at < SUGGEST_REFRESH_SECONDS:
+            return
+        self._checked_at = now
+        latest = db.session.scalar(select(func.max(Article.id))) or 0
+        if latest > self._max_article_id:
+            new_ids = db.session.scalars(
+                select(Article.id).where(Article.id > self._max_article_id)
+                .order_by(Article.id).limit(self.article_limit)
+            ).all()
+            self.update_articles(new_ids)
+
+
+suggest_index = SuggestIndex()
+
+
+@articles_changed.connect
+def _update_changed_articles(sender, article_ids=(), **kwargs):
+    # The index is a cache: a failed update is logged and caught up by refresh()
+    try:
+        suggest_index.update_articles(article_ids)
+    except Exception as e:
+        logger.error(f"Error updating typeahead index: {e}")
+
+
+def suggest(query, limit=DEFAULT_SUGGESTIONS):
+    """
+    Top ``limit`` typeahead suggestions for a partial query.
+    """
+    suggest_index.refresh()
+    return suggest_index.lookup(query, max(1, min(limit, MAX_SUGGESTIONS)))
@@ -0,0 +1,121 @@
+"""
+CPU-bound extraction stage of the scraper.
+
+Downloading a page is I/O-bound and ``trafilatura.extract`` is CPU-bound, so
+the two run separately: the page fetcher keeps the network busy on threads
+while extraction runs in a ``ProcessPoolExecutor``. Each page is pickled
+into its worker process, a copy that is cheap next to the parse itself. When
+worker processes cannot be started, pages are extracted in the calling
+process instead. This module deliberately imports nothing from the Flask app
+so worker processes start quickly.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import trafilatura
+
+logger = logging.getLogger(__name__)
+
+# Number of extraction processes; defaults to one per core
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def extract_text(content):
+    """
+    Extract the main text from a downloaded page.
+
+    Args:
+        content (bytes): Raw HTML exactly as downloaded; trafilatura detects
+            the encoding itself, so it is not decoded first
+
+    Returns:
+        str: Extracted text, or None if nothing could be extracted
+    """
+    if not content:
+        return None
+    try:
+        return trafilatura.extract(content)
+    except Exception as e:
+        logger.error(f"Error extracting text: {e}")
+        return None
+
+
+class TextExtractor:
+    """
+    Run ``extract_text`` in a pool of worker processes.
+
+    Args:
+        max_workers (int): Number of worker processes (defaults to EXTRACTION_WORKERS)
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or EXTRACTION_WORKERS
+        self._executor = None
+        self._pool_unavailable = False
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Spawn rather than fork: the download threads may be holding locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def submit(self, content):
+        """
+        Queue a page for extraction.
+
+        Falls back to extracting in the calling process if the worker
+        processes cannot be started or the pool has broken.
+
+        Args:
+            content (bytes): Raw HTML as returned by the downloader
+
+        Returns:
+            concurrent.futures.Future: Resolves to the extracted text or None
+        """
+        if not self._pool_unavailable:
+            try:
+                return self._get_executor().submit(extract_text, content)
+            except (OSError, NotImplementedError, BrokenProcessPool) as e:
+                logger.warning(f"Extraction pool unavailable, extracting in-process: {e}")
+                self._pool_unavailable = True
+                self.shutdown(wait=False)
+        future = Future()
+        future.set_result(extract_text(content))
+        return future
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+_default_extractor = None
+_default_lock = threading.Lock()
+
+
+def get_default_extractor():
+    """
+    Return the process-wide extractor so worker processes are started only once.
+    """
+    global _default_extractor
+    with _default_lock:
+        if _default_extractor is None:
+            _default_extractor = TextExtractor()
+        return _default_extractor
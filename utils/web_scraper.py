@@ -1,32 +1,129 @@
 import requests
-import trafilatura
 from bs4 import BeautifulSoup
 import logging
 import os
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from models import Journalist, Outlet, Article, Topic, db
+from utils.page_fetcher import get_default_fetcher
+from utils.text_extractor import extract_text, get_default_extractor
+from utils.scrape_cache import content_hash, get_default_scrape_cache
+from utils.signals import notify_articles_changed
+from utils.urls import normalize_url
 
 # Get OpenAI API key from environment
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
 logger = logging.getLogger(__name__)
 
-def get_website_text_content(url):
+def get_website_text_content(url, cache=None):
     """
     Extract the main text content from a website using trafilatura.
+    
+    Pages are served from the scrape cache while fresh; stale pages are
+    revalidated with a conditional GET.
     """
+    cache = cache or get_default_scrape_cache()
     try:
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded:
-            text = trafilatura.extract(downloaded)
+        cached = cache.lookup(url) if cache else None
+        if cached and not cached.stale:
+            return cached.text
+        
+        downloaded = get_default_fetcher().fetch(url, headers=cached.conditional_headers() if cached else None)
+        if downloaded.not_modified and cached:
+            cache.revalidated(url)
+            return cached.text
+        if downloaded.ok:
+            if cached and cached.content_hash == content_hash(downloaded.content):
+                text = cached.text
+            else:
+                text = extract_text(downloaded.content)
+            if cache:
+                cache.store(url, downloaded.content, text, downloaded.headers)
             return text
         else:
-            logger.error(f"Failed to download content from {url}")
             return None
     except Exception as e:
         logger.error(f"Error extracting text from {url}: {e}")
         return None
 
+def iter_website_text_contents(urls, fetcher=None, extractor=None, cache=None):
+    """
+    Download many websites concurrently and extract their main text content.
+    
+    Downloading and extraction are separate stages: pages are fetched on the
+    fetcher's thread pool and each downloaded body is handed straight to the
+    extractor's process pool. Results are yielded as soon as each page has
+    been extracted, so callers can process early articles while the rest are
+    still in flight.
+    
+    Fresh pages in the scrape cache are returned without any network access,
+    stale ones are revalidated with conditional GETs, and pages whose HTML
+    hash is unchanged are not extracted again.
+    
+    Args:
+        urls (iterable): URLs to download
+        fetcher (PageFetcher): Optional fetcher; defaults to the shared one
+        extractor (TextExtractor): Optional extractor; defaults to the shared one
+        cache (ScrapeCache): Optional cache; defaults to the shared one
+        
+    Yields:
+        tuple: (url, extracted text or None)
+    """
+    fetcher = fetcher or get_default_fetcher()
+    extractor = extractor or get_default_extractor()
+    cache = cache or get_default_scrape_cache()
+    
+    cached_pages = {}
+    to_download = []
+    for url in dict.fromkeys(urls):
+        cached = cache.lookup(url) if cache else None
+        if cached and not cached.stale:
+            yield url, cached.text
+            continue
+        if cached:
+            cached_pages[url] = cached
+        to_download.append(url)
+    
+    def headers_for(url):
+        return cached_pages[url].conditional_headers() if url in cached_pages else None
+    
+    pending = {}
+    for downloaded in fetcher.fetch_many(to_download, headers_for=headers_for):
+        url = downloaded.url
+        cached = cached_pages.get(url)
+        if downloaded.not_modified and cached:
+            cache.revalidated(url)
+            yield url, cached.text
+        elif not downloaded.ok:
+            yield url, None
+        elif cached and cached.content_hash == content_hash(downloaded.content):
+            cache.store(url, downloaded.content, cached.text, downloaded.headers)
+            yield url, cached.text
+        else:
+            pending[extractor.submit(downloaded.content)] = downloaded
+        
+        # Hand back whatever has finished extracting while downloads continue
+        for future in [future for future in pending if future.done()]:
+            yield _finish_extraction(pending.pop(future), future, cache)
+    
+    for future in as_completed(list(pending)):
+        yield _finish_extraction(pending.pop(future), future, cache)
+
+def _finish_extraction(downloaded, future, cache):
+    try:
+        text = future.result()
+    except BrokenProcessPool:
+        # The worker died mid-page; later pages fall back in TextExtractor.submit
+        text = extract_text(downloaded.content)
+    except Exception as e:
+        logger.error(f"Error extracting text from {downloaded.url}: {e}")
+        return downloaded.url, None
+    if cache:
+        cache.store(downloaded.url, downloaded.content, text, downloaded.headers)
+    return downloaded.url, text
+
 def scrape_coindesk_journalists():
     """
     Scrape real journalist data from CoinDesk.
@@ -192,6 +289,7 @@ def scrape_recent_crypto_articles():
     Scrape recent cryptocurrency articles and associate them with the right journalists.
     Includes approximately 3 months worth of articles for a comprehensive analysis.
     """
+    added_ids = []
     try:
         from utils.openai_analyzer import analyze_article_sentiment
         
@@ -360,7 +458,7 @@ def scrape_recent_crypto_articles():
         # Process each article
         for article_data in articles:
             # Check if article with this URL already exists
-            existing_article = Article.query.filter_by(url=article_data["url"]).first()
+            existing_article = Article.query.filter_by(url=normalize_url(article_data["url"])).first()
             if existing_article:
                 continue  # Skip this article if it already exists
             
@@ -389,7 +487,7 @@ def scrape_recent_crypto_articles():
             # Create the article
             article = Article(
                 title=article_data["title"],
-                url=article_data["url"],
+                url=normalize_url(article_data["url"]),
                 content=article_data["content"],
                 published_at=article_data["published_at"],
                 created_at=datetime.utcnow(),
@@ -402,6 +500,7 @@ def scrape_recent_crypto_articles():
             )
             db.session.add(article)
             db.session.commit()
+            added_ids.append(article.id)
             
             # Associate topics with the article
             for topic_name in article_data["topics"]:
@@ -423,7 +522,12 @@ def scrape_recent_crypto_articles():
         return "Successfully scraped 3 months of crypto articles"
     except Exception as e:
         logger.error(f"Error scraping crypto articles: {e}")
+        db.session.rollback()
         return f"Error: {str(e)}"
+    finally:
+        # Every article is committed on its own, so report the ones that
+        # made it in even when a later one failed
+        notify_articles_changed(__name__, added_ids)
 
 if __name__ == "__main__":
     # For testing